@@ -0,0 +1,50 @@
+from typing import Optional, List
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session
+from app.api.auth.deps import get_current_user
+from app.models.user import User
+from app.models.indicator import Indicator
+from app.services.trend_analysis import GRANULARITIES, indicator_trends
+
+router = APIRouter()
+
+# 单次趋势分析最多支持的指标数
+MAX_TREND_INDICATORS = 20
+
+
+@router.get("/indicators/trend")
+async def get_indicator_trend(
+    indicatorId: List[int] = Query(...),
+    startDate: Optional[date] = None,
+    endDate: Optional[date] = None,
+    granularity: str = "day",
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity 仅支持 day|week|month")
+    ids = list(dict.fromkeys(indicatorId))
+    if len(ids) > MAX_TREND_INDICATORS:
+        raise HTTPException(status_code=400, detail=f"单次最多分析 {MAX_TREND_INDICATORS} 个指标")
+    it_res = await session.exec(
+        select(Indicator.id, Indicator.name_cn, Indicator.unit).where(
+            Indicator.id.in_(ids), Indicator.deleted_at.is_(None)
+        )
+    )
+    meta = {row[0]: row for row in it_res.all()}
+    if len(meta) != len(ids):
+        raise HTTPException(status_code=404, detail="指标不存在")
+    trends = await indicator_trends(session, current_user.id, ids, granularity, startDate, endDate)
+    items = [
+        {"indicatorId": i, "name": meta[i][1], "unit": meta[i][2], **trends[i]}
+        for i in ids
+    ]
+    result = {"granularity": granularity, "items": items}
+    if len(items) == 1:
+        # 单指标时保持文档约定的顶层 series/stats 结构
+        result["series"] = items[0]["series"]
+        result["stats"] = items[0]["stats"]
+    return result
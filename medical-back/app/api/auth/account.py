@@ -8,6 +8,8 @@ from sqlmodel import select
 
 from app.db.session import get_session
 from app.models.user import User
+from app.services.passwords import hash_password, verify_password
+from app.services.principal_cache import invalidate_principal
 from .deps import get_current_user
 
 
@@ -70,6 +72,7 @@ async def update_profile(
     if changed:
         session.add(current_user)
         await session.commit()
+        invalidate_principal(current_user.id)
     return {"success": True}
 
 
@@ -78,23 +81,19 @@ class ChangePasswordRequest(BaseModel):
     newPassword: str
 
 
-def _hash_password(password: str) -> str:
-    import hashlib
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
-
-
 @router.put("/password")
 async def change_password(
     data: ChangePasswordRequest,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    if _hash_password(data.oldPassword) != current_user.password_hash:
+    if not await verify_password(data.oldPassword, current_user.password_hash):
         raise HTTPException(status_code=400, detail="旧密码不正确")
     if not data.newPassword:
         raise HTTPException(status_code=400, detail="新密码不能为空")
 
-    current_user.password_hash = _hash_password(data.newPassword)
+    current_user.password_hash = await hash_password(data.newPassword)
     session.add(current_user)
     await session.commit()
+    invalidate_principal(current_user.id)
     return {"success": True}
\ No newline at end of file
@@ -8,6 +8,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.session import get_session
 from app.models.user import User
+from app.services.passwords import hash_password, needs_rehash, verify_password
+from app.services.principal_cache import invalidate_principal
 from app.utils.jwt_util import create_jwt_token
 from .deps import get_current_user
 
@@ -15,11 +17,6 @@ from .deps import get_current_user
 router = APIRouter()
 
 
-def _hash_password(password: str) -> str:
-    import hashlib
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
-
-
 def _user_to_profile(user: User) -> dict:
     return {
         "id": user.id,
@@ -61,7 +58,7 @@ async def register(data: RegisterRequest, session: AsyncSession = Depends(get_se
     user = User(
         username=data.username,
         name=data.name,
-        password_hash=_hash_password(data.password),
+        password_hash=await hash_password(data.password),
         email=data.email,
     )
 
@@ -96,11 +93,15 @@ async def login(data: LoginRequest, session: AsyncSession = Depends(get_session)
     if not user:
         raise HTTPException(status_code=401, detail="用户不存在")
 
-    if _hash_password(data.password) != user.password_hash:
+    if not await verify_password(data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="密码错误")
 
+    # 旧 SHA-256 哈希或成本参数过时的哈希在登录成功后透明升级，随登录时间一并提交
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password(data.password)
     user.last_login = datetime.datetime.now(datetime.timezone.utc)
     await session.commit()
+    invalidate_principal(user.id)
 
     token = create_jwt_token(user_id=user.id, expire_minutes=10)
     return {
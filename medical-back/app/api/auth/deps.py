@@ -4,6 +4,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from app.db.session import get_session
 from app.models.user import User
+from app.services.principal_cache import get_principal, principal_generation, put_principal, token_fingerprint
 from app.utils.jwt_util import verify_jwt_token
 
 
@@ -23,8 +24,22 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Token无效")
 
+    # 签名与过期时间每次都校验；用户信息命中缓存时不访问数据库
+    fingerprint = token_fingerprint(token)
+    user = get_principal(user_id, fingerprint)
+    if user is not None:
+        return user
+    generation = principal_generation()
     result = await session.exec(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     user = result.first()
     if not user:
         raise HTTPException(status_code=401, detail="用户不存在或已被删除")
-    return user
\ No newline at end of file
+    put_principal(user, fingerprint, generation)
+    return user
+
+
+async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    """管理端与运维诊断接口：仅 admin / developer 角色可访问。"""
+    if current_user.role not in {"admin", "developer"}:
+        raise HTTPException(status_code=403, detail="无权限")
+    return current_user
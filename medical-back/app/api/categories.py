@@ -1,143 +1,127 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import func
 from app.db.session import get_session
 from app.api.auth.deps import get_current_user
+from app.api.pagination import count_total, decode_cursor, decode_id, next_cursor
+from app.api.schemas import CategoryOut, CategoryPage, IndicatorPage
+from app.core.http_cache import not_modified, not_modified_response, tagged_response
+from app.core.responses import TimedJSONResponse
 from app.models.user import User
-from app.models.indicator import Category, IndicatorCategoryLink, Indicator, IndicatorRecord
+from app.models.indicator import Indicator
 from app.models.user_indicator import UserIndicator
+from app.services.catalog_cache import category_filter, get_catalog
+from app.services.indicator_search import apply_indicator_keyword, order_by_relevance
+from app.services.indicator_snapshot import INDICATOR_ROW_COLUMNS, build_indicator_items
 
 router = APIRouter()
 
 
-@router.get("")
+@router.get("", response_model=CategoryPage)
 async def list_categories(
+    request: Request,
     page: int = 1,
     pageSize: int = 20,
     keyword: Optional[str] = None,
+    cursor: Optional[str] = None,
+    totalMode: Optional[str] = "exact",
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    q = select(Category).where(Category.deleted_at.is_(None))
+    catalog = await get_catalog(session)
+    if not_modified(request, catalog.etag):
+        return not_modified_response("categories", catalog.etag)
+    rows = catalog.categories
     if keyword:
-        q = q.where(Category.name.contains(keyword))
-    total_res = await session.exec(select(func.count()).select_from(q.subquery()))
-    total = total_res.one() or 0
-    res = await session.exec(q.order_by(Category.id).offset((page - 1) * pageSize).limit(pageSize))
+        rows = [c for c in rows if keyword in c.name]
+    total = None if totalMode == "none" else len(rows)
+    if cursor is not None:
+        if cursor:
+            last_id = decode_id(decode_cursor(cursor, 1)[0])
+            rows = [c for c in rows if c.id > last_id]
+        rows = rows[:pageSize]
+    else:
+        rows = rows[(page - 1) * pageSize:page * pageSize]
     items = [
         {
             "id": c.id,
             "name": c.name,
             "description": c.description,
         }
-        for c in res.all()
+        for c in rows
     ]
-    return {"items": items, "total": total}
+    return tagged_response(
+        request,
+        "categories",
+        {"items": items, "total": total, "nextCursor": next_cursor(rows, pageSize, lambda c: [c.id])},
+        catalog.etag,
+    )
 
 
-@router.get("/{id}")
+@router.get("/{id}", response_model=CategoryOut)
 async def get_category(
     id: int,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    r = await session.exec(select(Category).where(Category.id == id, Category.deleted_at.is_(None)))
-    c = r.scalar_one_or_none()
+    catalog = await get_catalog(session)
+    c = catalog.categories_by_id.get(id)
     if not c:
         raise HTTPException(status_code=404, detail="分类不存在")
-    cnt_res = await session.exec(
-        select(func.count()).where(IndicatorCategoryLink.category_id == id)
-    )
-    indicator_count = cnt_res.one() or 0
-    return {
+    if not_modified(request, catalog.etag):
+        return not_modified_response("categories", catalog.etag)
+    payload = {
         "id": c.id,
         "name": c.name,
         "description": c.description,
-        "indicatorCount": indicator_count,
+        "indicatorCount": len(catalog.members(id)),
     }
+    return tagged_response(request, "categories", payload, catalog.etag, CategoryOut)
 
 
-@router.get("/{id}/indicators")
+@router.get("/{id}/indicators", response_model=IndicatorPage)
 async def get_category_indicators(
     id: int,
     page: int = 1,
     pageSize: int = 20,
     keyword: Optional[str] = None,
     favorites: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    totalMode: Optional[str] = "exact",
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    link_q = select(IndicatorCategoryLink.indicator_id).where(IndicatorCategoryLink.category_id == id)
-    ind_q = select(Indicator).where(Indicator.deleted_at.is_(None), Indicator.id.in_(link_q))
+    ind_q = select(Indicator).where(Indicator.deleted_at.is_(None), category_filter(id))
+    ranked = False
     if keyword:
-        ind_q = ind_q.where(
-            (Indicator.name_cn.contains(keyword)) | (Indicator.name_en.contains(keyword))
-        )
+        ind_q, ranked = apply_indicator_keyword(ind_q, keyword, current_user.id)
     if favorites is True:
         fav_q = select(UserIndicator.indicator_id).where(
             UserIndicator.user_id == current_user.id, UserIndicator.favorite.is_(True)
         )
         ind_q = ind_q.where(Indicator.id.in_(fav_q))
-    total_res = await session.exec(select(func.count()).select_from(ind_q.subquery()))
-    total = total_res.one() or 0
-    res = await session.exec(
-        ind_q.order_by(Indicator.id).offset((page - 1) * pageSize).limit(pageSize)
-    )
+    total = await count_total(session, ind_q, totalMode)
+    if cursor is not None:
+        if cursor:
+            last_id = decode_id(decode_cursor(cursor, 1)[0])
+            ind_q = ind_q.where(Indicator.id > last_id)
+        ind_q = ind_q.order_by(Indicator.id).limit(pageSize)
+    elif ranked:
+        ind_q = order_by_relevance(ind_q, keyword, current_user.id)
+        ind_q = ind_q.offset((page - 1) * pageSize).limit(pageSize)
+    else:
+        ind_q = ind_q.order_by(Indicator.id).offset((page - 1) * pageSize).limit(pageSize)
+    res = await session.execute(ind_q.with_only_columns(*INDICATOR_ROW_COLUMNS))
     inds = res.all()
-    items = []
-    for it in inds:
-        rec_res = await session.exec(
-            select(IndicatorRecord)
-            .where(
-                IndicatorRecord.indicator_id == it.id,
-                IndicatorRecord.user_id == current_user.id,
-                IndicatorRecord.deleted_at.is_(None),
-            )
-            .order_by(IndicatorRecord.measured_at.desc())
-            .limit(1)
-        )
-        rec = rec_res.scalar_one_or_none()
-        value = rec.value if rec else None
-        unit = rec.unit if rec else it.unit
-        measure_date = rec.measured_at.isoformat() if rec else None
-        ref_low = rec.ref_low if rec else it.reference_min
-        ref_high = rec.ref_high if rec else it.reference_max
-        status = None
-        if value is not None and ref_low is not None and ref_high is not None:
-            try:
-                v = float(value)
-                status = "high" if v > float(ref_high) else ("low" if v < float(ref_low) else "normal")
-            except Exception:
-                status = "normal"
-        fav_res = await session.exec(
-            select(UserIndicator).where(
-                UserIndicator.user_id == current_user.id,
-                UserIndicator.indicator_id == it.id,
-            )
-        )
-        fav = fav_res.scalar_one_or_none()
-        items.append(
-            {
-                "id": it.id,
-                "indicator": it.name_cn,
-                "nameCn": it.name_cn,
-                "nameEn": it.name_en,
-                "type": it.type,
-                "value": value,
-                "unit": unit,
-                "referenceRange": (
-                    f"{ref_low}-{ref_high}" if ref_low is not None and ref_high is not None else None
-                ),
-                "status": status,
-                "measureDate": measure_date,
-                "categories": [],
-                "source": rec.source if rec else None,
-                "note": rec.note if rec else None,
-                "isBuiltin": it.is_builtin,
-                "loinc": it.loinc,
-                "favorite": bool(fav.favorite) if fav else False,
-            }
-        )
-    return {"items": items, "total": total}
\ No newline at end of file
+    items = await build_indicator_items(session, current_user.id, inds, with_categories=False)
+    # 按相关度排序的页没有可用的 id 游标，只有按 id 排序时才返回 nextCursor
+    by_id = cursor is not None or not ranked
+    return TimedJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "nextCursor": next_cursor(inds, pageSize, lambda it: [it.id]) if by_id else None,
+        }
+    )
\ No newline at end of file
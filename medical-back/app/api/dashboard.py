@@ -0,0 +1,20 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session
+from app.api.auth.deps import get_current_user
+from app.models.user import User
+from app.services.dashboard import get_summary
+
+router = APIRouter()
+
+
+@router.get("/summary")
+async def dashboard_summary(
+    dateRangeStart: Optional[date] = None,
+    dateRangeEnd: Optional[date] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_summary(session, current_user.id, dateRangeStart, dateRangeEnd)
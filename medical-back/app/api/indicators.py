@@ -1,15 +1,28 @@
 from typing import Optional, List
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
 from pydantic import BaseModel
 from sqlmodel import select, delete
-from sqlalchemy import func
+from sqlalchemy import tuple_
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.session import get_session
 from app.api.auth.deps import get_current_user
+from app.api.pagination import count_total, decode_cursor, decode_date, decode_id, next_cursor
+from app.api.schemas import IndicatorDetailOut, IndicatorOut, IndicatorPage, RecordPage
+from app.core.http_cache import not_modified, not_modified_response, tagged_response, version_etag
+from app.core.responses import TimedJSONResponse
 from app.models.user import User
-from app.models.indicator import Indicator, IndicatorRecord, IndicatorDetail, Category, IndicatorCategoryLink
+from app.models.indicator import Indicator, IndicatorRecord, IndicatorDetail, IndicatorCategoryLink, IndicatorLatest
 from app.models.user_indicator import UserIndicator
+from app.services.admissions import ensure_admission_file
+from app.services.catalog_cache import category_filter, get_catalog, invalidate_catalog
+from app.services.dashboard import invalidate_dashboard
+from app.services.indicator_search import apply_indicator_keyword, order_by_relevance
+from app.services.indicator_snapshot import INDICATOR_ROW_COLUMNS, build_indicator_items
+from app.services.read_models import RecordRow, fetch_rows
+from app.services.record_import import ImportFormatError, import_records
+from app.services.record_values import apply_record_values, status_condition
+from app.services.record_writes import RecordWriteOp, Touched, WriteQueueFullError, execute_record_write
 
 router = APIRouter()
 
@@ -29,7 +42,7 @@ class UpdateIndicatorRequest(CreateIndicatorRequest):
     pass
 
 
-@router.get("")
+@router.get("", response_model=IndicatorPage)
 async def list_indicators(
     page: int = 1,
     pageSize: int = 20,
@@ -42,6 +55,11 @@ async def list_indicators(
     favorites: Optional[bool] = None,
     builtin: Optional[bool] = None,
     owner: Optional[str] = "all",
+    status: Optional[str] = None,
+    valueMin: Optional[float] = None,
+    valueMax: Optional[float] = None,
+    cursor: Optional[str] = None,
+    totalMode: Optional[str] = "exact",
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
@@ -54,89 +72,62 @@ async def list_indicators(
         q = q.where(
             (Indicator.owner_user_id == current_user.id) | (Indicator.is_builtin.is_(True))
         )
+    ranked = False
     if keyword:
-        q = q.where((Indicator.name_cn.contains(keyword)) | (Indicator.name_en.contains(keyword)))
+        q, ranked = apply_indicator_keyword(q, keyword, current_user.id)
     if category:
-        cat_res = await session.exec(select(Category).where(Category.name == category))
-        cat = cat_res.one_or_none()
+        catalog = await get_catalog(session)
+        cat = catalog.categories_by_name.get(category)
         if cat:
-            link_q = select(IndicatorCategoryLink.indicator_id).where(IndicatorCategoryLink.category_id == cat.id)
-            q = q.where(Indicator.id.in_(link_q))
+            q = q.where(category_filter(cat.id))
     if favorites is True:
         fav_q = select(UserIndicator.indicator_id).where(
             UserIndicator.user_id == current_user.id, UserIndicator.favorite.is_(True)
         )
         q = q.where(Indicator.id.in_(fav_q))
-    total_res = await session.exec(select(func.count()).select_from(q.subquery()))
-    total = total_res.one() or 0
-    res = await session.exec(q.order_by(Indicator.id).offset((page - 1) * pageSize).limit(pageSize))
+    if status or valueMin is not None or valueMax is not None:
+        # 按最新读数的状态/数值过滤（走 IndicatorLatest 主键，不扫描历史记录）
+        latest_q = select(IndicatorLatest.indicator_id).where(IndicatorLatest.user_id == current_user.id)
+        if status:
+            latest_q = latest_q.where(status_condition(IndicatorLatest.status, status))
+        if valueMin is not None:
+            latest_q = latest_q.where(IndicatorLatest.value_num >= valueMin)
+        if valueMax is not None:
+            latest_q = latest_q.where(IndicatorLatest.value_num <= valueMax)
+        q = q.where(Indicator.id.in_(latest_q))
+    total = await count_total(session, q, totalMode)
+    if cursor is not None:
+        if cursor:
+            last_id = decode_id(decode_cursor(cursor, 1)[0])
+            q = q.where(Indicator.id > last_id)
+        q = q.order_by(Indicator.id).limit(pageSize)
+    elif ranked:
+        # 关键词命中全文索引时按相关度排序（游标模式仍按 id 以保证翻页稳定）
+        q = order_by_relevance(q, keyword, current_user.id).offset((page - 1) * pageSize).limit(pageSize)
+    else:
+        q = q.order_by(Indicator.id).offset((page - 1) * pageSize).limit(pageSize)
+    res = await session.execute(q.with_only_columns(*INDICATOR_ROW_COLUMNS))
     indicators = res.all()
-    items = []
-    for it in indicators:
-        rec_q = select(IndicatorRecord).where(
-            IndicatorRecord.indicator_id == it.id,
-            IndicatorRecord.user_id == current_user.id,
-            IndicatorRecord.deleted_at.is_(None),
-        )
-        if startDate:
-            rec_q = rec_q.where(IndicatorRecord.measured_at >= startDate)
-        if endDate:
-            rec_q = rec_q.where(IndicatorRecord.measured_at <= endDate)
-        if order == "asc":
-            rec_q = rec_q.order_by(IndicatorRecord.measured_at.asc())
-        else:
-            rec_q = rec_q.order_by(IndicatorRecord.measured_at.desc())
-        rec_q = rec_q.limit(1)
-        rec_res = await session.exec(rec_q)
-        rec = rec_res.one_or_none()
-        value = rec.value if rec else None
-        unit = rec.unit if rec else it.unit
-        measure_date = rec.measured_at.isoformat() if rec else None
-        ref_low = rec.ref_low if rec else it.reference_min
-        ref_high = rec.ref_high if rec else it.reference_max
-        status = None
-        if value is not None and ref_low is not None and ref_high is not None:
-            try:
-                v = float(value)
-                status = "high" if v > float(ref_high) else ("low" if v < float(ref_low) else "normal")
-            except Exception:
-                status = "normal"
-        fav_res = await session.exec(
-            select(UserIndicator).where(
-                UserIndicator.user_id == current_user.id,
-                UserIndicator.indicator_id == it.id,
-            )
-        )
-        fav = fav_res.one_or_none()
-        cats_res = await session.exec(
-            select(Category)
-            .join(IndicatorCategoryLink, IndicatorCategoryLink.category_id == Category.id)
-            .where(IndicatorCategoryLink.indicator_id == it.id)
-        )
-        cats = [c.name for c in cats_res.all()]
-        items.append(
-            {
-                "id": it.id,
-                "indicator": it.name_cn,
-                "nameCn": it.name_cn,
-                "nameEn": it.name_en,
-                "type": it.type,
-                "value": value,
-                "unit": unit,
-                "referenceRange": (
-                    f"{ref_low}-{ref_high}" if ref_low is not None and ref_high is not None else None
-                ),
-                "status": status,
-                "measureDate": measure_date,
-                "categories": cats,
-                "source": rec.source if rec else None,
-                "note": rec.note if rec else None,
-                "isBuiltin": it.is_builtin,
-                "loinc": it.loinc,
-                "favorite": bool(fav.favorite) if fav else False,
-            }
-        )
-    return {"items": items, "total": total}
+    items = await build_indicator_items(
+        session, current_user.id, indicators, start_date=startDate, end_date=endDate, order=order
+    )
+    # 按相关度排序的页没有可用的 id 游标，只有按 id 排序时才返回 nextCursor
+    by_id = cursor is not None or not ranked
+    return TimedJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "nextCursor": next_cursor(indicators, pageSize, lambda it: [it.id]) if by_id else None,
+        }
+    )
+
+
+async def _category_ids(session: AsyncSession, names: Optional[List[str]]) -> List[int]:
+    """按名称解析分类 ID（忽略不存在的名称）；须在写入之前调用，避免目录快照从未提交的事务状态加载。"""
+    if not names:
+        return []
+    catalog = await get_catalog(session)
+    return [c.id for c in (catalog.categories_by_name.get(name) for name in names) if c]
 
 
 @router.post("")
@@ -147,6 +138,7 @@ async def create_indicator(
 ):
     if not data.nameCn or not data.unit:
         raise HTTPException(status_code=400, detail="名称与单位必填")
+    category_ids = await _category_ids(session, data.categories)
     it = Indicator(
         owner_user_id=current_user.id,
         name_cn=data.nameCn,
@@ -161,32 +153,39 @@ async def create_indicator(
     session.add(it)
     await session.flush()
     await session.refresh(it)
-    if data.categories:
-        for name in data.categories:
-            c_res = await session.exec(select(Category).where(Category.name == name))
-            c = c_res.one_or_none()
-            if c:
-                session.add(IndicatorCategoryLink(indicator_id=it.id, category_id=c.id))
+    for category_id in category_ids:
+        session.add(IndicatorCategoryLink(indicator_id=it.id, category_id=category_id))
     await session.commit()
+    invalidate_catalog()
     return {"id": it.id}
 
 
-@router.get("/{id}")
+@router.get("/{id}", response_model=IndicatorOut)
 async def get_indicator(
     id: int,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
+    catalog = await get_catalog(session)
+    it = catalog.indicators.get(id)
+    if it is not None:
+        # 内置指标直接由目录快照提供，ETag 即快照内容标签，全程不访问数据库
+        if not_modified(request, catalog.etag):
+            return not_modified_response("indicator", catalog.etag)
+        return tagged_response(request, "indicator", _indicator_out(it, catalog), catalog.etag, IndicatorOut)
+    # 自定义指标：按主键查询，ETag 由持久化的 updated_at 与目录快照标签（分类名称来自快照）得出
     res = await session.exec(select(Indicator).where(Indicator.id == id, Indicator.deleted_at.is_(None)))
     it = res.one_or_none()
     if not it:
         raise HTTPException(status_code=404, detail="指标不存在")
-    cats_res = await session.exec(
-        select(Category)
-        .join(IndicatorCategoryLink, IndicatorCategoryLink.category_id == Category.id)
-        .where(IndicatorCategoryLink.indicator_id == it.id)
-    )
-    cats = [c.name for c in cats_res.all()]
+    etag = version_etag("indicator", it.id, it.updated_at or it.created_at, catalog.etag)
+    if not_modified(request, etag):
+        return not_modified_response("indicator", etag)
+    return tagged_response(request, "indicator", _indicator_out(it, catalog), etag, IndicatorOut)
+
+
+def _indicator_out(it, catalog) -> dict:
     return {
         "id": it.id,
         "nameCn": it.name_cn,
@@ -197,7 +196,7 @@ async def get_indicator(
         "referenceMax": it.reference_max,
         "isBuiltin": it.is_builtin,
         "loinc": it.loinc,
-        "categories": cats,
+        "categories": catalog.category_names(it.id),
     }
 
 
@@ -212,6 +211,7 @@ async def update_indicator(
     it = res.one_or_none()
     if not it:
         raise HTTPException(status_code=404, detail="指标不存在")
+    category_ids = await _category_ids(session, data.categories)
     it.name_cn = data.nameCn or it.name_cn
     it.name_en = data.nameEn or it.name_en
     it.type = data.type or it.type
@@ -219,19 +219,17 @@ async def update_indicator(
     it.reference_min = data.referenceMin if data.referenceMin is not None else it.reference_min
     it.reference_max = data.referenceMax if data.referenceMax is not None else it.reference_max
     it.loinc = data.loinc or it.loinc
+    it.updated_at = datetime.now()
     session.add(it)
     await session.flush()
     if data.categories is not None:
         await session.exec(
             delete(IndicatorCategoryLink).where(IndicatorCategoryLink.indicator_id == it.id)
         )
-        if data.categories:
-            for name in data.categories:
-                c_res = await session.exec(select(Category).where(Category.name == name))
-                c = c_res.one_or_none()
-                if c:
-                    session.add(IndicatorCategoryLink(indicator_id=it.id, category_id=c.id))
+        for category_id in category_ids:
+            session.add(IndicatorCategoryLink(indicator_id=it.id, category_id=category_id))
     await session.commit()
+    invalidate_catalog()
     return {"code": 200}
 
 
@@ -248,6 +246,7 @@ async def delete_indicator(
     it.deleted_at = datetime.now()
     session.add(it)
     await session.commit()
+    invalidate_catalog()
     return {"code": 200}
 
 
@@ -273,7 +272,7 @@ class UpdateRecordRequest(BaseModel):
     admissionFileId: Optional[int] = None
 
 
-@router.get("/{id}/records")
+@router.get("/{id}/records", response_model=RecordPage)
 async def list_records(
     id: int,
     page: int = 1,
@@ -281,6 +280,11 @@ async def list_records(
     startDate: Optional[date] = None,
     endDate: Optional[date] = None,
     admissionFileId: Optional[int] = None,
+    status: Optional[str] = None,
+    valueMin: Optional[float] = None,
+    valueMax: Optional[float] = None,
+    cursor: Optional[str] = None,
+    totalMode: Optional[str] = "exact",
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
@@ -295,34 +299,67 @@ async def list_records(
         q = q.where(IndicatorRecord.measured_at <= endDate)
     if admissionFileId is not None:
         q = q.where(IndicatorRecord.admission_file_id == admissionFileId)
-    total_res = await session.exec(select(func.count()).select_from(q.subquery()))
-    total = total_res.one() or 0
-    res = await session.exec(
-        q.order_by(IndicatorRecord.measured_at.desc()).offset((page - 1) * pageSize).limit(pageSize)
+    if status:
+        q = q.where(status_condition(IndicatorRecord.status, status))
+    if valueMin is not None:
+        q = q.where(IndicatorRecord.value_num >= valueMin)
+    if valueMax is not None:
+        q = q.where(IndicatorRecord.value_num <= valueMax)
+    total = await count_total(session, q, totalMode)
+    q = q.order_by(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+    if cursor is not None:
+        if cursor:
+            last_measured, last_id = decode_cursor(cursor, 2)
+            q = q.where(
+                tuple_(IndicatorRecord.measured_at, IndicatorRecord.id) < (decode_date(last_measured), decode_id(last_id))
+            )
+        q = q.limit(pageSize)
+    else:
+        q = q.offset((page - 1) * pageSize).limit(pageSize)
+    rows = await fetch_rows(session, q, RecordRow)
+    items = [
+        {
+            "recordId": r.id,
+            "date": r.measured_at,
+            "value": r.value,
+            "unit": r.unit,
+            "status": r.status,
+            "source": r.source,
+            "note": r.note,
+            "admissionFileId": r.admission_file_id,
+        }
+        for r in rows
+    ]
+    return TimedJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "nextCursor": next_cursor(rows, pageSize, lambda r: [r.measured_at, r.id]),
+        }
     )
-    rows = res.all()
-    items = []
-    for r in rows:
-        status = None
-        if r.value is not None and r.ref_low is not None and r.ref_high is not None:
-            try:
-                v = float(r.value)
-                status = "high" if v > float(r.ref_high) else ("low" if v < float(r.ref_low) else "normal")
-            except Exception:
-                status = "normal"
-        items.append(
-            {
-                "recordId": r.id,
-                "date": r.measured_at.isoformat(),
-                "value": r.value,
-                "unit": r.unit,
-                "status": status,
-                "source": r.source,
-                "note": r.note,
-                "admissionFileId": r.admission_file_id,
-            }
+
+
+async def _owned_record(session: AsyncSession, indicator_id: int, record_id: int, user_id: int) -> IndicatorRecord:
+    res = await session.exec(
+        select(IndicatorRecord).where(
+            IndicatorRecord.id == record_id,
+            IndicatorRecord.indicator_id == indicator_id,
+            IndicatorRecord.user_id == user_id,
+            IndicatorRecord.deleted_at.is_(None),
         )
-    return {"items": items, "total": total}
+    )
+    r = res.one_or_none()
+    if not r:
+        raise HTTPException(status_code=404, detail="记录不存在")
+    return r
+
+
+async def _write_record(session: AsyncSession, op: RecordWriteOp):
+    """单条记录写入：直接提交或经组提交队列（见 `app.services.record_writes`）。"""
+    try:
+        return await execute_record_write(session, op)
+    except WriteQueueFullError:
+        raise HTTPException(status_code=503, detail="写入繁忙，请稍后重试")
 
 
 @router.post("/{id}/records")
@@ -331,27 +368,55 @@ async def create_record(
     data: CreateRecordRequest,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
+):
+    catalog = await get_catalog(session)
+    if id not in catalog.indicators:
+        it_res = await session.exec(select(Indicator).where(Indicator.id == id, Indicator.deleted_at.is_(None)))
+        if not it_res.one_or_none():
+            raise HTTPException(status_code=404, detail="指标不存在")
+    user_id = current_user.id
+
+    async def op(s: AsyncSession, touched: Touched) -> int:
+        r = IndicatorRecord(
+            indicator_id=id,
+            user_id=user_id,
+            measured_at=data.date,
+            value=str(data.value),
+            unit=data.unit,
+            ref_low=data.referenceMin,
+            ref_high=data.referenceMax,
+            source=data.source or "manual",
+            note=data.note,
+            admission_file_id=data.admissionFileId,
+        )
+        apply_record_values(r)
+        s.add(r)
+        await s.flush()
+        touched.add(user_id, id, r.measured_at)
+        return r.id
+
+    return {"recordId": await _write_record(session, op)}
+
+
+@router.post("/{id}/records/import")
+async def import_indicator_records(
+    id: int,
+    file: UploadFile = File(...),
+    admissionFileId: Optional[int] = Form(None),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
 ):
     it_res = await session.exec(select(Indicator).where(Indicator.id == id, Indicator.deleted_at.is_(None)))
     it = it_res.one_or_none()
     if not it:
         raise HTTPException(status_code=404, detail="指标不存在")
-    r = IndicatorRecord(
-        indicator_id=id,
-        user_id=current_user.id,
-        measured_at=data.date,
-        value=str(data.value),
-        unit=data.unit,
-        ref_low=data.referenceMin,
-        ref_high=data.referenceMax,
-        source=data.source or "manual",
-        note=data.note,
-        admission_file_id=data.admissionFileId,
-    )
-    session.add(r)
-    await session.commit()
-    await session.refresh(r)
-    return {"recordId": r.id}
+    await ensure_admission_file(session, admissionFileId, current_user.id)
+    try:
+        return await import_records(session, current_user.id, it, file.filename, file.file, admissionFileId)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        invalidate_dashboard(current_user.id)
 
 
 @router.patch("/{id}/records/{recordId}")
@@ -362,35 +427,33 @@ async def update_record(
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    res = await session.exec(
-        select(IndicatorRecord).where(
-            IndicatorRecord.id == recordId,
-            IndicatorRecord.indicator_id == id,
-            IndicatorRecord.user_id == current_user.id,
-            IndicatorRecord.deleted_at.is_(None),
-        )
-    )
-    r = res.one_or_none()
-    if not r:
-        raise HTTPException(status_code=404, detail="记录不存在")
-    if data.date is not None:
-        r.measured_at = data.date
-    if data.value is not None:
-        r.value = str(data.value)
-    if data.unit is not None:
-        r.unit = data.unit
-    if data.referenceMin is not None:
-        r.ref_low = data.referenceMin
-    if data.referenceMax is not None:
-        r.ref_high = data.referenceMax
-    if data.source is not None:
-        r.source = data.source
-    if data.note is not None:
-        r.note = data.note
-    if data.admissionFileId is not None:
-        r.admission_file_id = data.admissionFileId
-    session.add(r)
-    await session.commit()
+    user_id = current_user.id
+
+    async def op(s: AsyncSession, touched: Touched) -> None:
+        r = await _owned_record(s, id, recordId, user_id)
+        old_date = r.measured_at
+        if data.date is not None:
+            r.measured_at = data.date
+        if data.value is not None:
+            r.value = str(data.value)
+        if data.unit is not None:
+            r.unit = data.unit
+        if data.referenceMin is not None:
+            r.ref_low = data.referenceMin
+        if data.referenceMax is not None:
+            r.ref_high = data.referenceMax
+        if data.source is not None:
+            r.source = data.source
+        if data.note is not None:
+            r.note = data.note
+        if data.admissionFileId is not None:
+            r.admission_file_id = data.admissionFileId
+        apply_record_values(r)
+        s.add(r)
+        await s.flush()
+        touched.add(user_id, id, old_date, r.measured_at)
+
+    await _write_record(session, op)
     return {"code": 200}
 
 
@@ -401,20 +464,16 @@ async def delete_record(
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    res = await session.exec(
-        select(IndicatorRecord).where(
-            IndicatorRecord.id == recordId,
-            IndicatorRecord.indicator_id == id,
-            IndicatorRecord.user_id == current_user.id,
-            IndicatorRecord.deleted_at.is_(None),
-        )
-    )
-    r = res.one_or_none()
-    if not r:
-        raise HTTPException(status_code=404, detail="记录不存在")
-    r.deleted_at = datetime.now()
-    session.add(r)
-    await session.commit()
+    user_id = current_user.id
+
+    async def op(s: AsyncSession, touched: Touched) -> None:
+        r = await _owned_record(s, id, recordId, user_id)
+        r.deleted_at = datetime.now()
+        s.add(r)
+        await s.flush()
+        touched.add(user_id, id, r.measured_at)
+
+    await _write_record(session, op)
     return {"code": 200}
 
 
@@ -433,34 +492,47 @@ class UpdateDetailRequest(BaseModel):
     generalAdvice: Optional[str] = None
 
 
-@router.get("/{id}/detail")
+@router.get("/{id}/detail", response_model=IndicatorDetailOut)
 async def get_indicator_detail(
     id: int,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    res = await session.exec(select(Indicator).where(Indicator.id == id))
-    it = res.one_or_none()
-    if not it:
+    # 先只查版本列：ETag 由指标名称与详情行的主键、updated_at 得出，命中时不加载详情正文
+    res = await session.execute(
+        select(Indicator.name_cn, IndicatorDetail.id, IndicatorDetail.updated_at, IndicatorDetail.created_at)
+        .outerjoin(
+            IndicatorDetail,
+            (IndicatorDetail.indicator_id == Indicator.id) & IndicatorDetail.deleted_at.is_(None),
+        )
+        .where(Indicator.id == id)
+    )
+    row = res.first()
+    if not row:
         raise HTTPException(status_code=404, detail="指标不存在")
-    d_res = await session.exec(select(IndicatorDetail).where(IndicatorDetail.indicator_id == id, IndicatorDetail.deleted_at.is_(None)))
-    d = d_res.one_or_none()
-    if not d:
-        return {}
-    return {
-        "indicatorName": it.name_cn,
-        "introductionText": d.introduction_text,
-        "measurementMethod": d.measurement_method,
-        "clinicalSignificance": d.clinical_significance,
-        "referenceRange": d.reference_range,
-        "unit": d.unit,
-        "highMeaning": d.high_meaning,
-        "lowMeaning": d.low_meaning,
-        "highAdvice": d.high_advice,
-        "lowAdvice": d.low_advice,
-        "normalAdvice": d.normal_advice,
-        "generalAdvice": d.general_advice,
-    }
+    name_cn, detail_id, updated_at, created_at = row
+    etag = version_etag("detail", id, name_cn, detail_id, updated_at or created_at)
+    if not_modified(request, etag):
+        return not_modified_response("indicator_detail", etag)
+    payload = {}
+    if detail_id is not None:
+        d = await session.get(IndicatorDetail, detail_id)
+        payload = {
+            "indicatorName": name_cn,
+            "introductionText": d.introduction_text,
+            "measurementMethod": d.measurement_method,
+            "clinicalSignificance": d.clinical_significance,
+            "referenceRange": d.reference_range,
+            "unit": d.unit,
+            "highMeaning": d.high_meaning,
+            "lowMeaning": d.low_meaning,
+            "highAdvice": d.high_advice,
+            "lowAdvice": d.low_advice,
+            "normalAdvice": d.normal_advice,
+            "generalAdvice": d.general_advice,
+        }
+    return tagged_response(request, "indicator_detail", payload, etag, IndicatorDetailOut)
 
 
 @router.put("/{id}/detail")
@@ -520,4 +592,5 @@ async def update_indicator_detail(
         )
         session.add(d)
     await session.commit()
+    invalidate_catalog()
     return {"code": 200}
\ No newline at end of file
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import render
+from app.core.settings import get_settings
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    # Prometheus 抓取入口（不带 API 前缀）；配置 METRICS_DIR 时合并各 worker 快照
+    return PlainTextResponse(render(get_settings().metrics_dir), media_type="text/plain; version=0.0.4")
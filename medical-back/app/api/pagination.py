@@ -0,0 +1,73 @@
+"""
+列表分页辅助
+
+约定：
+- 兼容原有 `page/pageSize`（OFFSET/LIMIT）分页；
+- 传入 `cursor` 时启用游标（keyset）分页：目录类列表按 `id` 升序，记录按 `(measured_at, id)` 降序；
+  游标中的各字段按类型校验（`decode_id` / `decode_date`），不合法时返回 400；
+  `cursor=`（空串）表示从第一页开始，响应中的 `nextCursor` 为下一页游标（无更多数据时为 null）；
+- `totalMode=exact|estimate|none` 控制 `total` 的计算方式：精确计数、上限计数（最多数到
+  `Settings.count_estimate_cap`）或不计数（返回 null）。
+"""
+
+import base64
+import json
+from datetime import date
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import get_settings
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """将排序键编码为不透明游标（URL 安全的 base64）。"""
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> List[Any]:
+    """解码游标为排序键列表；格式不合法时返回 400。"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    if not isinstance(values, list) or len(values) != arity:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return values
+
+
+def decode_id(value: Any) -> int:
+    """解码游标中的整数主键（拒绝字符串、浮点数与布尔值）。"""
+    if type(value) is not int:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return value
+
+
+def decode_date(value: Any) -> date:
+    """解码游标中的日期字段。"""
+    try:
+        return date.fromisoformat(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+def next_cursor(rows: Sequence[Any], page_size: int, key: Callable[[Any], Sequence[Any]]) -> Optional[str]:
+    """当前页已满时以最后一行的排序键生成下一页游标。"""
+    if not rows or len(rows) < page_size:
+        return None
+    return encode_cursor(key(rows[-1]))
+
+
+async def count_total(session: AsyncSession, q, mode: Optional[str] = "exact") -> Optional[int]:
+    """按 `totalMode` 计算列表总数。"""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        q = q.limit(get_settings().count_estimate_cap)
+    total_res = await session.exec(select(func.count()).select_from(q.subquery()))
+    return total_res.one() or 0
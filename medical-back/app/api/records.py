@@ -0,0 +1,100 @@
+from typing import Optional, List
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session
+from app.api.auth.deps import get_current_user
+from app.models.user import User
+from app.models.indicator import Indicator, IndicatorRecord
+from app.services.admissions import ensure_admission_file
+from app.services.catalog_cache import get_catalog
+from app.services.dashboard import invalidate_dashboard
+from app.services.latest_reading import refresh_latest_readings
+from app.services.record_values import apply_record_values
+from app.services.rollups import refresh_rollups
+
+router = APIRouter()
+
+# 单次批量写入的条目上限（一份检验报告通常 20–60 项）
+MAX_BATCH_ITEMS = 500
+
+
+class BatchRecordItem(BaseModel):
+    indicatorId: int
+    date: date
+    value: str
+    unit: str
+    referenceMin: Optional[float] = None
+    referenceMax: Optional[float] = None
+    source: Optional[str] = None
+    note: Optional[str] = None
+
+
+class BatchRecordsRequest(BaseModel):
+    items: List[BatchRecordItem]
+    admissionFileId: Optional[int] = None
+    source: Optional[str] = None
+
+
+@router.post("/batch")
+async def create_records_batch(
+    data: BatchRecordsRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    if not data.items:
+        raise HTTPException(status_code=400, detail="记录列表不能为空")
+    if len(data.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"单次最多提交 {MAX_BATCH_ITEMS} 条记录")
+    await ensure_admission_file(session, data.admissionFileId, current_user.id)
+    # 内置指标由目录缓存校验，其余指标一次 IN 查询
+    catalog = await get_catalog(session)
+    requested = {it.indicatorId for it in data.items}
+    valid = requested & catalog.indicators.keys()
+    unknown = requested - valid
+    if unknown:
+        it_res = await session.exec(
+            select(Indicator.id).where(Indicator.id.in_(sorted(unknown)), Indicator.deleted_at.is_(None))
+        )
+        valid |= set(it_res.all())
+
+    results: List[dict] = []
+    created: List[tuple] = []
+    for idx, item in enumerate(data.items):
+        if item.indicatorId not in valid:
+            results.append({"index": idx, "indicatorId": item.indicatorId, "error": "指标不存在"})
+            continue
+        if item.referenceMin is not None and item.referenceMax is not None and item.referenceMin > item.referenceMax:
+            results.append({"index": idx, "indicatorId": item.indicatorId, "error": "参考下限大于参考上限"})
+            continue
+        r = IndicatorRecord(
+            indicator_id=item.indicatorId,
+            user_id=current_user.id,
+            measured_at=item.date,
+            value=str(item.value),
+            unit=item.unit,
+            ref_low=item.referenceMin,
+            ref_high=item.referenceMax,
+            source=item.source or data.source or "manual",
+            note=item.note,
+            admission_file_id=data.admissionFileId,
+        )
+        apply_record_values(r)
+        session.add(r)
+        created.append((idx, r))
+        results.append({"index": idx, "indicatorId": item.indicatorId})
+    if created:
+        # 整批在一个事务内写入：一次 flush（批量 INSERT）+ 批量刷新最新读数快照与预聚合
+        await session.flush()
+        await refresh_latest_readings(session, current_user.id, (r.indicator_id for _, r in created))
+        touched: dict = {}
+        for _, r in created:
+            touched.setdefault(r.indicator_id, set()).add(r.measured_at)
+        await refresh_rollups(session, current_user.id, touched)
+        await session.commit()
+        invalidate_dashboard(current_user.id)
+        for idx, r in created:
+            results[idx]["recordId"] = r.id
+    return {"items": results, "created": len(created), "failed": len(results) - len(created)}
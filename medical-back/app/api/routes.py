@@ -1,21 +1,58 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from .auth.auth import router as auth_router
 from .auth.account import router as account_router
 from .indicators import router as indicators_router
 from .categories import router as categories_router
 from .user_indicators import router as user_indicators_router
+from .records import router as records_router
+from .analysis import router as analysis_router
+from .dashboard import router as dashboard_router
+from .auth.deps import get_admin_user
+from app.core.warmup import warmup_status
+from app.services.catalog_cache import catalog_stats
+from app.services.dashboard import dashboard_cache_stats
+from app.services.principal_cache import principal_cache_stats
+from app.services.record_writes import record_write_stats
 
 
 api_router = APIRouter()
+# 运维诊断接口（缓存、模块加载、写入队列统计）：仅管理员可访问，公开的只有存活检查 /health
+diagnostics_router = APIRouter(dependencies=[Depends(get_admin_user)])
 
 
 @api_router.get("/health", tags=["health"])
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
+
+@diagnostics_router.get("/health/cache", tags=["health"])
+async def cache_stats() -> dict:
+    # 当前进程的缓存版本与命中统计，用于排查多 worker 下的缓存陈旧
+    return {
+        "catalog": catalog_stats(),
+        "dashboard": dashboard_cache_stats(),
+        "principal": principal_cache_stats(),
+    }
+
+
+@diagnostics_router.get("/health/modules", tags=["health"])
+async def module_status() -> dict:
+    # 延迟导入的重型依赖是否已加载（启动预热或首个使用请求触发）
+    return warmup_status()
+
+
+@diagnostics_router.get("/health/writes", tags=["health"])
+async def write_stats() -> dict:
+    # 当前进程记录写入组提交队列的积压与平均组大小
+    return record_write_stats()
+
 # 子路由
+api_router.include_router(diagnostics_router)
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(account_router, prefix="/account", tags=["account"])
 api_router.include_router(indicators_router, prefix="/indicators", tags=["indicators"])
 api_router.include_router(categories_router, prefix="/categories", tags=["categories"])
-api_router.include_router(user_indicators_router, prefix="/user-indicators", tags=["user-indicators"])
\ No newline at end of file
+api_router.include_router(user_indicators_router, prefix="/user-indicators", tags=["user-indicators"])
+api_router.include_router(records_router, prefix="/records", tags=["records"])
+api_router.include_router(analysis_router, prefix="/analysis", tags=["analysis"])
+api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
\ No newline at end of file
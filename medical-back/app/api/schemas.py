@@ -0,0 +1,119 @@
+"""
+列表与详情接口的响应结构
+
+约定：
+- 字段名与前端约定一致（camelCase），用于 OpenAPI 文档（`response_model`）；单个分类、指标与指标详情接口
+  返回前经 `app.core.http_cache.tagged_response(..., model=...)` 按对应模型校验；
+- 热点列表接口（指标列表、分类下指标、指标记录、分类列表、关注指标列表）在路由内直接用行数据组装字典，
+  以 `app.core.responses.TimedJSONResponse`（orjson）返回，跳过逐项校验与 `jsonable_encoder`；
+  组装结果须与这里的结构保持一致。
+"""
+
+import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class IndicatorItem(BaseModel):
+    id: int
+    indicator: str
+    nameCn: str
+    nameEn: Optional[str] = None
+    type: Optional[str] = None
+    value: Optional[str] = None
+    unit: Optional[str] = None
+    referenceRange: Optional[str] = None
+    status: Optional[str] = None
+    measureDate: Optional[datetime.date] = None
+    categories: List[str] = []
+    source: Optional[str] = None
+    note: Optional[str] = None
+    isBuiltin: bool
+    loinc: Optional[str] = None
+    favorite: bool
+
+
+class IndicatorPage(BaseModel):
+    items: List[IndicatorItem]
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+
+class IndicatorOut(BaseModel):
+    id: int
+    nameCn: str
+    nameEn: Optional[str] = None
+    type: Optional[str] = None
+    unit: str
+    referenceMin: Optional[float] = None
+    referenceMax: Optional[float] = None
+    isBuiltin: bool
+    loinc: Optional[str] = None
+    categories: List[str] = []
+
+
+class IndicatorDetailOut(BaseModel):
+    """指标详情；指标无详情时接口返回空对象（按 `exclude_unset` 导出）。"""
+
+    indicatorName: Optional[str] = None
+    introductionText: Optional[str] = None
+    measurementMethod: Optional[str] = None
+    clinicalSignificance: Optional[str] = None
+    referenceRange: Optional[str] = None
+    unit: Optional[str] = None
+    highMeaning: Optional[str] = None
+    lowMeaning: Optional[str] = None
+    highAdvice: Optional[str] = None
+    lowAdvice: Optional[str] = None
+    normalAdvice: Optional[str] = None
+    generalAdvice: Optional[str] = None
+
+
+class RecordItem(BaseModel):
+    recordId: int
+    date: datetime.date
+    value: str
+    unit: str
+    status: Optional[str] = None
+    source: Optional[str] = None
+    note: Optional[str] = None
+    admissionFileId: Optional[int] = None
+
+
+class RecordPage(BaseModel):
+    items: List[RecordItem]
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+
+class CategoryItem(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+class CategoryPage(BaseModel):
+    items: List[CategoryItem]
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+
+class CategoryOut(CategoryItem):
+    indicatorCount: int
+
+
+class UserIndicatorItem(BaseModel):
+    id: int
+    indicatorId: int
+    alias: Optional[str] = None
+    thresholdMin: Optional[float] = None
+    thresholdMax: Optional[float] = None
+    favorite: bool
+    createdAt: Optional[datetime.datetime] = None
+
+
+class UserIndicatorPage(BaseModel):
+    items: List[UserIndicatorItem]
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
@@ -2,28 +2,39 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import func
 from app.db.session import get_session
 from app.api.auth.deps import get_current_user
+from app.api.pagination import count_total, decode_cursor, decode_id, next_cursor
+from app.api.schemas import UserIndicatorPage
+from app.core.responses import TimedJSONResponse
 from app.models.user import User
 from app.models.user_indicator import UserIndicator
 from app.models.indicator import Indicator
+from app.services.dashboard import invalidate_dashboard
+from app.services.read_models import UserIndicatorRow, fetch_rows
 
 router = APIRouter()
 
 
-@router.get("")
+@router.get("", response_model=UserIndicatorPage)
 async def list_user_indicators(
     page: int = 1,
     pageSize: int = 20,
+    cursor: Optional[str] = None,
+    totalMode: Optional[str] = "exact",
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
     q = select(UserIndicator).where(UserIndicator.user_id == current_user.id)
-    total_res = await session.exec(select(func.count()).select_from(q.subquery()))
-    total = total_res.one() or 0
-    res = await session.exec(q.order_by(UserIndicator.id).offset((page - 1) * pageSize).limit(pageSize))
-    rows = res.all()
+    total = await count_total(session, q, totalMode)
+    if cursor is not None:
+        if cursor:
+            last_id = decode_id(decode_cursor(cursor, 1)[0])
+            q = q.where(UserIndicator.id > last_id)
+        q = q.order_by(UserIndicator.id).limit(pageSize)
+    else:
+        q = q.order_by(UserIndicator.id).offset((page - 1) * pageSize).limit(pageSize)
+    rows = await fetch_rows(session, q, UserIndicatorRow)
     items = [
         {
             "id": r.id,
@@ -32,11 +43,13 @@ async def list_user_indicators(
             "thresholdMin": r.threshold_min,
             "thresholdMax": r.threshold_max,
             "favorite": r.favorite,
-            "createdAt": r.created_at.isoformat() if r.created_at else None,
+            "createdAt": r.created_at,
         }
         for r in rows
     ]
-    return {"items": items, "total": total}
+    return TimedJSONResponse(
+        {"items": items, "total": total, "nextCursor": next_cursor(rows, pageSize, lambda r: [r.id])}
+    )
 
 
 @router.post("")
@@ -71,6 +84,7 @@ async def create_user_indicator(
             r.favorite = favorite
         session.add(r)
         await session.commit()
+        invalidate_dashboard(current_user.id)
         await session.refresh(r)
         return {"id": r.id}
     r = UserIndicator(
@@ -83,6 +97,7 @@ async def create_user_indicator(
     )
     session.add(r)
     await session.commit()
+    invalidate_dashboard(current_user.id)
     await session.refresh(r)
     return {"id": r.id}
 
@@ -116,6 +131,7 @@ async def update_user_indicator(
         r.favorite = favorite
     session.add(r)
     await session.commit()
+    invalidate_dashboard(current_user.id)
     return {"code": 200}
 
 
@@ -133,4 +149,5 @@ async def delete_user_indicator(
         raise HTTPException(status_code=404, detail="不存在")
     await session.delete(r)
     await session.commit()
+    invalidate_dashboard(current_user.id)
     return {"code": 200}
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+条件请求：强 ETag、If-None-Match 与按路由的 Cache-Control
+
+职责：
+- `content_etag(data)`：按内容计算强 ETag（blake2b 摘要），相同内容在各 worker 得到相同标签；
+- `not_modified(request, etag)`：请求头 If-None-Match 是否命中（支持逗号分隔列表与 `*`，按弱比较忽略 `W/` 前缀）；
+- `version_etag(*parts)`：按持久化的版本信息（主键、`updated_at` 等）计算 ETag，
+  用于需要查库才能得到内容的实体：只查版本列即可判断 304，各 worker 对同一行得到相同标签；
+- `not_modified_response` / `tagged_response`：304（无响应体）或带 ETag 的 JSON 响应，
+  均附带该路由的 `Cache-Control`（`Settings.cache_control_<route>`，空字符串表示不发送）；
+  给出 `model` 时响应体先经该 pydantic 模型校验。
+"""
+
+import hashlib
+from typing import Any, Optional, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.responses import TimedJSONResponse
+from app.core.settings import get_settings
+
+
+def content_etag(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(*parts: Any) -> str:
+    return content_etag(repr(parts).encode())
+
+
+def not_modified(request: Request, etag: Optional[str]) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _cache_headers(route: str, etag: str) -> dict:
+    headers = {"ETag": etag}
+    policy = getattr(get_settings(), f"cache_control_{route}")
+    if policy:
+        headers["Cache-Control"] = policy
+    return headers
+
+
+def not_modified_response(route: str, etag: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(route, etag))
+
+
+def tagged_response(
+    request: Request,
+    route: str,
+    content: Any,
+    etag: Optional[str] = None,
+    model: Optional[Type[BaseModel]] = None,
+) -> Response:
+    """返回带 ETag 的 JSON 响应；未给出 `etag` 时按编码后的响应体计算，命中 If-None-Match 时返回 304。
+
+    给出 `model` 时先按模型校验并导出（`exclude_unset`，未提供的字段不输出）。
+    """
+    if model is not None:
+        content = model.model_validate(content).model_dump(exclude_unset=True)
+    response = TimedJSONResponse(content)
+    etag = etag or content_etag(response.body)
+    if not_modified(request, etag):
+        return not_modified_response(route, etag)
+    response.headers.update(_cache_headers(route, etag))
+    return response
@@ -0,0 +1,186 @@
+"""
+日志后台批量写入
+
+职责：
+- `BatchedSink` 作为 loguru sink：调用方线程只把日志条目放入内存队列，由后台线程每
+  `flush_interval` 秒或积满一批时统一格式化并写出，事件循环不等待磁盘/终端 IO；
+  （不提供 `flush` 方法，否则 loguru 会在每条日志后调用它，失去批量效果）
+- 背压：队列超过上限的 80% 时丢弃 DEBUG 及以下级别，达到上限时再丢弃 INFO，WARNING 及以上
+  始终入队；丢弃数见 `dropped`，并在恢复后补写一条汇总；
+- `RotatingFile` 按大小轮转本地文件（`app.log` → `app.log.1` …，保留 `backups` 个）；
+- `json_entry` / `json_line` 把记录转为 JSON 行：时间、级别、消息、位置、进程号、`request_id`/`trace_id`
+  及其余绑定字段、异常回溯。
+"""
+
+import json
+import os
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, List, TextIO, Tuple
+
+# loguru 级别数值：DEBUG=10、INFO=20、WARNING=30
+_DEBUG_NO = 10
+_INFO_NO = 20
+
+
+def json_entry(message) -> dict:
+    """在调用方线程提取记录字段（只取引用，序列化留给后台线程）。"""
+    record = message.record
+    entry = {
+        "time": record["time"],
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "pid": record["process"].id,
+    }
+    entry.update(record["extra"])
+    exc = record["exception"]
+    if exc is not None:
+        entry["exception"] = "".join(traceback.format_exception(exc.type, exc.value, exc.traceback))
+    return entry
+
+
+def json_line(entry: dict) -> str:
+    entry["time"] = entry["time"].isoformat()
+    return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+
+class RotatingFile:
+    """按大小轮转的追加写文件（仅由后台写线程使用）。"""
+
+    def __init__(self, path: str, max_bytes: int, backups: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def write_batch(self, lines: List[str]) -> None:
+        data = "".join(lines)
+        if self.max_bytes > 0 and self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class StreamWriter:
+    """写入标准输出等文本流。"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write_batch(self, lines: List[str]) -> None:
+        self.stream.write("".join(lines))
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class BatchedSink:
+    """loguru sink：入队后由后台线程批量格式化并写出。"""
+
+    def __init__(
+        self,
+        writer,
+        extract: Callable[[Any], Any] = str,
+        render: Callable[[Any], str] = str,
+        max_queue: int = 10000,
+        flush_interval: float = 0.2,
+        batch_size: int = 512,
+    ) -> None:
+        self.writer = writer
+        self.extract = extract
+        self.render = render
+        self.max_queue = max_queue
+        self.soft_limit = int(max_queue * 0.8)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported = 0
+        self._queue: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message) -> None:
+        size = len(self._queue)
+        if size >= self.soft_limit:
+            level = message.record["level"].no
+            if level <= _DEBUG_NO or (size >= self.max_queue and level <= _INFO_NO):
+                self.dropped += 1
+                return
+        self._queue.append(self.extract(message))
+        if size + 1 == self.batch_size:
+            self._wakeup.set()
+
+    def _drain(self) -> List[Any]:
+        items = []
+        queue = self._queue
+        while queue and len(items) < self.batch_size:
+            items.append(queue.popleft())
+        return items
+
+    def _write(self, items: List[Any]) -> None:
+        lines = [self.render(item) for item in items]
+        if self.dropped != self._reported:
+            count, self._reported = self.dropped - self._reported, self.dropped
+            lines.append(self.render(self._dropped_notice(count)))
+        self.writer.write_batch(lines)
+
+    def _dropped_notice(self, count: int):
+        notice = f"log backpressure:dropped count={count}"
+        if self.render is str:
+            return f"{datetime.now():%Y-%m-%d %H:%M:%S} | WARNING | - | - | {notice}\n"
+        return {"time": datetime.now().astimezone(), "level": "WARNING", "message": notice, "pid": os.getpid()}
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            while True:
+                items = self._drain()
+                if not items:
+                    break
+                try:
+                    self._write(items)
+                except Exception:  # 写出失败不能影响业务线程，丢弃本批并继续
+                    traceback.print_exc()
+            if self._stopping and not self._queue:
+                return
+
+    def stop(self) -> None:
+        """loguru 移除 sink 时调用：写完剩余条目后关闭。"""
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.writer.close()
+
+    def stats(self) -> Tuple[int, int]:
+        """（队列长度, 累计丢弃数）"""
+        return len(self._queue), self.dropped
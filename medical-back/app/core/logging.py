@@ -1,24 +1,83 @@
-from loguru import logger
+"""
+日志子系统
+
+职责：
+- 全部日志经 loguru 输出：标准输出（`Settings.log_json` 为真时输出 JSON 行，否则为 `log_format` 文本格式）
+  与可选的本地 JSON 行文件（`log_file`，按 `log_file_max_bytes` 轮转，保留 `log_file_backups` 个）；
+- 两个 sink 均为 `app.core.log_sinks.BatchedSink`：调用方只入队，后台线程批量写出，队列积压时
+  优先丢弃 DEBUG（见 `log_queue_max`）；
+- 每条记录自动带上 `request_context` 中的 `request_id` / `trace_id`（请求之外为 "-"）；
+- 标准库 `logging` 的记录（含 `app.utils.logging_util.get_logger` 与第三方库）转发到 loguru，统一格式与去向。
+"""
+
+import atexit
+import logging
+import os
 import sys
+
+from loguru import logger
+
+from app.core.log_sinks import BatchedSink, RotatingFile, StreamWriter, json_entry, json_line
 from app.utils.request_context import request_id_ctx_var, trace_id_ctx_var
 
+_atexit_registered = False
+
+_DEFAULT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {extra[request_id]} | {extra[trace_id]} | {message}"
+
+
+def _add_correlation(record) -> None:
+    extra = record["extra"]
+    if "request_id" not in extra:
+        extra["request_id"] = request_id_ctx_var.get(None) or "-"
+    if "trace_id" not in extra:
+        extra["trace_id"] = trace_id_ctx_var.get(None) or "-"
+
+
+class _InterceptHandler(logging.Handler):
+    """把标准库 logging 的记录转交 loguru。"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        frame, depth = sys._getframe(), 0
+        while frame is not None and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
 
 def configure_logging(settings) -> None:
     logger.remove()
-    logger.add(
-        sys.stdout,
-        level=settings.log_level,
-        format=(
-            settings.log_format
-            or "{time:YYYY-MM-DD HH:mm:ss} | {level} | {extra[request_id]} | {extra[trace_id]} | {message}"
-        ),
-        enqueue=True,
-        backtrace=True,
-        diagnose=True,
-    )
+    logger.configure(patcher=_add_correlation)
+    queue_options = dict(max_queue=settings.log_queue_max, flush_interval=settings.log_flush_interval_ms / 1000)
+    if settings.log_json:
+        stdout = BatchedSink(StreamWriter(sys.stdout), extract=json_entry, render=json_line, **queue_options)
+        logger.add(stdout, level=settings.log_level, format="{message}", backtrace=True, diagnose=False)
+    else:
+        stdout = BatchedSink(StreamWriter(sys.stdout), **queue_options)
+        logger.add(
+            stdout,
+            level=settings.log_level,
+            format=settings.log_format or _DEFAULT_FORMAT,
+            backtrace=True,
+            diagnose=False,  # 不在异常回溯中展开变量值：开销大且可能把令牌、密码等写入日志
+        )
+    if settings.log_file:
+        path = settings.log_file.replace("{pid}", str(os.getpid()))
+        writer = RotatingFile(path, settings.log_file_max_bytes, settings.log_file_backups)
+        sink = BatchedSink(writer, extract=json_entry, render=json_line, **queue_options)
+        logger.add(sink, level=settings.log_level, format="{message}", diagnose=False)
+    logging.basicConfig(handlers=[_InterceptHandler()], level=logging.getLevelName(settings.log_level), force=True)
+    global _atexit_registered
+    if not _atexit_registered:
+        # 进程退出前移除 sink，由写线程写完队列中剩余的日志
+        atexit.register(logger.remove)
+        _atexit_registered = True
 
 
 def get_request_logger():
     rid = request_id_ctx_var.get(None) or "-"
     tid = trace_id_ctx_var.get(None) or "-"
-    return logger.bind(request_id=rid, trace_id=tid)
\ No newline at end of file
+    return logger.bind(request_id=rid, trace_id=tid)
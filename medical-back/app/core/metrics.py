@@ -0,0 +1,272 @@
+"""
+进程内指标注册表与 Prometheus 文本格式导出
+
+职责：
+- 计数器与直方图保存在进程内（无外部依赖）：按路由模板的请求数 `http_requests_total`、
+  耗时直方图 `http_request_duration_seconds`、进行中请求数 `http_requests_in_flight`，
+  以及连接池取连接耗时 `db_pool_checkout_seconds`（按写/读引擎区分）；
+- 抓取时采集瞬时值：连接池已借出连接数、各进程内缓存（目录、首页概览、认证用户）的命中/未命中次数与命中率；
+- 多 worker：配置 `Settings.metrics_dir` 后，各进程每 `metrics_flush_seconds` 秒（以及自身响应抓取时）
+  把快照原子写入 `<metrics_dir>/metrics-<pid>.json`，`GET /metrics` 合并目录内全部快照——计数器与直方图
+  累加（已退出 worker 的快照保留，保证计数单调），瞬时值只取存活进程；目录应在主进程启动前清空；
+  未配置时只导出当前进程。
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logging import get_request_logger
+
+# 请求耗时直方图的桶上界（秒）
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 连接池取连接耗时直方图的桶上界（秒）
+_POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_HELP = {
+    "http_requests_total": ("counter", "按路由模板、方法与状态码统计的请求数"),
+    "http_request_duration_seconds": ("histogram", "请求处理耗时（秒）"),
+    "http_requests_in_flight": ("gauge", "正在处理的请求数"),
+    "db_pool_checkout_seconds": ("histogram", "从连接池取得连接的耗时（秒，含新建连接）"),
+    "db_pool_checked_out": ("gauge", "连接池当前借出的连接数"),
+    "app_cache_hits_total": ("counter", "进程内缓存命中次数"),
+    "app_cache_misses_total": ("counter", "进程内缓存未命中次数"),
+    "app_cache_hit_ratio": ("gauge", "进程内缓存命中率（合并各 worker 后计算）"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+# 直方图值：[各桶计数..., 总和, 总数]（桶计数非累计，导出时再累加）
+_histograms: Dict[Tuple[str, Labels], List[float]] = {}
+_bucket_bounds: Dict[str, Tuple[float, ...]] = {
+    "http_request_duration_seconds": _REQUEST_BUCKETS,
+    "db_pool_checkout_seconds": _POOL_BUCKETS,
+}
+_in_flight = 0
+_pools: Dict[str, object] = {}
+_flush_task: Optional[asyncio.Task] = None
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _observe(name: str, labels: Labels, value: float) -> None:
+    bounds = _bucket_bounds[name]
+    with _lock:
+        hist = _histograms.get((name, labels))
+        if hist is None:
+            hist = _histograms[(name, labels)] = [0.0] * (len(bounds) + 3)
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(bounds)] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+
+def request_started() -> None:
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+
+
+def request_finished(method: str, route: str, status: int, seconds: float) -> None:
+    """记录一次请求；`route` 为路由模板（如 `/api/v1/indicators/{id}`），未匹配的路径统一记为 `unmatched`。"""
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+        _counters[("http_requests_total", _labels(method=method, route=route, status=str(status)))] += 1
+    _observe("http_request_duration_seconds", _labels(method=method, route=route), seconds)
+
+
+def instrument_pool(name: str, engine) -> None:
+    """为引擎的连接池记录取连接耗时；写/读引擎相同时只记录一次。"""
+    pool = engine.sync_engine.pool
+    if any(p is pool for p in _pools.values()):
+        return
+    _pools[name] = pool
+    connect = pool.connect
+    labels = _labels(engine=name)
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            _observe("db_pool_checkout_seconds", labels, time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def _cache_collectors() -> Iterable[Tuple[str, Callable[[], dict]]]:
+    from app.services.catalog_cache import catalog_stats
+    from app.services.dashboard import dashboard_cache_stats
+    from app.services.principal_cache import principal_cache_stats
+
+    return (("catalog", catalog_stats), ("dashboard", dashboard_cache_stats), ("principal", principal_cache_stats))
+
+
+def snapshot() -> dict:
+    """当前进程的指标快照（可 JSON 序列化）。"""
+    counters = []
+    for cache, collect in _cache_collectors():
+        stats = collect()
+        counters.append(["app_cache_hits_total", {"cache": cache}, stats["hits"]])
+        counters.append(["app_cache_misses_total", {"cache": cache}, stats["misses"]])
+    gauges = [["http_requests_in_flight", {}, _in_flight]]
+    for name, pool in _pools.items():
+        checked_out = getattr(pool, "checkedout", None)
+        if checked_out is not None:
+            gauges.append(["db_pool_checked_out", {"engine": name}, checked_out()])
+    with _lock:
+        counters.extend([name, dict(labels), value] for (name, labels), value in _counters.items())
+        histograms = [[name, dict(labels), list(values)] for (name, labels), values in _histograms.items()]
+    return {"pid": os.getpid(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def flush(directory: str) -> None:
+    """把当前进程快照原子写入共享目录。"""
+    path = _snapshot_path(directory, os.getpid())
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f)
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_snapshots(directory: str) -> List[dict]:
+    flush(directory)
+    snaps = []
+    for entry in os.scandir(directory):
+        if not (entry.name.startswith("metrics-") and entry.name.endswith(".json")):
+            continue
+        try:
+            with open(entry.path, encoding="utf-8") as f:
+                snaps.append(json.load(f))
+        except (OSError, ValueError):  # 写入中或已损坏的快照跳过，下次抓取再合并
+            continue
+    return snaps
+
+
+def _merge(snaps: List[dict]) -> Tuple[dict, dict, dict]:
+    counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+    histograms: Dict[Tuple[str, Labels], List[float]] = {}
+    gauges: Dict[Tuple[str, Labels], float] = defaultdict(float)
+    own = os.getpid()
+    for snap in snaps:
+        for name, labels, value in snap["counters"]:
+            counters[(name, _labels(**labels))] += value
+        for name, labels, values in snap["histograms"]:
+            key = (name, _labels(**labels))
+            merged = histograms.get(key)
+            histograms[key] = list(values) if merged is None else [a + b for a, b in zip(merged, values)]
+        if snap["pid"] == own or _pid_alive(snap["pid"]):
+            for name, labels, value in snap["gauges"]:
+                gauges[(name, _labels(**labels))] += value
+    for cache, _ in _cache_collectors():
+        labels = _labels(cache=cache)
+        hits = counters.get(("app_cache_hits_total", labels), 0)
+        total = hits + counters.get(("app_cache_misses_total", labels), 0)
+        if total:
+            gauges[("app_cache_hit_ratio", labels)] = hits / total
+    return counters, histograms, gauges
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(directory: str = "") -> str:
+    """Prometheus 文本格式（0.0.4）；`directory` 非空时合并各 worker 快照。"""
+    snaps = _load_snapshots(directory) if directory else [snapshot()]
+    counters, histograms, gauges = _merge(snaps)
+    series: Dict[str, List[str]] = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        series[name].append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+    for (name, labels), value in sorted(gauges.items()):
+        series[name].append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+    for (name, labels), values in sorted(histograms.items()):
+        bounds = _bucket_bounds[name]
+        cumulative = 0.0
+        for bound, count in zip(bounds, values):
+            cumulative += count
+            series[name].append(f"{name}_bucket{_fmt_labels(labels, ('le', repr(bound)))} {_fmt_value(cumulative)}")
+        series[name].append(f"{name}_bucket{_fmt_labels(labels, ('le', '+Inf'))} {_fmt_value(values[-1])}")
+        series[name].append(f"{name}_sum{_fmt_labels(labels)} {repr(float(values[-2]))}")
+        series[name].append(f"{name}_count{_fmt_labels(labels)} {_fmt_value(values[-1])}")
+    lines = []
+    for name, (kind, help_text) in _HELP.items():
+        if name not in series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(series[name])
+    return "\n".join(lines) + "\n"
+
+
+async def _flush_periodically(directory: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            flush(directory)
+        except OSError:
+            get_request_logger().exception("metrics:flush error")
+
+
+def start_metrics_flush(settings) -> None:
+    """配置了 `metrics_dir` 时启动快照定时写入（需在事件循环内调用）。"""
+    global _flush_task
+    if not settings.metrics_dir or _flush_task is not None:
+        return
+    os.makedirs(settings.metrics_dir, exist_ok=True)
+    flush(settings.metrics_dir)
+    _flush_task = asyncio.get_running_loop().create_task(
+        _flush_periodically(settings.metrics_dir, max(settings.metrics_flush_seconds, 0.5))
+    )
+
+
+async def stop_metrics_flush(settings) -> None:
+    """停止定时写入，并写入最后一次快照。"""
+    global _flush_task
+    task, _flush_task = _flush_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    flush(settings.metrics_dir)
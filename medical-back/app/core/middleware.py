@@ -1,24 +1,101 @@
+"""
+请求上下文中间件（纯 ASGI）
+
+职责：
+- 为每个请求生成 `request_id`，`trace_id` 沿用请求头 `X-Trace-ID`（缺省时与 `request_id` 相同，每个请求只生成一个 UUID），
+  写入上下文变量与响应头；
+- 在响应开始时追加 `X-DB-Queries`、`X-DB-Time-ms` 与 `Server-Timing`（`app` 为至响应开始的总耗时，
+  `db` 为 SQL 执行耗时，`ser` 为响应体编码耗时，见 `app.core.responses.TimedJSONResponse`）；
+- 请求结束后记录运行指标（见 `app.core.metrics`）与访问日志：访问日志按状态码抽样
+  （`Settings.access_log_sample_rate` 用于 2xx/3xx，`access_log_error_sample_rate` 用于 4xx/5xx），
+  N+1 警告不抽样；
+- 不经过 `BaseHTTPMiddleware`，不额外创建任务，也不缓冲流式响应。
+"""
+
+import random
+import time
 import uuid
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.utils.request_context import request_id_ctx_var, trace_id_ctx_var
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.core.logging import get_request_logger
+from app.core.metrics import request_started, request_finished
+from app.core.settings import get_settings
+from app.db.query_stats import begin_request, end_request, peek_request
+from app.utils.request_context import request_id_ctx_var, trace_id_ctx_var, phase_timings_ctx_var
+
 
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
         rid = str(uuid.uuid4())
-        tid = str(uuid.uuid4())
+        tid = _header(scope, b"x-trace-id") or rid
         request_id_ctx_var.set(rid)
         trace_id_ctx_var.set(tid)
-        logger = get_request_logger()
-        logger.info(f"Incoming request {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Completed request {response.status_code}")
-        response.headers["X-Request-ID"] = rid
-        response.headers["X-Trace-ID"] = tid
-        return response
+        timings = {}
+        phase_timings_ctx_var.set(timings)
+        if settings.db_query_stats:
+            begin_request(rid)
+        request_started()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", rid.encode()))
+                headers.append((b"x-trace-id", tid.encode()))
+                timing = [f"app;dur={(time.perf_counter() - started) * 1000:.1f}"]
+                stats = peek_request(rid)
+                if stats is not None:
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{stats.ms:.1f}".encode()))
+                    timing.append(f"db;dur={stats.ms:.1f}")
+                if "ser" in timings:
+                    timing.append(f"ser;dur={timings['ser'] * 1000:.1f}")
+                headers.append((b"server-timing", ", ".join(timing).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = end_request(rid) if settings.db_query_stats else None
+            route = scope.get("route")
+            request_finished(scope["method"], getattr(route, "path", "unmatched"), status, elapsed)
+            _log_access(settings, scope, status, elapsed, stats)
+
+
+def _header(scope: Scope, name: bytes):
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _log_access(settings, scope: Scope, status: int, elapsed: float, stats) -> None:
+    rate = settings.access_log_error_sample_rate if status >= 400 else settings.access_log_sample_rate
+    repeated = stats.repeated(settings.db_query_repeat_warn) if stats is not None else []
+    sampled = rate >= 1 or (rate > 0 and random.random() < rate)
+    if not (sampled or repeated):
+        return
+    logger = get_request_logger()
+    if sampled:
+        db = f" db_queries={stats.count} db_ms={stats.ms:.1f}" if stats is not None else ""
+        logger.info(f"Completed request {scope['method']} {scope['path']} {status} ms={elapsed * 1000:.1f}{db}")
+    for sql, n in repeated:
+        logger.warning(f"db n+1:suspect path={scope['path']} count={n} sql={sql[:200]}")
 
 
 def setup_middleware(app: FastAPI) -> None:
-    app.add_middleware(RequestContextMiddleware)
\ No newline at end of file
+    app.add_middleware(RequestContextMiddleware)
@@ -7,8 +7,53 @@ class Settings(BaseSettings):
     version: str = "0.1.0"
     api_prefix: str = "/api/v1"
     sqlite_url: str = "sqlite+aiosqlite:///./medical.sqlite3"
+    sqlite_split_read_write: bool = True  # 文件库拆分为单连接写引擎 + 读连接池
+    sqlite_read_pool_size: int = 8  # 读连接池常驻连接数（突发时最多再溢出同样数量）
+    sqlite_journal_mode: str = "WAL"  # 日志模式（WAL 下读写互不阻塞；空字符串表示不设置）
+    sqlite_synchronous: str = "NORMAL"  # WAL 下 NORMAL 仅在断电时可能丢失最近提交，不会损坏数据库
+    sqlite_mmap_size: int = 268435456  # 内存映射读取上限（字节，0 关闭）
+    sqlite_cache_size: int = -65536  # 每连接页缓存（负数单位为 KiB，即 64MB）
+    sqlite_busy_timeout_ms: int = 5000  # 遇到锁时的等待时长（毫秒）
+    sqlite_temp_store: str = "MEMORY"  # 临时表与排序中间结果的存放位置
     log_level: str = "INFO"
     log_format: Optional[str] = None
+    log_json: bool = False  # 标准输出是否为 JSON 行（默认文本格式，便于本地查看）
+    log_file: str = ""  # JSON 行日志文件路径（空字符串关闭；可含 {pid}，多 worker 时每进程一个文件）
+    log_file_max_bytes: int = 52428800  # 单个日志文件的轮转大小（字节）
+    log_file_backups: int = 5  # 保留的轮转文件个数
+    log_queue_max: int = 10000  # 后台写入队列上限：超过 80% 丢弃 DEBUG，满时丢弃 INFO，WARNING 及以上不丢弃
+    log_flush_interval_ms: int = 200  # 后台写线程的最长写出间隔（毫秒）
+    access_log_sample_rate: float = 1.0  # 2xx/3xx 访问日志的抽样比例（0~1，生产环境可设为 0.01）
+    access_log_error_sample_rate: float = 1.0  # 4xx/5xx 访问日志的抽样比例
+    db_query_stats: bool = True  # 按请求统计 SQL 语句数与耗时（响应头 X-DB-Queries / X-DB-Time-ms）
+    db_query_repeat_warn: int = 10  # 同一语句模板在单个请求内重复超过该次数时输出 N+1 警告
+    metrics_dir: str = ""  # 多 worker 时各进程指标快照的共享目录（需在启动前清空；空字符串表示只导出当前进程）
+    metrics_flush_seconds: float = 5.0  # 各进程写入指标快照的间隔（秒）
+    count_estimate_cap: int = 1000  # totalMode=estimate 时的计数上限
+    catalog_cache_ttl_seconds: int = 300  # 目录缓存最长存活时间（秒，<=0 表示仅靠失效通知）
+    cache_control_categories: str = "private, max-age=300"  # GET /categories、/categories/{id} 的 Cache-Control（空字符串表示不发送）
+    cache_control_indicator: str = "private, no-cache"  # GET /indicators/{id}（自定义指标可被修改，每次按 ETag 重新验证）
+    cache_control_indicator_detail: str = "private, no-cache"  # GET /indicators/{id}/detail
+    dashboard_cache_ttl_seconds: int = 60  # 首页概览按用户缓存的存活时间（秒，<=0 关闭缓存）
+    dashboard_cache_max_entries: int = 1024  # 首页概览缓存的最大条目数（LRU 淘汰）
+    principal_cache_ttl_seconds: int = 30  # 认证用户缓存的存活时间（秒，<=0 关闭缓存；多 worker 下即软删除生效的最长延迟）
+    principal_cache_max_entries: int = 4096  # 认证用户缓存的最大条目数（LRU 淘汰）
+    password_scrypt_n: int = 16384  # scrypt CPU/内存成本（2 的幂；约占 128 * n * r 字节内存）
+    password_scrypt_r: int = 8  # scrypt 块大小
+    password_scrypt_p: int = 1  # scrypt 并行度
+    password_hash_workers: int = 4  # 密码哈希线程池大小（限制同时进行的哈希计算数）
+    record_write_batching: bool = False  # 单条记录写入是否经组提交队列合并提交
+    record_write_batch_max_items: int = 100  # 每组最多合并的写操作数
+    record_write_batch_max_delay_ms: int = 5  # 组内首个写操作最长等待合并的时间（毫秒）
+    record_write_queue_max: int = 2000  # 等待提交的写操作上限（背压）
+    record_write_enqueue_timeout_ms: int = 2000  # 队列满时入队最长等待（毫秒），超时返回 503
+    record_write_durability: str = "commit"  # commit：组提交成功后返回；flush：组内写入完成即返回（崩溃可能丢失最后一组）
+    warmup_modules: str = "numpy,openpyxl"  # 启动时（接受请求前）预热的延迟导入模块（逗号分隔，空字符串关闭）
+    archive_after_days: int = 0  # 软删除超过该天数的行迁入归档表（<=0 关闭后台归档，默认关闭）
+    archive_interval_minutes: int = 1440  # 后台归档任务的执行间隔（分钟，<=0 关闭）
+    archive_batch_size: int = 500  # 归档每批迁移的行数（每批一个事务）
+    archive_batch_pause_ms: int = 50  # 归档批次之间让出写连接的时长（毫秒）
+    trend_use_rollups: bool = True  # 趋势分析的完整时间桶是否读取预聚合表 IndicatorRollup
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,51 @@
+"""
+重型依赖的启动预热
+
+职责：
+- 数值计算、表格解析以及后续的 ML/RAG（torch、transformers、langchain、llama-index、向量库等）依赖
+  一律经 `app.utils.lazy_import.lazy_import`（`lazy_loader.load`）在模块级声明为惰性模块，`create_app()` 与启动流程不导入它们；
+- 启动事件中（建表之后、开始接受请求之前）按 `Settings.warmup_modules`（逗号分隔，空字符串关闭）
+  在事件循环线程逐个导入，首个请求不再承担导入耗时；Python 3.11 的惰性模块首次属性访问不是线程安全的，
+  因此不在后台线程预热，避免与请求处理中的首次访问并发执行 `exec_module`；未列出的模块由首个用到的请求触发导入；
+- 预热状态见 `warmup_status()`（`GET /health/modules`）。
+"""
+
+import time
+from typing import Dict, List
+
+from app.core.logging import get_request_logger
+from app.utils.lazy_import import lazy_modules, load_module
+
+_done = False
+_errors: Dict[str, str] = {}
+
+
+def _module_names(raw: str) -> List[str]:
+    return [name.strip() for name in (raw or "").split(",") if name.strip()]
+
+
+def run_warmup(settings) -> None:
+    """同步导入预热模块（在启动事件中调用，此时尚未处理请求）。"""
+    global _done
+    names = _module_names(settings.warmup_modules)
+    if not names or _done:
+        return
+    log = get_request_logger()
+    for name in names:
+        started = time.perf_counter()
+        try:
+            load_module(name)
+        except Exception as e:  # 可选依赖未安装时只记录，不影响服务
+            _errors[name] = repr(e)
+            log.warning(f"warmup:{name} unavailable error={e!r}")
+            continue
+        log.info(f"warmup:{name} loaded ms={(time.perf_counter() - started) * 1000:.0f}")
+    _done = True
+
+
+def warmup_status() -> dict:
+    return {
+        "done": _done,
+        "modules": lazy_modules(),
+        "errors": dict(_errors),
+    }
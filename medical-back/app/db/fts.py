@@ -0,0 +1,154 @@
+"""
+指标关键词全文索引（SQLite FTS5 trigram）
+
+职责：
+- 维护虚拟表 `indicator_fts`，镜像 `Indicator` 的中英文名称与 LOINC，以及 `UserIndicator.alias` 别名；
+  trigram 分词支持中文任意子串匹配；
+- 通过触发器与业务表保持同步：指标行的 rowid 为 `indicator.id`，别名行的 rowid 为 `-userindicator.id`，
+  增删改均按 rowid 定位，无需扫描全文表；
+- 提供关键词检索子查询（按 bm25 相关度排序），供指标列表与分类下指标列表使用。
+
+说明：
+- 仅在 SQLite 且 FTS5 可用时启用；其他数据库或关键词不足 3 个字符（trigram 下限）时回退到 LIKE。
+"""
+
+from sqlalchemy import case, column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# 关键词最短长度（trigram 分词要求至少 3 个字符）
+MIN_FTS_KEYWORD_LENGTH = 3
+
+INDICATOR_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS indicator_fts USING fts5(
+        name_cn, name_en, loinc, alias,
+        indicator_id UNINDEXED, user_id UNINDEXED,
+        tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicator_fts_ai AFTER INSERT ON indicator BEGIN
+        INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+        VALUES (new.id, new.name_cn, new.name_en, new.loinc, NULL, new.id, NULL);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicator_fts_au AFTER UPDATE OF name_cn, name_en, loinc ON indicator BEGIN
+        DELETE FROM indicator_fts WHERE rowid = old.id;
+        INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+        VALUES (new.id, new.name_cn, new.name_en, new.loinc, NULL, new.id, NULL);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS indicator_fts_ad AFTER DELETE ON indicator BEGIN
+        DELETE FROM indicator_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS userindicator_fts_ai AFTER INSERT ON userindicator
+    WHEN new.alias IS NOT NULL AND new.alias != '' BEGIN
+        INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+        VALUES (-new.id, NULL, NULL, NULL, new.alias, new.indicator_id, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS userindicator_fts_au AFTER UPDATE OF alias, indicator_id, user_id ON userindicator
+    BEGIN
+        DELETE FROM indicator_fts WHERE rowid = -old.id;
+        INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+        SELECT -new.id, NULL, NULL, NULL, new.alias, new.indicator_id, new.user_id
+        WHERE new.alias IS NOT NULL AND new.alias != '';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS userindicator_fts_ad AFTER DELETE ON userindicator BEGIN
+        DELETE FROM indicator_fts WHERE rowid = -old.id;
+    END
+    """,
+]
+
+INDICATOR_FTS_POPULATE = [
+    "DELETE FROM indicator_fts",
+    """
+    INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+    SELECT id, name_cn, name_en, loinc, NULL, id, NULL FROM indicator
+    """,
+    """
+    INSERT INTO indicator_fts(rowid, name_cn, name_en, loinc, alias, indicator_id, user_id)
+    SELECT -id, NULL, NULL, NULL, alias, indicator_id, user_id FROM userindicator
+    WHERE alias IS NOT NULL AND alias != ''
+    """,
+]
+
+indicator_fts = table(
+    "indicator_fts",
+    column("rowid"),
+    column("indicator_id"),
+    column("user_id"),
+    column("rank"),
+)
+
+_fts_ready = False
+
+
+def indicator_fts_ready() -> bool:
+    """当前进程是否已启用全文索引。"""
+    return _fts_ready
+
+
+async def setup_indicator_fts(conn: AsyncConnection) -> bool:
+    """创建全文表与同步触发器；全文表为空而指标已存在时补建索引。返回是否启用。"""
+    global _fts_ready
+    if conn.dialect.name != "sqlite":
+        _fts_ready = False
+        return False
+    for ddl in INDICATOR_FTS_DDL:
+        await conn.exec_driver_sql(ddl)
+    fts_empty = (await conn.exec_driver_sql("SELECT 1 FROM indicator_fts LIMIT 1")).first() is None
+    has_indicator = (await conn.exec_driver_sql("SELECT 1 FROM indicator LIMIT 1")).first() is not None
+    if fts_empty and has_indicator:
+        await rebuild_indicator_fts(conn)
+    _fts_ready = True
+    return True
+
+
+async def rebuild_indicator_fts(conn: AsyncConnection) -> None:
+    """依据 `indicator` 与 `userindicator` 全量重建全文索引。"""
+    for stmt in INDICATOR_FTS_POPULATE:
+        await conn.exec_driver_sql(stmt)
+
+
+def _fts_phrase(keyword: str) -> str:
+    # 以短语形式检索，避免用户输入被解析为 FTS5 查询语法
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+def _keyword_hits(keyword: str, user_id: int, *columns):
+    keyword = (keyword or "").strip()
+    if not _fts_ready or len(keyword) < MIN_FTS_KEYWORD_LENGTH:
+        return None
+    # 指标行 rowid 即指标 ID，只有别名行才读取 UNINDEXED 列（读取列值需要加载文档内容，开销明显）
+    hit_id = case((indicator_fts.c.rowid > 0, indicator_fts.c.rowid), else_=indicator_fts.c.indicator_id)
+    return (
+        select(hit_id.label("indicator_id"), *columns)
+        .where(literal_column("indicator_fts").op("MATCH")(_fts_phrase(keyword)))
+        .where(or_(indicator_fts.c.rowid > 0, indicator_fts.c.user_id == user_id))
+    )
+
+
+def indicator_keyword_ids(keyword: str, user_id: int):
+    """返回命中关键词的指标 ID 查询（用于 IN 过滤与计数）；不可用时返回 None，调用方回退到 LIKE。"""
+    return _keyword_hits(keyword, user_id)
+
+
+def indicator_keyword_rank(keyword: str, user_id: int):
+    """返回 `(indicator_id, rank)` 相关度子查询（rank 越小越相关）；不可用时返回 None。"""
+    hits = _keyword_hits(keyword, user_id, indicator_fts.c.rank.label("rank"))
+    if hits is None:
+        return None
+    hits = hits.subquery("hits")
+    return (
+        select(hits.c.indicator_id, func.min(hits.c.rank).label("rank"))
+        .group_by(hits.c.indicator_id)
+        .subquery("kw")
+    )
@@ -0,0 +1,148 @@
+"""
+数据库维护命令
+
+用法（在 `medical-back/` 目录下执行）：
+- `python -m app.db.maintenance rebuild-latest`：依据历史记录重建 `IndicatorLatest` 最新记录快照表。
+- `python -m app.db.maintenance rebuild-fts`：重建指标关键词全文索引 `indicator_fts`（仅 SQLite）。
+- `python -m app.db.maintenance backfill-record-values`：补齐新增列后，为全部记录回填 `value_num/status`
+  并重建最新记录快照与数值预聚合。
+- `python -m app.db.maintenance rebuild-rollups`：依据历史记录重建 `IndicatorRollup` day/week/month 预聚合。
+- `python -m app.db.maintenance verify-rollups`：比对预聚合与原始记录，存在差异时以非零状态码退出。
+- `python -m app.db.maintenance archive-deleted [--days N]`：把软删除超过 N 天（默认 `Settings.archive_after_days`，
+  未配置时须给出）的记录、住院文件与住院记录迁入归档表。
+
+说明：
+- 命令复用应用的引擎与会话工厂（DSN 来自 `Settings.sqlite_url`），执行前会确保数据表存在。
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlmodel import SQLModel
+
+from app.db.session import engine, async_session_factory
+from app.core.settings import get_settings
+from app.core.logging import configure_logging, get_request_logger
+
+
+async def rebuild_latest() -> int:
+    """重建最新记录快照表，返回写入行数。"""
+    from app.services.latest_reading import rebuild_latest_readings
+
+    async with async_session_factory() as session:
+        total = await rebuild_latest_readings(session)
+        await session.commit()
+    return total
+
+
+async def rebuild_fts() -> bool:
+    """重建指标关键词全文索引，返回是否启用（非 SQLite 时为 False）。"""
+    from app.db.fts import setup_indicator_fts, rebuild_indicator_fts
+
+    async with engine.begin() as conn:
+        if not await setup_indicator_fts(conn):
+            return False
+        await rebuild_indicator_fts(conn)
+    return True
+
+
+async def backfill_values() -> int:
+    """补齐结构后回填记录数值与状态列，并重建最新记录快照与预聚合，返回回填行数。"""
+    from app.db.migrations import upgrade_schema, backfill_record_values
+    from app.services.latest_reading import rebuild_latest_readings
+    from app.services.rollups import rebuild_rollups
+
+    async with engine.begin() as conn:
+        await upgrade_schema(conn)
+    async with async_session_factory() as session:
+        total = await backfill_record_values(session)
+        await rebuild_latest_readings(session)
+        await rebuild_rollups(session)
+        await session.commit()
+    return total
+
+
+async def rebuild_rollup_table() -> int:
+    """重建预聚合表，返回写入行数。"""
+    from app.services.rollups import rebuild_rollups
+
+    async with async_session_factory() as session:
+        total = await rebuild_rollups(session)
+        await session.commit()
+    return total
+
+
+async def verify_rollup_table() -> dict:
+    """校验预聚合表，返回缺失/多余/不一致的桶数。"""
+    from app.services.rollups import verify_rollups
+
+    async with async_session_factory() as session:
+        return await verify_rollups(session)
+
+
+async def archive_deleted_rows(days: int) -> dict:
+    """迁移软删除超过 `days` 天的行到归档表，返回各表迁移行数。"""
+    from app.services.archival import archive_deleted
+
+    settings = get_settings()
+    async with async_session_factory() as session:
+        return await archive_deleted(session, days, settings.archive_batch_size)
+
+
+async def _run(command: str, days: int) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    log = get_request_logger()
+    code = 0
+    if command == "rebuild-latest":
+        total = await rebuild_latest()
+        log.info(f"maintenance rebuild-latest:done rows={total}")
+    elif command == "rebuild-fts":
+        enabled = await rebuild_fts()
+        log.info(f"maintenance rebuild-fts:{'done' if enabled else 'skipped'}")
+    elif command == "backfill-record-values":
+        total = await backfill_values()
+        log.info(f"maintenance backfill-record-values:done rows={total}")
+    elif command == "rebuild-rollups":
+        total = await rebuild_rollup_table()
+        log.info(f"maintenance rebuild-rollups:done rows={total}")
+    elif command == "verify-rollups":
+        result = await verify_rollup_table()
+        log.info("maintenance verify-rollups:" + " ".join(f"{k}={v}" for k, v in result.items()))
+        if result["missing"] or result["extra"] or result["mismatched"]:
+            code = 1
+    elif command == "archive-deleted":
+        result = await archive_deleted_rows(days)
+        log.info("maintenance archive-deleted:" + " ".join(f"{k}={v}" for k, v in result.items()))
+    await engine.dispose()
+    return code
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.db.maintenance", description="数据库维护命令")
+    parser.add_argument(
+        "command",
+        choices=[
+            "rebuild-latest", "rebuild-fts", "backfill-record-values", "rebuild-rollups", "verify-rollups",
+            "archive-deleted",
+        ],
+        help=(
+            "rebuild-latest：重建最新记录快照；rebuild-fts：重建指标全文索引；"
+            "backfill-record-values：回填记录数值与状态列；"
+            "rebuild-rollups / verify-rollups：重建 / 校验数值预聚合；"
+            "archive-deleted：迁移软删除超期的行到归档表"
+        ),
+    )
+    parser.add_argument("--days", type=int, default=None, help="archive-deleted 的保留天数（默认取配置）")
+    args = parser.parse_args(argv)
+    settings = get_settings()
+    configure_logging(settings)
+    days = settings.archive_after_days if args.days is None else args.days
+    if args.command == "archive-deleted" and args.days is None and days <= 0:
+        parser.error("archive-deleted 需要 --days N（未配置 ARCHIVE_AFTER_DAYS）")
+    sys.exit(asyncio.run(_run(args.command, days)))
+
+
+if __name__ == "__main__":
+    main()
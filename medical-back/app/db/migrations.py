@@ -0,0 +1,105 @@
+"""
+轻量级结构升级（无迁移工具时的增量列/索引补齐）
+
+职责：
+- `create_all` 只会创建缺失的表，不会为已有表补列；`upgrade_schema` 在启动时为旧库补齐新增列与索引，
+  并删除已被部分索引（`WHERE deleted_at IS NULL`）取代的全量复合索引；
+- `backfill_record_values` 为历史记录回填 `value_num/status` 派生列（启动时补列后自动执行，
+  也可通过 `python -m app.db.maintenance backfill-record-values` 手动执行）。
+"""
+
+from typing import List
+
+from sqlalchemy import inspect, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.indicator import IndicatorRecord
+from app.services.record_values import parse_value_num, record_status
+
+# 已有表上新增的列：(表名, 列名, 列类型 DDL)
+_ADDED_COLUMNS = [
+    ("indicatorrecord", "value_num", "FLOAT"),
+    ("indicatorrecord", "status", "VARCHAR"),
+    ("indicatorlatest", "value_num", "FLOAT"),
+]
+
+# 已有表上新增的索引（按名称从模型元数据中查找）
+_ADDED_INDEXES = [
+    ("indicator", "idx_indicator_live_owner"),
+    ("indicatorrecord", "idx_indicatorrecord_live_indicator_measured"),
+    ("indicatorrecord", "idx_indicatorrecord_live_user_measured"),
+    ("indicatorrecord", "idx_indicatorrecord_live_user_indicator_measured"),
+    ("indicatorrecord", "idx_indicatorrecord_live_user_indicator_status"),
+    ("indicatorrecord", "idx_indicatorrecord_deleted"),
+    ("admission", "idx_admission_live_user_dates"),
+    ("admission", "idx_admission_deleted"),
+    ("admissionfile", "idx_admissionfile_live_user_uploaded"),
+    ("admissionfile", "idx_admissionfile_live_admission_filename"),
+    ("admissionfile", "idx_admissionfile_deleted"),
+]
+
+# 已被同列部分索引取代、需从旧库删除的全量索引
+_DROPPED_INDEXES = [
+    "idx_indicatorrecord_indicator_measured",
+    "idx_indicatorrecord_user_measured",
+    "idx_indicatorrecord_user_indicator_status",
+    "idx_admission_user_dates",
+    "idx_admissionfile_user_uploaded",
+    "idx_admissionfile_admission_filename",
+]
+
+# 回填时每批处理的行数
+_BACKFILL_BATCH_SIZE = 1000
+
+
+def _existing_columns(sync_conn, table: str) -> set:
+    return {c["name"] for c in inspect(sync_conn).get_columns(table)}
+
+
+def _create_indexes(sync_conn) -> None:
+    from sqlmodel import SQLModel
+
+    for table, name in _ADDED_INDEXES:
+        for idx in SQLModel.metadata.tables[table].indexes:
+            if idx.name == name:
+                idx.create(sync_conn, checkfirst=True)
+
+
+async def upgrade_schema(conn: AsyncConnection) -> List[str]:
+    """为已有表补齐新增列与索引，返回新增的 `表.列` 列表。"""
+    added = []
+    for table, column, ddl_type in _ADDED_COLUMNS:
+        existing = await conn.run_sync(_existing_columns, table)
+        if column not in existing:
+            await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+            added.append(f"{table}.{column}")
+    await conn.run_sync(_create_indexes)
+    for name in _DROPPED_INDEXES:
+        await conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    return added
+
+
+async def backfill_record_values(session: AsyncSession) -> int:
+    """按主键分批回填全部记录的 `value_num/status`，返回处理行数（每批提交）。"""
+    last_id = 0
+    total = 0
+    while True:
+        res = await session.exec(
+            select(IndicatorRecord.id, IndicatorRecord.value, IndicatorRecord.ref_low, IndicatorRecord.ref_high)
+            .where(IndicatorRecord.id > last_id)
+            .order_by(IndicatorRecord.id)
+            .limit(_BACKFILL_BATCH_SIZE)
+        )
+        rows = res.all()
+        if not rows:
+            return total
+        params = [
+            {"id": rid, "value_num": parse_value_num(value), "status": record_status(value, low, high)}
+            for rid, value, low, high in rows
+        ]
+        await session.execute(update(IndicatorRecord), params)
+        await session.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
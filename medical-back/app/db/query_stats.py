@@ -0,0 +1,98 @@
+"""
+按请求统计 SQL 语句数与耗时，识别 N+1 查询
+
+职责：
+- 在写/读引擎上注册 `before/after_cursor_execute` 事件，按 `request_id_ctx_var` 归集当前请求执行的
+  语句数、数据库耗时与各语句模板（占位符参数化后的 SQL，`IN (?, ?, ...)` 折叠为 `IN (?)`）的出现次数；
+- `RequestContextMiddleware` 在请求开始/结束时调用 `begin_request` / `end_request`，把结果写入响应头
+  `X-DB-Queries`、`X-DB-Time-ms` 与完成日志；同一模板重复超过 `Settings.db_query_repeat_warn` 次时
+  输出 `db n+1:suspect` 警告；
+- 请求之外（启动流程、后台任务、写入队列）执行的语句不统计；
+- 测试中用 `assert_query_budget(response, n)` 断言某个接口的查询预算。
+"""
+
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.request_context import request_id_ctx_var
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%\(\w+\)s|:\w+|\$\d+)(\s*,\s*(\?|%\(\w+\)s|:\w+|\$\d+))+\s*\)")
+
+
+class QueryStats:
+    """单个请求的语句统计。"""
+
+    __slots__ = ("count", "seconds", "templates")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.templates: Counter = Counter()
+
+    @property
+    def ms(self) -> float:
+        return self.seconds * 1000
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """出现次数超过 `threshold` 的语句模板，按次数降序。"""
+        return [(sql, n) for sql, n in self.templates.most_common() if n > threshold]
+
+
+_active: Dict[str, QueryStats] = {}
+
+
+def statement_template(statement: str) -> str:
+    """归一化语句文本：压缩空白并折叠展开后的 IN 参数列表。"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    rid = request_id_ctx_var.get(None)
+    if rid is not None and rid in _active:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    rid = request_id_ctx_var.get(None)
+    stats = _active.get(rid) if rid is not None else None
+    if stats is None:
+        return
+    starts = conn.info.get("query_stats_start")
+    if starts:
+        stats.seconds += time.perf_counter() - starts.pop()
+    stats.count += 1
+    stats.templates[statement_template(statement)] += 1
+
+
+def install_query_stats(*engines: AsyncEngine) -> None:
+    """为引擎注册统计事件（同一引擎只注册一次）。"""
+    for eng in engines:
+        target = eng.sync_engine
+        if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+            event.listen(target, "before_cursor_execute", _before_cursor_execute)
+            event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def begin_request(request_id: str) -> None:
+    _active[request_id] = QueryStats()
+
+
+def peek_request(request_id: str) -> Optional[QueryStats]:
+    """当前请求截至目前的统计（响应开始时写响应头用），未开启统计时为 None。"""
+    return _active.get(request_id)
+
+
+def end_request(request_id: str) -> Optional[QueryStats]:
+    return _active.pop(request_id, None)
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """测试辅助：按响应头 `X-DB-Queries` 断言接口执行的语句数不超过预算。"""
+    used = int(response.headers["X-DB-Queries"])
+    assert used <= max_queries, f"{response.request.method} {response.request.url} 执行了 {used} 条语句，预算 {max_queries}"
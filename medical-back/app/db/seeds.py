@@ -8,219 +8,277 @@
 说明：
 - 设计对齐 `docs/design.md` 与 `docs/database_design.md`；支持缺失 `category.json` 的兼容回退。
 - 类型推断：当指标 `type` 缺省时，按 `unit` 推断（`qualitative|n/a|na|none` → `text`）。
+- 版本跳过：两个数据文件内容的 SHA-256 写入 `SystemLog.context_json.sha256`，与上一次种子日志一致且
+  内置指标已存在时直接返回，启动期不再读库比对。
+- 批量导入：每张表一次查询预加载现有行到内存映射，跳过无变化的行，其余以 `INSERT ... ON CONFLICT` 批量 upsert
+  （分类按 name、带 LOINC 的指标按 loinc、详情按 indicator_id、关联按主键）；无 LOINC 的内置指标
+  按 `(owner_user_id IS NULL, name_cn)` 在内存中匹配（SQLite 唯一约束不约束 NULL），已存在时仅在字段变化时批量 UPDATE。
 """
 
+from datetime import datetime
 from pathlib import Path
+import hashlib
 import json
-from typing import Dict
+from typing import Dict, List, Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import select
 
-from app.core.settings import get_settings
+from app.db.session import async_session_factory as _session_factory
 from app.models.indicator import Category, Indicator, IndicatorDetail, IndicatorCategoryLink
 from app.models.system import SystemLog
 
 
-# 读取数据库设置，创建异步引擎与会话工厂（与应用一致的 DSN）
-settings = get_settings()
-_engine = create_async_engine(settings.sqlite_url, echo=False, future=True)
-_session_factory = sessionmaker(
-    bind=_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False, autocommit=False
-)
-
 # 数据文件路径常量（定位到 app/data）
 _DATA_DIR = Path(__file__).resolve().parents[1] / "data"
-_IND_FILE_PATH = _DATA_DIR / "indicators.json"
-_CAT_FILE_PATH = _DATA_DIR / "category.json"
+_IND_FILE_NAME = "indicators.json"
+_CAT_FILE_NAME = "category.json"
+
+_SEED_LOG_PREFIX = "seed_builtins:"
+# 单条批量语句的行数
+_SEED_BATCH_SIZE = 500
+# 指标详情中可由数据文件写入的列
+_DETAIL_COLUMNS = tuple(
+    c.name for c in IndicatorDetail.__table__.columns
+    if c.name not in ("id", "indicator_id", "created_at", "updated_at", "deleted_at")
+)
+
+
+def _infer_type(it: dict, unit: str) -> str:
+    ind_type = it.get("type")
+    if not ind_type:
+        u = (unit or "").lower()
+        ind_type = "text" if u in {"qualitative", "n/a", "na", "none"} else "numeric"
+    return ind_type
+
+
+async def _executemany(session, stmt, rows: List[dict]) -> None:
+    for i in range(0, len(rows), _SEED_BATCH_SIZE):
+        await session.execute(stmt, rows[i:i + _SEED_BATCH_SIZE])
+
 
+async def _last_seed_hash(session) -> Optional[str]:
+    res = await session.exec(
+        select(SystemLog.context_json)
+        .where(SystemLog.message.startswith(_SEED_LOG_PREFIX))
+        .order_by(SystemLog.id.desc())
+        .limit(1)
+    )
+    raw = res.first()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw).get("sha256")
+    except (ValueError, AttributeError):
+        return None
 
-async def run_seeds() -> None:
-    """加载并导入内置指标/分类/详情，幂等执行。
+
+async def _load_indicator_keys(session) -> tuple:
+    """一次查询预加载内置候选指标：{loinc → 行}、{name_cn → 行}（仅 owner_user_id 为空）。"""
+    res = await session.exec(
+        select(
+            Indicator.id, Indicator.loinc, Indicator.name_cn, Indicator.owner_user_id, Indicator.name_en,
+            Indicator.unit, Indicator.type, Indicator.reference_min, Indicator.reference_max, Indicator.is_builtin,
+        ).where(or_(Indicator.loinc.is_not(None), Indicator.owner_user_id.is_(None)))
+    )
+    by_loinc: Dict[str, tuple] = {}
+    by_name: Dict[str, tuple] = {}
+    for row in res.all():
+        if row.loinc:
+            by_loinc[row.loinc] = row
+        if row.owner_user_id is None:
+            by_name[row.name_cn] = row
+    return by_loinc, by_name
+
+
+async def run_seeds(data_dir: Optional[Path] = None, force: bool = False) -> bool:
+    """加载并导入内置指标/分类/详情，幂等执行；返回是否实际导入（数据未变化时跳过）。
 
     步骤：
-    1. 读取 `indicators.json`（必需）与 `category.json`（可选）。
-    2. upsert 分类并记录 {name → id} 映射。
-    3. upsert 指标（优先按 `loinc`，否则按 `(owner_user_id IS NULL, name_cn)`），并维护 loinc/name 映射。
-    4. upsert 指标详情（1:1）。
-    5. 依据分类成员建立 `IndicatorCategoryLink` 多对多关联，幂等避免重复。
-    6. 写入系统日志并提交事务。
+    1. 读取 `indicators.json`（必需）与 `category.json`（可选），计算内容哈希；与上次一致则跳过。
+    2. 批量 upsert 分类（name 唯一）并重新加载 {name → id} 映射。
+    3. 预加载指标后，新指标批量插入（带 LOINC 的按 loinc ON CONFLICT），已有指标仅对变化字段批量更新。
+    4. 批量 upsert 指标详情（1:1，按 indicator_id ON CONFLICT，空值不覆盖已有内容）。
+    5. 依据分类成员批量建立 `IndicatorCategoryLink`（ON CONFLICT DO NOTHING）。
+    6. 写入带哈希的系统日志并提交事务。
     """
+    data_dir = data_dir or _DATA_DIR
+    ind_path = data_dir / _IND_FILE_NAME
+    cat_path = data_dir / _CAT_FILE_NAME
 
     # 读取指标数据（必须存在，否则直接返回）
-    if not _IND_FILE_PATH.exists():
-        return
+    if not ind_path.exists():
+        return False
+
+    ind_bytes = ind_path.read_bytes()
+    cat_bytes = cat_path.read_bytes() if cat_path.exists() else b""
+    digest = hashlib.sha256(ind_bytes + b"\0" + cat_bytes).hexdigest()
 
-    with _IND_FILE_PATH.open("r", encoding="utf-8") as f:
-        ind_payload = json.load(f)
+    async with _session_factory() as session:
+        if not force and await _last_seed_hash(session) == digest:
+            has_builtin = await session.exec(select(Indicator.id).where(Indicator.is_builtin.is_(True)).limit(1))
+            if has_builtin.first() is not None:
+                return False
 
-    indicators = ind_payload.get("indicators", [])
-    ind_version = ind_payload.get("dataset_version", "unknown")
+        ind_payload = json.loads(ind_bytes.decode("utf-8"))
+        indicators = ind_payload.get("indicators", [])
+        ind_version = ind_payload.get("dataset_version", "unknown")
 
-    # 读取分类数据（优先 category.json，缺失则兼容旧版 indicators.json）
-    if _CAT_FILE_PATH.exists():
-        with _CAT_FILE_PATH.open("r", encoding="utf-8") as f:
-            cat_payload = json.load(f)
+        # 读取分类数据（优先 category.json，缺失则兼容旧版 indicators.json）
+        if cat_bytes:
+            cat_payload = json.loads(cat_bytes.decode("utf-8"))
             categories = cat_payload.get("categories", [])
             cat_version = cat_payload.get("dataset_version", "unknown")
-    else:
-        categories = ind_payload.get("categories", [])
-        cat_version = ind_version
+        else:
+            categories = ind_payload.get("categories", [])
+            cat_version = ind_version
 
-    async with _session_factory() as session:
-        # 映射用于后续快速建立分类-指标关联
-        cat_id_map: Dict[str, int] = {}
-        ind_by_loinc: Dict[str, int] = {}
-        ind_by_name: Dict[str, int] = {}
+        # 分类 upsert（name 唯一；description 为空时保留原值）
+        cat_rows = {c["name"]: {"name": c["name"], "description": c.get("description")} for c in categories if c.get("name")}
+        if cat_rows:
+            stmt = sqlite_insert(Category.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Category.name],
+                set_={"description": func.coalesce(stmt.excluded.description, Category.description)},
+            )
+            await _executemany(session, stmt, list(cat_rows.values()))
+        res = await session.exec(select(Category.name, Category.id))
+        cat_id_map: Dict[str, int] = {name: cid for name, cid in res.all()}
 
-        # 分类 upsert（name 唯一）
-        for c in categories:
-            name = c.get("name")
-            if not name:
+        # 指标：新指标按匹配键去重收集，已有指标与数据文件比对后只更新变化的行
+        by_loinc, by_name = await _load_indicator_keys(session)
+        new_rows: Dict[tuple, dict] = {}
+        changed_rows: Dict[int, dict] = {}
+        for it in indicators:
+            name_cn = it.get("name_cn")
+            unit = it.get("unit")
+            if not name_cn or not unit:
                 continue
-            existing = await session.execute(select(Category).where(Category.name == name))
-            obj = existing.scalar_one_or_none()
-            if obj:
-                desc = c.get("description")
-                if desc is not None:
-                    obj.description = desc
+            ind_type = _infer_type(it, unit)
+            loinc = it.get("loinc")
+            current = by_loinc.get(loinc) if loinc else by_name.get(name_cn)
+            if current is not None:
+                row = {
+                    "id": current.id,
+                    "name_en": it.get("name_en", current.name_en),
+                    "unit": unit,
+                    "type": ind_type or current.type,
+                    "reference_min": it.get("reference_min", current.reference_min),
+                    "reference_max": it.get("reference_max", current.reference_max),
+                    "is_builtin": True,
+                }
+                if any(row[k] != getattr(current, k) for k in row if k != "id"):
+                    changed_rows[current.id] = row
             else:
-                obj = Category(name=name, description=c.get("description"))
-                session.add(obj)
-                await session.flush()
-                await session.refresh(obj)
-            cat_id_map[name] = obj.id
+                new_rows[("loinc", loinc) if loinc else ("name", name_cn)] = {
+                    "owner_user_id": None,
+                    "name_cn": name_cn,
+                    "name_en": it.get("name_en"),
+                    "unit": unit,
+                    "type": ind_type,
+                    "reference_min": it.get("reference_min"),
+                    "reference_max": it.get("reference_max"),
+                    "is_builtin": True,
+                    "loinc": loinc,
+                }
+        if changed_rows:
+            await _executemany(session, update(Indicator), list(changed_rows.values()))
+        with_loinc = [r for r in new_rows.values() if r["loinc"]]
+        if with_loinc:
+            stmt = sqlite_insert(Indicator.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Indicator.loinc],
+                set_={k: getattr(stmt.excluded, k) for k in ("name_en", "unit", "type", "reference_min", "reference_max", "is_builtin")},
+            )
+            await _executemany(session, stmt, with_loinc)
+        without_loinc = [r for r in new_rows.values() if not r["loinc"]]
+        if without_loinc:
+            await _executemany(session, sqlite_insert(Indicator.__table__), without_loinc)
+        if new_rows:
+            by_loinc, by_name = await _load_indicator_keys(session)
 
-        # 指标 upsert（对齐字段并设置 is_builtin）
+        # 维护映射（供详情与分类成员关联）
+        ind_by_loinc: Dict[str, int] = {k: row.id for k, row in by_loinc.items()}
+        ind_by_name: Dict[str, int] = {k: row.id for k, row in by_name.items()}
+        detail_rows: Dict[int, dict] = {}
         for it in indicators:
             name_cn = it.get("name_cn")
             unit = it.get("unit")
             if not name_cn or not unit:
                 continue
-
-            # 指标类型：优先读取，缺省依据 unit 推断
-            ind_type = it.get("type")
-            if not ind_type:
-                u = (unit or "").lower()
-                ind_type = "text" if u in {"qualitative", "n/a", "na", "none"} else "numeric"
-
             loinc = it.get("loinc")
-            if loinc:
-                res = await session.execute(select(Indicator).where(Indicator.loinc == loinc))
-                ind = res.scalar_one_or_none()
-            else:
-                res = await session.execute(
-                    select(Indicator)
-                    .where(Indicator.name_cn == name_cn)
-                    .where(Indicator.owner_user_id.is_(None))
-                )
-                ind = res.scalar_one_or_none()
-
-            if ind:
-                ind.name_en = it.get("name_en", ind.name_en)
-                ind.unit = unit
-                ind.reference_min = it.get("reference_min", ind.reference_min)
-                ind.reference_max = it.get("reference_max", ind.reference_max)
-                ind.is_builtin = True
-                ind.type = ind_type or ind.type
-                if loinc and not ind.loinc:
-                    ind.loinc = loinc
-            else:
-                ind = Indicator(
-                    owner_user_id=None,
-                    name_cn=name_cn,
-                    name_en=it.get("name_en"),
-                    unit=unit,
-                    type=ind_type,
-                    reference_min=it.get("reference_min"),
-                    reference_max=it.get("reference_max"),
-                    is_builtin=True,
-                    loinc=loinc,
-                )
-                session.add(ind)
-                await session.flush()
-                await session.refresh(ind)
-
-            # 维护映射（供分类成员关联）
-            if loinc:
-                ind_by_loinc[loinc] = ind.id
-            ind_by_name[name_cn] = ind.id
-
-            # 指标详情 upsert（1:1）
+            ind_id = ind_by_loinc.get(loinc) if loinc else ind_by_name.get(name_cn)
+            if ind_id is None:
+                continue
+            ind_by_name[name_cn] = ind_id
             detail_data = it.get("detail")
             if detail_data:
-                res = await session.execute(select(IndicatorDetail).where(IndicatorDetail.indicator_id == ind.id))
-                detail = res.scalar_one_or_none()
-                if detail:
-                    for k, v in detail_data.items():
-                        if v is not None:
-                            setattr(detail, k, v)
-                    if detail_data.get("unit") is None:
-                        detail.unit = unit
-                else:
-                    detail = IndicatorDetail(
-                        indicator_id=ind.id,
-                        **{**detail_data, "unit": detail_data.get("unit", unit)}
-                    )
-                    session.add(detail)
+                row = {c: detail_data.get(c) for c in _DETAIL_COLUMNS}
+                row["indicator_id"] = ind_id
+                row["unit"] = detail_data.get("unit") or unit
+                detail_rows[ind_id] = row
+
+        # 指标详情 upsert（1:1；数据文件中的空值不覆盖已有内容，合并后无变化的行跳过）
+        if detail_rows:
+            res = await session.exec(
+                select(IndicatorDetail.indicator_id, *(getattr(IndicatorDetail, c) for c in _DETAIL_COLUMNS))
+            )
+            existing_details = {row[0]: row[1:] for row in res.all()}
+            detail_rows = {
+                ind_id: row for ind_id, row in detail_rows.items()
+                if ind_id not in existing_details
+                or any(
+                    row[c] is not None and row[c] != old
+                    for c, old in zip(_DETAIL_COLUMNS, existing_details[ind_id])
+                )
+            }
+        if detail_rows:
+            stmt = sqlite_insert(IndicatorDetail.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IndicatorDetail.indicator_id],
+                set_={
+                    **{c: func.coalesce(getattr(stmt.excluded, c), getattr(IndicatorDetail, c)) for c in _DETAIL_COLUMNS},
+                    # 详情接口的 ETag 由 updated_at 得出，内容变化的行须同时更新
+                    "updated_at": datetime.now(),
+                },
+            )
+            await _executemany(session, stmt, list(detail_rows.values()))
 
         # 分类成员关联（幂等）
+        link_rows = set()
         for c in categories:
-            cat_name = c.get("name")
-            cat_id = cat_id_map.get(cat_name)
+            cat_id = cat_id_map.get(c.get("name"))
             if not cat_id:
                 continue
-            members = c.get("indicators", []) or []
-            for m in members:
+            for m in c.get("indicators", []) or []:
                 # 成员可为字符串（按 loinc）或对象 { loinc | name_cn }
                 m_loinc = m if isinstance(m, str) else (m.get("loinc") if isinstance(m, dict) else None)
                 m_name = None if isinstance(m, str) else (m.get("name_cn") if isinstance(m, dict) else None)
-
-                ind_id = None
-                if m_loinc and m_loinc in ind_by_loinc:
-                    ind_id = ind_by_loinc[m_loinc]
-                elif m_name and m_name in ind_by_name:
-                    ind_id = ind_by_name[m_name]
-                else:
-                    # 兜底查询（避免映射遗漏）
-                    if m_loinc:
-                        res = await session.execute(select(Indicator).where(Indicator.loinc == m_loinc))
-                        row = res.scalar_one_or_none()
-                        if row:
-                            ind_id = row.id
-                    elif m_name:
-                        res = await session.execute(
-                            select(Indicator)
-                            .where(Indicator.name_cn == m_name)
-                            .where(Indicator.owner_user_id.is_(None))
-                        )
-                        row = res.scalar_one_or_none()
-                        if row:
-                            ind_id = row.id
-
-                if not ind_id:
-                    continue
-
-                # 幂等建立联结
-                res = await session.execute(
-                    select(IndicatorCategoryLink)
-                    .where(IndicatorCategoryLink.indicator_id == ind_id)
-                    .where(IndicatorCategoryLink.category_id == cat_id)
-                )
-                link = res.scalar_one_or_none()
-                if not link:
-                    session.add(IndicatorCategoryLink(indicator_id=ind_id, category_id=cat_id))
+                ind_id = ind_by_loinc.get(m_loinc) if m_loinc else None
+                if ind_id is None and m_name:
+                    ind_id = ind_by_name.get(m_name)
+                if ind_id:
+                    link_rows.add((ind_id, cat_id))
+        if link_rows:
+            res = await session.exec(select(IndicatorCategoryLink.indicator_id, IndicatorCategoryLink.category_id))
+            link_rows -= set(res.all())
+        if link_rows:
+            await _executemany(
+                session,
+                sqlite_insert(IndicatorCategoryLink.__table__).on_conflict_do_nothing(),
+                [{"indicator_id": i, "category_id": c} for i, c in sorted(link_rows)],
+            )
 
         # 写系统日志并提交
         log = SystemLog(
             level="info",
-            message=f"seed_builtins:ind={ind_version};cat={cat_version}",
+            message=f"{_SEED_LOG_PREFIX}ind={ind_version};cat={cat_version}",
             context_json=json.dumps(
-                {"categories": len(categories), "indicators": len(indicators)},
+                {"categories": len(categories), "indicators": len(indicators), "sha256": digest},
                 ensure_ascii=False
             ),
         )
         session.add(log)
-        await session.commit()
\ No newline at end of file
+        await session.commit()
+    return True
@@ -3,20 +3,27 @@
 
 职责：
 - 创建异步数据库引擎与会话工厂；提供 FastAPI 依赖的会话生成器；
+- 引擎上注册按请求的语句计数与耗时统计（见 `app.db.query_stats`）；
+- SQLite 文件库按 `Settings.sqlite_*` 设置 PRAGMA，并拆分为单连接写引擎与读连接池（见 `app.db.sqlite_profile`）；
 - 应用启动事件中执行建表与种子数据导入（见 `init_db`）。
 """
 
 from typing import AsyncGenerator
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.settings import get_settings
 from app.core.logging import get_request_logger
+from app.db.sqlite_profile import create_engines, routing_session_class
+from app.core.metrics import instrument_pool
+from app.db.query_stats import install_query_stats
 
 # 导入所有涉及建表的模型，确保 `SQLModel.metadata.create_all` 能覆盖到联结表与所有业务表
-from app.models.indicator import Indicator, IndicatorRecord, Category, IndicatorDetail, IndicatorCategoryLink
+from app.models.indicator import (
+    Indicator, IndicatorRecord, Category, IndicatorDetail, IndicatorCategoryLink, IndicatorLatest, IndicatorRollup
+)
 from app.models.admission import AdmissionFolder, Admission, AdmissionFile
+from app.models.archive import indicatorrecord_archive, admissionfile_archive, admission_archive
 from app.models.medication import Medication, MedicationRecord
 from app.models.user import User
 from app.models.kb import KnowledgeDoc, KnowledgeChunk
@@ -29,10 +36,19 @@ from app.models.user_indicator import UserIndicator
 
 
 # 初始化异步引擎与会话工厂（DSN 来自 Settings.sqlite_url）
+# `engine` 为写引擎（建表、迁移与维护命令直接使用），`read_engine` 为读连接池；未拆分时二者相同
 settings = get_settings()
-engine = create_async_engine(settings.sqlite_url, echo=False, future=True)
+engine, read_engine = create_engines(settings)
+install_query_stats(engine, read_engine)
+instrument_pool("writer", engine)
+instrument_pool("reader", read_engine)
 async_session_factory = sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False, autocommit=False
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=routing_session_class(engine, read_engine),
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
 )
 
 
@@ -40,19 +56,66 @@ async def init_db() -> None:
     """应用启动时创建所有数据表并执行种子导入。
 
     - 先执行 `create_all`，确保首次启动即可生成完整的数据库结构。
-    - 再调用 `run_seeds()`，幂等导入内置字典与分类关联；异常被吞噬以避免影响服务启动。
+    - 为旧库补齐新增列与索引（见 `app.db.migrations`）；补列后回填记录派生列并重建最新读数快照。
+    - 创建指标关键词全文索引（SQLite FTS5）及同步触发器，不可用时记录日志并回退到 LIKE。
+    - 再调用 `run_seeds()`，幂等导入内置字典与分类关联（数据文件未变化时跳过）；异常被吞噬以避免影响服务启动。
+    - 加载指标目录进程内缓存（内置指标、分类与分类成员）。
+    - 最后在 `IndicatorLatest` 快照表、`IndicatorRollup` 预聚合表为空而已有历史记录时补建（升级后的首次启动）。
     """
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        from app.db.migrations import upgrade_schema, backfill_record_values
+        from app.services.latest_reading import rebuild_latest_readings
+        async with engine.begin() as conn:
+            added = await upgrade_schema(conn)
+        if added:
+            get_request_logger().info(f"db schema:upgraded columns={','.join(added)}")
+            async with async_session_factory() as session:
+                count = await backfill_record_values(session)
+                await rebuild_latest_readings(session)
+                await session.commit()
+            get_request_logger().info(f"db record values:backfilled rows={count}")
+    except Exception:
+        get_request_logger().exception("db schema:upgrade error")
+    try:
+        from app.db.fts import setup_indicator_fts
+        async with engine.begin() as conn:
+            await setup_indicator_fts(conn)
+    except Exception:
+        get_request_logger().exception("db fts:unavailable")
     try:
         log = get_request_logger()
         log.info("db seeds:start")
         from app.db.seeds import run_seeds
-        await run_seeds()
-        log.info("db seeds:done")
+        if await run_seeds():
+            log.info("db seeds:done")
+        else:
+            log.info("db seeds:skipped unchanged")
     except Exception as e:
         log = get_request_logger()
         log.exception("db seeds:error")
+    try:
+        from app.services.catalog_cache import load_catalog
+        async with async_session_factory() as session:
+            snap = await load_catalog(session)
+        get_request_logger().info(f"catalog cache:loaded version={snap.version}")
+    except Exception:
+        get_request_logger().exception("catalog cache:error")
+    try:
+        from app.services.latest_reading import ensure_latest_readings
+        async with async_session_factory() as session:
+            if await ensure_latest_readings(session):
+                get_request_logger().info("db latest readings:rebuilt")
+    except Exception:
+        get_request_logger().exception("db latest readings:error")
+    try:
+        from app.services.rollups import ensure_rollups
+        async with async_session_factory() as session:
+            if await ensure_rollups(session):
+                get_request_logger().info("db rollups:rebuilt")
+    except Exception:
+        get_request_logger().exception("db rollups:error")
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
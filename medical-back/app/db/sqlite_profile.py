@@ -0,0 +1,101 @@
+"""
+SQLite 连接配置与读写分离
+
+职责：
+- 连接建立时执行 `Settings.sqlite_*` 中的 PRAGMA（journal_mode、synchronous、mmap_size、cache_size、
+  busy_timeout、temp_store），非 SQLite DSN 不做处理；
+- 文件库按读写拆分为两个引擎：写引擎只有一条连接（写事务在连接池排队，避免 "database is locked"），
+  读引擎为连接池（`query_only`，WAL 下与写事务并发）；
+- `RoutingSession` 按语句路由：查询走读连接；flush 与 INSERT/UPDATE/DELETE 走写连接，
+  且会话一旦写入，本事务内后续查询都走写连接，保证能读到未提交的改动；事务结束后重新路由到读连接。
+"""
+
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import Session
+
+
+def is_file_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+
+def profile_pragmas(settings, readonly: bool = False) -> list:
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA temp_store = {settings.sqlite_temp_store}",
+    ]
+    if not readonly and settings.sqlite_journal_mode:
+        # journal_mode=WAL 持久化在数据库文件中，由写连接设置一次即对所有连接生效
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    if readonly:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def apply_profile(engine: AsyncEngine, settings, readonly: bool = False) -> None:
+    """在引擎的每条新连接上执行 PRAGMA。"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = profile_pragmas(settings, readonly)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):  # pragma: no cover - 由驱动回调
+        cursor = dbapi_connection.cursor()
+        try:
+            for stmt in pragmas:
+                cursor.execute(stmt)
+        finally:
+            cursor.close()
+
+
+def create_engines(settings, url: Optional[str] = None) -> Tuple[AsyncEngine, AsyncEngine]:
+    """创建（写引擎, 读引擎）；未开启读写分离或非文件库时两者为同一引擎。"""
+    url = url or settings.sqlite_url
+    if not (settings.sqlite_split_read_write and is_file_sqlite(url)):
+        engine = create_async_engine(url, echo=False, future=True)
+        apply_profile(engine, settings)
+        return engine, engine
+    writer = create_async_engine(url, echo=False, future=True, pool_size=1, max_overflow=0)
+    apply_profile(writer, settings)
+    size = max(1, settings.sqlite_read_pool_size)
+    reader = create_async_engine(url, echo=False, future=True, pool_size=size, max_overflow=size)
+    apply_profile(reader, settings, readonly=True)
+    return writer, reader
+
+
+class RoutingSession(Session):
+    """按语句类型在写引擎与读引擎之间路由的同步会话（由 `AsyncSession` 包装使用）。"""
+
+    writer: Optional[AsyncEngine] = None
+    reader: Optional[AsyncEngine] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.reader is None or self.reader is self.writer:
+            return self.writer.sync_engine
+        if self._wrote or self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+            return self.writer.sync_engine
+        return self.reader.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_route(session, transaction):
+    if transaction.parent is None:
+        session._wrote = False
+
+
+def routing_session_class(writer: AsyncEngine, reader: AsyncEngine) -> type:
+    """绑定到给定引擎对的 `RoutingSession` 子类，作为 `AsyncSession(sync_session_class=...)` 使用。"""
+    return type("BoundRoutingSession", (RoutingSession,), {"writer": writer, "reader": reader})
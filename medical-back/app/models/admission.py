@@ -2,8 +2,8 @@ from typing import Optional
 from datetime import date, datetime
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.orm import Mapped
-from sqlalchemy import UniqueConstraint, Index
-from .base import IDMixin, TimestampMixin, SoftDeleteMixin
+from sqlalchemy import UniqueConstraint
+from .base import IDMixin, TimestampMixin, SoftDeleteMixin, live_index, deleted_index
 
 # 住院档案相关模型：目录/住院记录/住院文件
 
@@ -18,7 +18,8 @@ class AdmissionFolder(IDMixin, SQLModel, table=True):
 
 class Admission(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
     __table_args__ = (
-        Index("idx_admission_user_dates", "user_id", "admission_date", "discharge_date"),
+        live_index("idx_admission_live_user_dates", "user_id", "admission_date", "discharge_date"),
+        deleted_index("idx_admission_deleted"),
     )
     
     folder_id: int = Field(foreign_key="admissionfolder.id", index=True, nullable=False)  # 所属目录ID
@@ -37,8 +38,9 @@ class Admission(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
 
 class AdmissionFile(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
     __table_args__ = (
-        Index("idx_admissionfile_user_uploaded", "user_id", "uploaded_at"),
-        Index("idx_admissionfile_admission_filename", "admission_id", "filename"),
+        live_index("idx_admissionfile_live_user_uploaded", "user_id", "uploaded_at"),
+        live_index("idx_admissionfile_live_admission_filename", "admission_id", "filename"),
+        deleted_index("idx_admissionfile_deleted"),
     )
     
     admission_id: int = Field(foreign_key="admission.id", index=True)  # 关联住院记录ID
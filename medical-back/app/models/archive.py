@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Index, Table
+from sqlmodel import SQLModel
+
+from .indicator import IndicatorRecord
+from .admission import Admission, AdmissionFile
+
+# 归档表：软删除超过保留期的行由归档任务（app.services.archival）从热表整行迁入，
+# 列与源表一致（保留原主键，不带外键与业务索引），另加归档时间 `archived_at`
+
+
+def _archive_table(source: Table) -> Table:
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False) for c in source.columns]
+    columns.append(Column("archived_at", DateTime, nullable=False))
+    name = f"{source.name}_archive"
+    return Table(name, SQLModel.metadata, *columns, Index(f"idx_{name}_user", "user_id"))
+
+
+indicatorrecord_archive = _archive_table(IndicatorRecord.__table__)
+admissionfile_archive = _archive_table(AdmissionFile.__table__)
+admission_archive = _archive_table(Admission.__table__)
@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 # 通用混入（Mixin）定义：统一 ID、时间戳、软删除字段
@@ -18,4 +19,15 @@ class SoftDeleteMixin(SQLModel):
 
 class IDMixin(SQLModel):
     """主键 ID 字段"""
-    id: Optional[int] = Field(default=None, primary_key=True)
\ No newline at end of file
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+def live_index(name: str, *columns: str) -> Index:
+    """仅覆盖未软删除行的部分索引（`WHERE deleted_at IS NULL`），查询条件需包含 `deleted_at IS NULL` 才会命中。"""
+    where = text("deleted_at IS NULL")
+    return Index(name, *columns, sqlite_where=where, postgresql_where=where)
+
+
+def deleted_index(name: str) -> Index:
+    """仅覆盖已软删除行的 `deleted_at` 部分索引，供归档任务按删除时间定位待归档行。"""
+    where = text("deleted_at IS NOT NULL")
+    return Index(name, "deleted_at", sqlite_where=where, postgresql_where=where)
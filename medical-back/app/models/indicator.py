@@ -3,7 +3,7 @@ from datetime import datetime, date
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.orm import Mapped
 from sqlalchemy import UniqueConstraint, Index
-from .base import IDMixin, TimestampMixin, SoftDeleteMixin
+from .base import IDMixin, TimestampMixin, SoftDeleteMixin, live_index, deleted_index
 from .user_indicator import UserIndicator
 
 # 指标分类与指标模型
@@ -29,6 +29,7 @@ class Category(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
 class Indicator(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
     __table_args__ = (
         UniqueConstraint("owner_user_id", "name_cn"),
+        live_index("idx_indicator_live_owner", "owner_user_id", "id"),
     )
 
     owner_user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
@@ -55,14 +56,20 @@ class Indicator(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
 
 class IndicatorRecord(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
     __table_args__ = (
-        Index("idx_indicatorrecord_indicator_measured", "indicator_id", "measured_at"),
-        Index("idx_indicatorrecord_user_measured", "user_id", "measured_at"),
+        # 热点查询均带 `deleted_at IS NULL`，复合索引只覆盖未删除行；已删除行由归档任务迁出（见 app.services.archival）
+        live_index("idx_indicatorrecord_live_indicator_measured", "indicator_id", "measured_at"),
+        live_index("idx_indicatorrecord_live_user_measured", "user_id", "measured_at"),
+        live_index("idx_indicatorrecord_live_user_indicator_measured", "user_id", "indicator_id", "measured_at", "id"),
+        live_index("idx_indicatorrecord_live_user_indicator_status", "user_id", "indicator_id", "status"),
+        deleted_index("idx_indicatorrecord_deleted"),
     )
 
     indicator_id: int = Field(foreign_key="indicator.id", index=True, nullable=False)  # 指标ID
     user_id: int = Field(foreign_key="user.id", index=True, nullable=False)  # 用户ID
     measured_at: date = Field(index=True, nullable=False)  # 测量日期
     value: str = Field(index=False, nullable=False)  # 指标值（字符串，兼容文本与数值）
+    value_num: Optional[float] = Field(default=None)  # 数值（由 value 解析，文本值为空）
+    status: Optional[str] = Field(default=None)  # 状态：high|low|normal（写入时按参考范围判定）
     unit: str = Field(index=False, nullable=False)  # 单位（必填，避免跨表默认引用）
     ref_low: Optional[float] = Field(default=None, index=False)  # 参考下限（记录级覆盖）
     ref_high: Optional[float] = Field(default=None, index=False)  # 参考上限（记录级覆盖）
@@ -74,6 +81,45 @@ class IndicatorRecord(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=
     indicator: Optional[Indicator] = Relationship(back_populates="records")
 
 
+class IndicatorLatest(SQLModel, table=True):
+    """用户-指标最新记录（反范式化快照），由记录写接口在同一事务内维护，可通过维护命令重建"""
+    __table_args__ = (
+        Index("idx_indicatorlatest_user_measured", "user_id", "measured_at"),
+    )
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)  # 用户ID
+    indicator_id: int = Field(foreign_key="indicator.id", primary_key=True)  # 指标ID
+    record_id: int = Field(foreign_key="indicatorrecord.id", index=True, nullable=False)  # 来源记录ID
+    measured_at: date = Field(nullable=False)  # 测量日期
+    value: str = Field(nullable=False)  # 指标值
+    value_num: Optional[float] = None  # 数值
+    unit: str = Field(nullable=False)  # 单位
+    ref_low: Optional[float] = None  # 参考下限
+    ref_high: Optional[float] = None  # 参考上限
+    status: Optional[str] = None  # 状态：high|low|normal
+    source: Optional[str] = None  # 数据来源
+    note: Optional[str] = None  # 备注
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)  # 快照刷新时间
+
+
+class IndicatorRollup(SQLModel, table=True):
+    """用户-指标按 day/week/month 预聚合的数值统计，由记录写接口按受影响时间桶刷新，可通过维护命令重建/校验"""
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)  # 用户ID
+    indicator_id: int = Field(foreign_key="indicator.id", primary_key=True)  # 指标ID
+    granularity: str = Field(primary_key=True)  # 粒度：day|week|month
+    bucket_start: date = Field(primary_key=True)  # 时间桶起点（周以周一为起点）
+    count: int = Field(default=0, nullable=False)  # 数值记录条数
+    sum: float = Field(default=0.0, nullable=False)  # 数值之和
+    m2: float = Field(default=0.0, nullable=False)  # 桶内离差平方和 Σ(x - 桶均值)²（用于标准差，合并时数值稳定）
+    min: float = Field(nullable=False)  # 最小值
+    max: float = Field(nullable=False)  # 最大值
+    abnormal_count: int = Field(default=0, nullable=False)  # 状态为 high/low 的条数
+    ref_low: Optional[float] = None  # 桶内最后一条记录的参考下限
+    ref_high: Optional[float] = None  # 桶内最后一条记录的参考上限
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)  # 刷新时间
+
+
 class IndicatorDetail(IDMixin, TimestampMixin, SoftDeleteMixin, SQLModel, table=True):
     indicator_id: int = Field(foreign_key="indicator.id", index=True, unique=True)
     introduction_text: Optional[str] = None
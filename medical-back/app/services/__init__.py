@@ -0,0 +1 @@
+"""Business services shared by API routers."""
\ No newline at end of file
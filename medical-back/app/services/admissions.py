@@ -0,0 +1,29 @@
+"""
+住院文件归属校验
+
+职责：
+- 记录写入（批量新增、文件导入）关联住院文件前，校验文件属于当前用户且未删除，否则返回 404。
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.admission import AdmissionFile
+
+
+async def ensure_admission_file(session: AsyncSession, file_id: Optional[int], user_id: int) -> None:
+    """记录关联的住院文件须属于当前用户且未删除，否则返回 404。"""
+    if file_id is None:
+        return
+    f_res = await session.exec(
+        select(AdmissionFile.id).where(
+            AdmissionFile.id == file_id,
+            AdmissionFile.user_id == user_id,
+            AdmissionFile.deleted_at.is_(None),
+        )
+    )
+    if f_res.one_or_none() is None:
+        raise HTTPException(status_code=404, detail="住院文件不存在")
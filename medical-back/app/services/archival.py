@@ -0,0 +1,144 @@
+"""
+软删除数据归档
+
+职责：
+- 热表（`IndicatorRecord`、`AdmissionFile`、`Admission`）上的热点复合索引均为 `WHERE deleted_at IS NULL`
+  的部分索引，已删除行不再进入这些 B 树；`archive_deleted` 进一步把软删除超过保留期的行整行迁入
+  对应归档表（`*_archive`，见 `app.models.archive`），使热表行数与索引深度只随未删除数据增长；
+- 按 `deleted_at` 升序分批迁移，每批 `INSERT ... SELECT` + `DELETE` 在同一事务内提交，批间短暂让出
+  写连接，避免长事务阻塞请求写入；归档表按主键去重，多 worker 同时执行时重复迁移被忽略；
+- 仍被热表引用的行暂不归档：住院文件需其关联的指标记录均已归档且无 OCR 任务引用，
+  住院记录需其文件均已归档且无 OCR 任务引用；
+- `start_archival` 在应用启动后按 `Settings.archive_interval_minutes` 周期执行（需显式配置
+  `archive_after_days > 0`，默认关闭），也可通过 `python -m app.db.maintenance archive-deleted` 手动执行。
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, delete, exists, literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.logging import get_request_logger
+from app.models.admission import Admission, AdmissionFile
+from app.models.archive import admission_archive, admissionfile_archive, indicatorrecord_archive
+from app.models.indicator import IndicatorRecord
+from app.models.ocr import OcrTask
+
+# 启动后首次归档前的等待（秒），避开启动期的建表、种子导入与缓存预热
+_INITIAL_DELAY_SECONDS = 60
+
+_task: Optional[asyncio.Task] = None
+
+
+def _plan() -> List[Tuple[Table, Table, list]]:
+    """（热表, 归档表, 额外条件），按引用关系由子到父排列。"""
+    record = IndicatorRecord.__table__
+    file = AdmissionFile.__table__
+    admission = Admission.__table__
+    ocrtask = OcrTask.__table__
+    return [
+        (record, indicatorrecord_archive, []),
+        (
+            file,
+            admissionfile_archive,
+            [
+                ~exists().where(record.c.admission_file_id == file.c.id),
+                ~exists().where(ocrtask.c.file_id == file.c.id),
+            ],
+        ),
+        (
+            admission,
+            admission_archive,
+            [
+                ~exists().where(file.c.admission_id == admission.c.id),
+                ~exists().where(ocrtask.c.admission_id == admission.c.id),
+            ],
+        ),
+    ]
+
+
+async def _archive_batch(
+    session: AsyncSession, source: Table, archive: Table, guards: list, cutoff: datetime, batch_size: int
+) -> int:
+    res = await session.execute(
+        select(source.c.id)
+        .where(source.c.deleted_at.is_not(None), source.c.deleted_at < cutoff, *guards)
+        .order_by(source.c.deleted_at)
+        .limit(batch_size)
+    )
+    ids = list(res.scalars().all())
+    if not ids:
+        return 0
+    names = [c.name for c in source.columns]
+    rows = select(*source.columns, literal(datetime.now()).label("archived_at")).where(source.c.id.in_(ids))
+    await session.execute(
+        sqlite_insert(archive).from_select(names + ["archived_at"], rows).on_conflict_do_nothing()
+    )
+    await session.execute(delete(source).where(source.c.id.in_(ids)))
+    await session.commit()
+    return len(ids)
+
+
+async def archive_deleted(
+    session: AsyncSession, older_than_days: int, batch_size: int = 500, pause_ms: int = 0
+) -> Dict[str, int]:
+    """把软删除超过 `older_than_days` 天的行迁入归档表，返回各表迁移行数（每批提交）。"""
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    moved: Dict[str, int] = {}
+    for source, archive, guards in _plan():
+        total = 0
+        while True:
+            count = await _archive_batch(session, source, archive, guards, cutoff, batch_size)
+            total += count
+            if count < batch_size:
+                break
+            if pause_ms > 0:
+                await asyncio.sleep(pause_ms / 1000)
+        moved[source.name] = total
+    return moved
+
+
+async def _run_periodically(settings) -> None:
+    from app.db.session import async_session_factory
+
+    log = get_request_logger()
+    await asyncio.sleep(_INITIAL_DELAY_SECONDS)
+    while True:
+        try:
+            async with async_session_factory() as session:
+                moved = await archive_deleted(
+                    session,
+                    settings.archive_after_days,
+                    settings.archive_batch_size,
+                    settings.archive_batch_pause_ms,
+                )
+            log.info("archival:done " + " ".join(f"{k}={v}" for k, v in moved.items()))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("archival:error")
+        await asyncio.sleep(max(settings.archive_interval_minutes, 1) * 60)
+
+
+def start_archival(settings) -> None:
+    """启动后台周期归档任务（需在事件循环内调用）。"""
+    global _task
+    if settings.archive_after_days <= 0 or settings.archive_interval_minutes <= 0 or _task is not None:
+        return
+    _task = asyncio.get_running_loop().create_task(_run_periodically(settings))
+
+
+async def stop_archival() -> None:
+    """应用关闭时取消后台归档任务；进行中的批次未提交部分随会话回滚。"""
+    global _task
+    task, _task = _task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,175 @@
+"""
+指标目录进程内缓存
+
+职责：
+- 缓存内置指标（id → 指标）、分类（name/id → 分类）以及分类成员（分类 → 指标 ID 集合）；
+  条目为 `NamedTuple`，加载时按列查询（`read_models.columns_of`），不构造 ORM 实例；
+  这些数据只会被种子导入或管理端编辑修改，列表接口从内存解析分类名称与分类 ID，
+  分类过滤使用关联表子查询（`category_filter`），SQL 文本不随分类大小变化；
+- 应用启动时加载；`create_indicator/update_indicator/delete_indicator/update_indicator_detail`
+  提交后调用 `invalidate_catalog()`，下次访问时重新加载；
+- 快照带有按内容计算的 `etag`，供分类与内置指标接口的条件请求使用（见 `app.core.http_cache`）；
+- 每个进程维护单调递增的版本号与命中/未命中计数（见 `catalog_stats()`），
+  另有 TTL（`Settings.catalog_cache_ttl_seconds`）兜底，限制多 worker 部署下其他进程写入造成的陈旧时间。
+"""
+
+import asyncio
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.http_cache import content_etag
+from app.core.settings import get_settings
+from app.models.indicator import Indicator, Category, IndicatorCategoryLink
+from app.services.read_models import columns_of
+
+
+class IndicatorEntry(NamedTuple):
+    id: int
+    name_cn: str
+    name_en: Optional[str]
+    type: str
+    unit: str
+    reference_min: Optional[float]
+    reference_max: Optional[float]
+    is_builtin: bool
+    loinc: Optional[str]
+
+
+class CategoryEntry(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+
+
+class CatalogSnapshot:
+    """某一版本的只读目录快照。"""
+
+    __slots__ = (
+        "version", "loaded_at", "indicators", "categories", "categories_by_id", "categories_by_name",
+        "category_members", "indicator_categories", "etag",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        indicators: Dict[int, IndicatorEntry],
+        categories: List[CategoryEntry],
+        links: List[tuple],
+    ):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.indicators = indicators
+        self.categories = categories
+        self.categories_by_id = {c.id: c for c in categories}
+        self.categories_by_name = {c.name: c for c in categories}
+        members: Dict[int, set] = {}
+        names: Dict[int, List[str]] = {}
+        for ind_id, cat_id in links:
+            members.setdefault(cat_id, set()).add(ind_id)
+            if cat_id in self.categories_by_id:
+                names.setdefault(ind_id, []).append(self.categories_by_id[cat_id].name)
+        self.category_members: Dict[int, FrozenSet[int]] = {k: frozenset(v) for k, v in members.items()}
+        self.indicator_categories = names
+        # 按内容计算的强 ETag：目录内容不变时各 worker、各次加载得到同一标签（版本号是进程内计数，不能用作 ETag）
+        content = (sorted(indicators.items()), categories, links)
+        self.etag = content_etag(repr(content).encode())
+
+    def category_names(self, indicator_id: int) -> List[str]:
+        return self.indicator_categories.get(indicator_id, [])
+
+    def members(self, category_id: int) -> FrozenSet[int]:
+        return self.category_members.get(category_id, frozenset())
+
+
+def category_filter(category_id: int):
+    """指标属于某分类的过滤条件（关联表子查询，走 category_id 索引）。"""
+    return Indicator.id.in_(
+        select(IndicatorCategoryLink.indicator_id).where(IndicatorCategoryLink.category_id == category_id)
+    )
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_version = 0
+_invalidations = 0
+_hits = 0
+_misses = 0
+_lock = asyncio.Lock()
+
+
+async def _load(session: AsyncSession) -> CatalogSnapshot:
+    global _snapshot, _version
+    generation = _invalidations
+    ind_res = await session.exec(
+        select(*columns_of(IndicatorEntry, Indicator))
+        .where(Indicator.is_builtin.is_(True), Indicator.deleted_at.is_(None))
+    )
+    indicators = {row.id: IndicatorEntry._make(row) for row in ind_res.all()}
+    cat_res = await session.exec(
+        select(*columns_of(CategoryEntry, Category))
+        .where(Category.deleted_at.is_(None))
+        .order_by(Category.id)
+    )
+    categories = [CategoryEntry._make(row) for row in cat_res.all()]
+    link_res = await session.exec(
+        select(IndicatorCategoryLink.indicator_id, IndicatorCategoryLink.category_id)
+        .order_by(IndicatorCategoryLink.indicator_id, IndicatorCategoryLink.category_id)
+    )
+    _version += 1
+    snap = CatalogSnapshot(_version, indicators, categories, list(link_res.all()))
+    # 加载期间若发生失效（其他请求已提交目录变更），本次结果仅供当前请求使用，不写入缓存
+    if generation == _invalidations:
+        _snapshot = snap
+    return snap
+
+
+def _is_fresh(snap: Optional[CatalogSnapshot]) -> bool:
+    if snap is None:
+        return False
+    ttl = get_settings().catalog_cache_ttl_seconds
+    return ttl <= 0 or time.monotonic() - snap.loaded_at < ttl
+
+
+async def get_catalog(session: AsyncSession) -> CatalogSnapshot:
+    """返回当前目录快照；失效或过期时使用给定会话重新加载。"""
+    global _hits, _misses
+    snap = _snapshot
+    if _is_fresh(snap):
+        _hits += 1
+        return snap
+    async with _lock:
+        snap = _snapshot
+        if _is_fresh(snap):
+            _hits += 1
+            return snap
+        _misses += 1
+        return await _load(session)
+
+
+async def load_catalog(session: AsyncSession) -> CatalogSnapshot:
+    """强制加载目录快照（应用启动时调用）。"""
+    async with _lock:
+        return await _load(session)
+
+
+def invalidate_catalog() -> None:
+    """目录数据提交后调用，使当前进程的快照失效。"""
+    global _snapshot, _invalidations
+    _invalidations += 1
+    _snapshot = None
+
+
+def catalog_stats() -> dict:
+    """当前进程的缓存统计：版本号、命中/未命中次数与快照规模。"""
+    snap = _snapshot
+    return {
+        "version": _version,
+        "loaded": snap is not None,
+        "etag": snap.etag if snap else None,
+        "hits": _hits,
+        "misses": _misses,
+        "indicators": len(snap.indicators) if snap else 0,
+        "categories": len(snap.categories) if snap else 0,
+    }
@@ -0,0 +1,200 @@
+"""
+首页概览（`GET /dashboard/summary`）聚合与缓存
+
+职责：
+- 每个组件一条集合查询：关注指标卡片（`IndicatorLatest` + 前一条数值记录的相关子查询判定升降）、
+  异常提醒（`IndicatorLatest.status` 为 high/low）、当前用药（走 `idx_medicationrecord_user_current`）；
+- 结果按用户缓存（LRU + TTL，见 `Settings.dashboard_cache_*`）；记录写入、关注变更后调用
+  `invalidate_dashboard(user_id)`，直接删除该用户的全部缓存条目；进程级失效计数 `_epoch` 防止失效前发起的
+  计算把旧结果写回缓存（不按用户保存状态，内存只随 LRU 上限增长）；
+- 失效只作用于当前进程：多 worker 部署下其他进程最长在 `dashboard_cache_ttl_seconds` 内返回旧结果。
+"""
+
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import get_settings
+from app.models.indicator import Indicator, IndicatorLatest, IndicatorRecord
+from app.models.medication import Medication, MedicationRecord
+from app.models.user_indicator import UserIndicator
+from app.services.record_values import ABNORMAL_STATUSES
+
+# 相邻两次读数变化幅度低于该比例（相对前值）时视为持平
+_FLAT_RATIO = 0.02
+
+_cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
+_epoch = 0
+_hits = 0
+_misses = 0
+
+
+def _trend(current: Optional[float], previous: Optional[float]) -> Optional[str]:
+    if current is None or previous is None:
+        return None
+    if abs(current - previous) <= _FLAT_RATIO * max(abs(previous), 1e-9):
+        return "flat"
+    return "up" if current > previous else "down"
+
+
+async def _cards(session: AsyncSession, user_id: int) -> List[dict]:
+    prev = (
+        select(IndicatorRecord.value_num)
+        .where(
+            IndicatorRecord.user_id == user_id,
+            IndicatorRecord.indicator_id == IndicatorLatest.indicator_id,
+            IndicatorRecord.deleted_at.is_(None),
+            IndicatorRecord.value_num.is_not(None),
+            tuple_(IndicatorRecord.measured_at, IndicatorRecord.id)
+            < tuple_(IndicatorLatest.measured_at, IndicatorLatest.record_id),
+        )
+        .order_by(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+        .limit(1)
+        .correlate(IndicatorLatest)
+        .scalar_subquery()
+    )
+    res = await session.exec(
+        select(Indicator.id, Indicator.name_cn, Indicator.unit, IndicatorLatest, prev.label("prev_value"))
+        .join(UserIndicator, UserIndicator.indicator_id == Indicator.id)
+        .outerjoin(
+            IndicatorLatest,
+            and_(IndicatorLatest.user_id == user_id, IndicatorLatest.indicator_id == Indicator.id),
+        )
+        .where(
+            UserIndicator.user_id == user_id,
+            UserIndicator.favorite.is_(True),
+            Indicator.deleted_at.is_(None),
+        )
+        .order_by(Indicator.id)
+    )
+    cards = []
+    for ind_id, name, unit, latest, prev_value in res.all():
+        cards.append(
+            {
+                "indicatorId": ind_id,
+                "indicator": name,
+                "value": latest.value if latest else None,
+                "unit": latest.unit if latest else unit,
+                "trend": _trend(latest.value_num, prev_value) if latest else None,
+                "status": latest.status if latest else None,
+                "measureDate": latest.measured_at.isoformat() if latest else None,
+            }
+        )
+    return cards
+
+
+async def _alerts(
+    session: AsyncSession, user_id: int, start_date: Optional[date], end_date: Optional[date]
+) -> List[dict]:
+    q = (
+        select(IndicatorLatest, Indicator.name_cn)
+        .join(Indicator, Indicator.id == IndicatorLatest.indicator_id)
+        .where(
+            IndicatorLatest.user_id == user_id,
+            IndicatorLatest.status.in_(ABNORMAL_STATUSES),
+            Indicator.deleted_at.is_(None),
+        )
+    )
+    if start_date:
+        q = q.where(IndicatorLatest.measured_at >= start_date)
+    if end_date:
+        q = q.where(IndicatorLatest.measured_at <= end_date)
+    res = await session.exec(q.order_by(IndicatorLatest.measured_at.desc(), IndicatorLatest.indicator_id))
+    alerts = []
+    for latest, name in res.all():
+        if latest.status == "high":
+            message = f"{name} {latest.value}{latest.unit} 高于参考上限 {latest.ref_high}"
+        else:
+            message = f"{name} {latest.value}{latest.unit} 低于参考下限 {latest.ref_low}"
+        alerts.append(
+            {
+                "type": "indicator",
+                "indicatorId": latest.indicator_id,
+                "indicator": name,
+                "level": latest.status,
+                "message": message,
+                "measureDate": latest.measured_at.isoformat(),
+            }
+        )
+    return alerts
+
+
+async def _current_medications(session: AsyncSession, user_id: int) -> List[dict]:
+    res = await session.exec(
+        select(MedicationRecord, Medication.name)
+        .join(Medication, Medication.id == MedicationRecord.medication_id)
+        .where(
+            MedicationRecord.user_id == user_id,
+            MedicationRecord.is_current.is_(True),
+            MedicationRecord.deleted_at.is_(None),
+        )
+        .order_by(MedicationRecord.start_date.desc(), MedicationRecord.id.desc())
+    )
+    return [
+        {
+            "recordId": r.id,
+            "medicationId": r.medication_id,
+            "name": name,
+            "dose": r.dose,
+            "frequency": r.frequency,
+            "route": r.route,
+            "startDate": r.start_date.isoformat() if r.start_date else None,
+        }
+        for r, name in res.all()
+    ]
+
+
+async def build_summary(
+    session: AsyncSession, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> dict:
+    """不经缓存计算首页概览（三条查询）。"""
+    return {
+        "cards": await _cards(session, user_id),
+        "alerts": await _alerts(session, user_id, start_date, end_date),
+        "currentMedications": await _current_medications(session, user_id),
+    }
+
+
+async def get_summary(
+    session: AsyncSession, user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> dict:
+    """读取首页概览，命中缓存时不访问数据库。"""
+    global _hits, _misses
+    settings = get_settings()
+    key = (user_id, start_date, end_date)
+    generation = _epoch
+    entry = _cache.get(key)
+    now = time.monotonic()
+    if entry is not None and entry[0] > now:
+        _cache.move_to_end(key)
+        _hits += 1
+        return entry[1]
+    _misses += 1
+    summary = await build_summary(session, user_id, start_date, end_date)
+    if settings.dashboard_cache_ttl_seconds > 0 and settings.dashboard_cache_max_entries > 0:
+        # 计算期间若发生失效，不写入缓存
+        if _epoch == generation:
+            _cache[key] = (now + settings.dashboard_cache_ttl_seconds, summary)
+            _cache.move_to_end(key)
+            while len(_cache) > settings.dashboard_cache_max_entries:
+                _cache.popitem(last=False)
+    return summary
+
+
+def invalidate_dashboard(user_id: int) -> None:
+    """用户的指标记录、关注或用药数据提交后调用。"""
+    global _epoch
+    _epoch += 1
+    # 条目数受 dashboard_cache_max_entries 限制，线性扫描的代价可以接受
+    for key in [k for k in _cache if k[0] == user_id]:
+        del _cache[key]
+
+
+def dashboard_cache_stats() -> dict:
+    """当前进程的首页概览缓存统计。"""
+    return {"entries": len(_cache), "hits": _hits, "misses": _misses}
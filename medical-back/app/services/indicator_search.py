@@ -0,0 +1,41 @@
+"""
+指标关键词检索
+
+职责：
+- 关键词可用全文索引时，以 `indicator_fts` 命中的指标 ID 过滤（名称/LOINC/本人别名），
+  计数与游标翻页只走索引；分页模式下再联结相关度子查询排序（名称完全匹配优先，其次为 bm25）；
+- 否则回退到 LIKE 子串匹配（覆盖相同字段），保证结果口径一致。
+"""
+
+from typing import Tuple
+
+from sqlalchemy import case
+from sqlmodel import select
+
+from app.db.fts import indicator_keyword_ids, indicator_keyword_rank
+from app.models.indicator import Indicator
+from app.models.user_indicator import UserIndicator
+
+
+def apply_indicator_keyword(q, keyword: str, user_id: int) -> Tuple[object, bool]:
+    """为指标查询追加关键词条件，返回 `(查询, 是否可按相关度排序)`。"""
+    hit_ids = indicator_keyword_ids(keyword, user_id)
+    if hit_ids is not None:
+        return q.where(Indicator.id.in_(hit_ids)), True
+    alias_q = select(UserIndicator.indicator_id).where(
+        UserIndicator.user_id == user_id, UserIndicator.alias.contains(keyword)
+    )
+    q = q.where(
+        Indicator.name_cn.contains(keyword)
+        | Indicator.name_en.contains(keyword)
+        | Indicator.loinc.contains(keyword)
+        | Indicator.id.in_(alias_q)
+    )
+    return q, False
+
+
+def order_by_relevance(q, keyword: str, user_id: int):
+    """按相关度排序：名称完全匹配优先，其次 bm25，最后按 ID 保证稳定。"""
+    kw = indicator_keyword_rank(keyword, user_id)
+    exact = case(((Indicator.name_cn == keyword) | (Indicator.name_en == keyword), 0), else_=1)
+    return q.join(kw, kw.c.indicator_id == Indicator.id).order_by(exact, kw.c.rank, Indicator.id)
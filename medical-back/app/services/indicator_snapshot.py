@@ -0,0 +1,157 @@
+"""
+指标“最新记录快照”构建模块
+
+职责：
+- 为指标列表页（`GET /indicators`、`GET /categories/{id}/indicators`）批量解析每个指标的
+  最新记录、收藏标记与分类名称（分类名称来自目录缓存）；
+- 整页只执行固定数量的语句（窗口函数取最新记录 + IN 查询收藏），
+  避免逐行查询导致的 N+1，分页大小增加时延迟保持平稳；
+- 默认视图（无日期窗口、按最新排序）直接读取 `IndicatorLatest` 快照表的主键；
+- 指标与最新记录均按列查询（`INDICATOR_ROW_COLUMNS` / `_READING_COLUMNS`），直接用结果行组装列表项，
+  不构造 ORM 实例；日期保持 `date` 对象，由 orjson 响应类编码。
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.indicator import Indicator, IndicatorRecord, IndicatorLatest
+from app.models.user_indicator import UserIndicator
+from app.services.catalog_cache import get_catalog
+
+
+# 指标列表查询的列：路由以 `session.execute(q.with_only_columns(*INDICATOR_ROW_COLUMNS))` 取行，按属性名访问
+# （`session.exec` 会把由 `select(Indicator)` 派生的查询按标量处理，只返回首列）
+INDICATOR_ROW_COLUMNS = (
+    Indicator.id,
+    Indicator.name_cn,
+    Indicator.name_en,
+    Indicator.type,
+    Indicator.unit,
+    Indicator.reference_min,
+    Indicator.reference_max,
+    Indicator.is_builtin,
+    Indicator.loinc,
+)
+
+# 列表项用到的最新记录字段（`IndicatorLatest` 与 `IndicatorRecord` 同名）
+_READING_FIELDS = ("indicator_id", "value", "unit", "ref_low", "ref_high", "status", "measured_at", "source", "note")
+
+
+def _reading_columns(model) -> list:
+    return [getattr(model, name) for name in _READING_FIELDS]
+
+
+async def latest_records_by_indicator(
+    session: AsyncSession,
+    user_id: int,
+    indicator_ids: Sequence[int],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    order: Optional[str] = "desc",
+) -> Dict[int, Any]:
+    """一次查询取出每个指标在时间窗口内的首条记录行（`order=desc` 为最新，`asc` 为最早）。"""
+    if not indicator_ids:
+        return {}
+    if order == "asc":
+        ordering = (IndicatorRecord.measured_at.asc(), IndicatorRecord.id.asc())
+    else:
+        ordering = (IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+    rn = func.row_number().over(partition_by=IndicatorRecord.indicator_id, order_by=ordering).label("rn")
+    ranked = select(IndicatorRecord.id.label("record_id"), rn).where(
+        IndicatorRecord.indicator_id.in_(indicator_ids),
+        IndicatorRecord.user_id == user_id,
+        IndicatorRecord.deleted_at.is_(None),
+    )
+    if start_date:
+        ranked = ranked.where(IndicatorRecord.measured_at >= start_date)
+    if end_date:
+        ranked = ranked.where(IndicatorRecord.measured_at <= end_date)
+    ranked = ranked.subquery()
+    res = await session.exec(
+        select(*_reading_columns(IndicatorRecord))
+        .join(ranked, ranked.c.record_id == IndicatorRecord.id)
+        .where(ranked.c.rn == 1)
+    )
+    return {r.indicator_id: r for r in res.all()}
+
+
+async def latest_readings_by_indicator(
+    session: AsyncSession, user_id: int, indicator_ids: Sequence[int]
+) -> Dict[int, Any]:
+    """按主键一次取出整页指标的最新记录快照行（`IndicatorLatest`）。"""
+    if not indicator_ids:
+        return {}
+    res = await session.exec(
+        select(*_reading_columns(IndicatorLatest)).where(
+            IndicatorLatest.user_id == user_id,
+            IndicatorLatest.indicator_id.in_(indicator_ids),
+        )
+    )
+    return {r.indicator_id: r for r in res.all()}
+
+
+async def favorites_by_indicator(
+    session: AsyncSession, user_id: int, indicator_ids: Sequence[int]
+) -> Dict[int, bool]:
+    """一次查询取出当前用户对整页指标的收藏标记。"""
+    if not indicator_ids:
+        return {}
+    res = await session.exec(
+        select(UserIndicator.indicator_id, UserIndicator.favorite).where(
+            UserIndicator.user_id == user_id,
+            UserIndicator.indicator_id.in_(indicator_ids),
+        )
+    )
+    return {ind_id: bool(fav) for ind_id, fav in res.all()}
+
+
+async def build_indicator_items(
+    session: AsyncSession,
+    user_id: int,
+    indicators: Sequence[Any],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    order: Optional[str] = "desc",
+    with_categories: bool = True,
+) -> List[dict]:
+    """将一页指标行（`INDICATOR_ROW_COLUMNS` 或 `Indicator` 实例）组装为列表项，查询数量与分页大小无关。"""
+    ids = [it.id for it in indicators]
+    if start_date is None and end_date is None and order != "asc":
+        latest = await latest_readings_by_indicator(session, user_id, ids)
+    else:
+        latest = await latest_records_by_indicator(session, user_id, ids, start_date, end_date, order)
+    favorites = await favorites_by_indicator(session, user_id, ids)
+    catalog = await get_catalog(session) if with_categories else None
+    items = []
+    for it in indicators:
+        rec = latest.get(it.id)
+        value = rec.value if rec else None
+        ref_low = rec.ref_low if rec else it.reference_min
+        ref_high = rec.ref_high if rec else it.reference_max
+        items.append(
+            {
+                "id": it.id,
+                "indicator": it.name_cn,
+                "nameCn": it.name_cn,
+                "nameEn": it.name_en,
+                "type": it.type,
+                "value": value,
+                "unit": rec.unit if rec else it.unit,
+                "referenceRange": (
+                    f"{ref_low}-{ref_high}" if ref_low is not None and ref_high is not None else None
+                ),
+                "status": rec.status if rec else None,
+                "measureDate": rec.measured_at if rec else None,
+                "categories": catalog.category_names(it.id) if catalog else [],
+                "source": rec.source if rec else None,
+                "note": rec.note if rec else None,
+                "isBuiltin": it.is_builtin,
+                "loinc": it.loinc,
+                "favorite": favorites.get(it.id, False),
+            }
+        )
+    return items
@@ -0,0 +1,128 @@
+"""
+用户-指标最新记录（`IndicatorLatest`）维护模块
+
+职责：
+- 记录写接口（新增/更新/删除）在同一事务内调用 `refresh_latest_reading`，
+  按历史记录重新定位最新一条并 upsert 快照；软删除后自动回退到上一条记录；
+- 批量写入（一次涉及多个指标）使用 `refresh_latest_readings` 以固定语句数刷新；
+- `rebuild_latest_readings` 依据全部历史记录重建快照表（维护命令与启动补建使用）。
+"""
+
+from datetime import datetime
+from typing import Iterable, List
+
+from sqlalchemy import func, delete, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.indicator import IndicatorRecord, IndicatorLatest
+
+# 重建时单批写入的行数
+_REBUILD_BATCH_SIZE = 1000
+
+
+def _snapshot_values(rec: IndicatorRecord) -> dict:
+    return {
+        "record_id": rec.id,
+        "measured_at": rec.measured_at,
+        "value": rec.value,
+        "value_num": rec.value_num,
+        "unit": rec.unit,
+        "ref_low": rec.ref_low,
+        "ref_high": rec.ref_high,
+        "status": rec.status,
+        "source": rec.source,
+        "note": rec.note,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+async def refresh_latest_reading(session: AsyncSession, user_id: int, indicator_id: int) -> None:
+    """重新计算某用户某指标的最新记录快照（不提交，由调用方统一 commit）。
+
+    调用前需 `flush`，保证本事务内新增/修改/软删除的记录对查询可见。
+    """
+    res = await session.exec(
+        select(IndicatorRecord)
+        .where(
+            IndicatorRecord.user_id == user_id,
+            IndicatorRecord.indicator_id == indicator_id,
+            IndicatorRecord.deleted_at.is_(None),
+        )
+        .order_by(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+        .limit(1)
+    )
+    rec = res.first()
+    snap = await session.get(IndicatorLatest, (user_id, indicator_id))
+    if rec is None:
+        if snap is not None:
+            await session.delete(snap)
+        return
+    values = _snapshot_values(rec)
+    if snap is None:
+        snap = IndicatorLatest(user_id=user_id, indicator_id=indicator_id, **values)
+    else:
+        for k, v in values.items():
+            setattr(snap, k, v)
+    session.add(snap)
+
+
+async def _latest_rows(session: AsyncSession, *conditions) -> List[dict]:
+    """按窗口函数定位每个（用户, 指标）的最新未删除记录，返回快照行。"""
+    rn = func.row_number().over(
+        partition_by=(IndicatorRecord.user_id, IndicatorRecord.indicator_id),
+        order_by=(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc()),
+    ).label("rn")
+    ranked = (
+        select(IndicatorRecord.id.label("record_id"), rn)
+        .where(IndicatorRecord.deleted_at.is_(None), *conditions)
+        .subquery()
+    )
+    res = await session.exec(
+        select(IndicatorRecord)
+        .join(ranked, ranked.c.record_id == IndicatorRecord.id)
+        .where(ranked.c.rn == 1)
+    )
+    return [
+        {"user_id": r.user_id, "indicator_id": r.indicator_id, **_snapshot_values(r)}
+        for r in res.all()
+    ]
+
+
+async def refresh_latest_readings(session: AsyncSession, user_id: int, indicator_ids: Iterable[int]) -> None:
+    """批量版 `refresh_latest_reading`：一次删除并重写多个指标的快照（不提交，调用前需 `flush`）。"""
+    ids = sorted(set(indicator_ids))
+    if not ids:
+        return
+    await session.exec(
+        delete(IndicatorLatest).where(IndicatorLatest.user_id == user_id, IndicatorLatest.indicator_id.in_(ids))
+    )
+    rows = await _latest_rows(
+        session, IndicatorRecord.user_id == user_id, IndicatorRecord.indicator_id.in_(ids)
+    )
+    if rows:
+        await session.execute(insert(IndicatorLatest), rows)
+
+
+async def rebuild_latest_readings(session: AsyncSession) -> int:
+    """清空并依据历史记录重建全部最新记录快照，返回写入行数（调用方负责 commit）。"""
+    await session.exec(delete(IndicatorLatest))
+    rows = await _latest_rows(session)
+    for i in range(0, len(rows), _REBUILD_BATCH_SIZE):
+        await session.execute(insert(IndicatorLatest), rows[i:i + _REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+async def ensure_latest_readings(session: AsyncSession) -> bool:
+    """快照表为空而历史记录存在时（新建表后的首次启动）执行补建，返回是否发生重建。"""
+    has_snapshot = (await session.exec(select(IndicatorLatest.user_id).limit(1))).first()
+    if has_snapshot is not None:
+        return False
+    has_record = (
+        await session.exec(select(IndicatorRecord.id).where(IndicatorRecord.deleted_at.is_(None)).limit(1))
+    ).first()
+    if has_record is None:
+        return False
+    await rebuild_latest_readings(session)
+    await session.commit()
+    return True
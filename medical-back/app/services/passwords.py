@@ -0,0 +1,106 @@
+"""
+密码哈希服务
+
+职责：
+- 新哈希使用 scrypt（`hashlib.scrypt`，随机盐），格式 `scrypt$<n>$<r>$<p>$<盐 b64>$<摘要 b64>`，
+  成本参数取自 `Settings.password_scrypt_*`，写入哈希串中，调整参数后旧哈希仍可校验；
+- 哈希与校验在有界线程池（`Settings.password_hash_workers`）中执行，scrypt 计算期间释放 GIL，
+  事件循环在登录高峰时仍可处理其他请求；
+- 兼容历史无盐 SHA-256 十六进制哈希：`needs_rehash` 对旧格式或成本参数过时的哈希返回 True，
+  登录成功后由调用方重新哈希并写回。
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from app.core.settings import get_settings
+
+_SCHEME = "scrypt"
+_SALT_BYTES = 16
+_DKLEN = 32
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, get_settings().password_hash_workers), thread_name_prefix="password-hash"
+        )
+    return _executor
+
+
+def shutdown_pool() -> None:
+    """关闭哈希线程池（应用退出时调用）。"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _cost() -> Tuple[int, int, int]:
+    s = get_settings()
+    return s.password_scrypt_n, s.password_scrypt_r, s.password_scrypt_p
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # OpenSSL 默认内存上限为 32MB，按参数放宽（scrypt 约需 128 * r * (n + p) 字节）
+    maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=_DKLEN)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _legacy_sha256(password: str) -> str:
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def hash_password_sync(password: str) -> str:
+    n, r, p = _cost()
+    salt = os.urandom(_SALT_BYTES)
+    return f"{_SCHEME}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def verify_password_sync(password: str, stored: str) -> bool:
+    if not stored:
+        return False
+    if stored.startswith(_SCHEME + "$"):
+        try:
+            _, n, r, p, salt, digest = stored.split("$")
+            expected = _unb64(digest)
+            actual = _scrypt(password, _unb64(salt), int(n), int(r), int(p))
+        except (ValueError, TypeError):
+            return False
+        return hmac.compare_digest(actual, expected)
+    return hmac.compare_digest(_legacy_sha256(password), stored)
+
+
+def needs_rehash(stored: str) -> bool:
+    """旧 SHA-256 哈希或成本参数与当前配置不一致时返回 True。"""
+    if not stored.startswith(_SCHEME + "$"):
+        return True
+    try:
+        _, n, r, p, _salt, _digest = stored.split("$")
+        return (int(n), int(r), int(p)) != _cost()
+    except ValueError:
+        return True
+
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_pool(), hash_password_sync, password)
+
+
+async def verify_password(password: str, stored: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_pool(), verify_password_sync, password, stored)
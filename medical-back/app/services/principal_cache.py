@@ -0,0 +1,100 @@
+"""
+已认证用户（principal）进程内缓存
+
+职责：
+- `get_current_user` 校验 JWT 后，按（用户 ID, 令牌指纹）缓存用户列值快照，命中时不访问数据库；
+- 每次命中都构造新的 detached `User` 实例，请求之间不共享 ORM 对象，处理函数仍可 `session.add` 后提交修改；
+- LRU + TTL（`Settings.principal_cache_ttl_seconds` / `principal_cache_max_entries`）；
+  资料修改、改密、登录与用户软删除后调用 `invalidate_principal(user_id)`，直接删除该用户的全部缓存条目；
+  进程级失效计数 `_epoch` 防止失效前发起的查询把旧值写回缓存（不按用户保存状态，内存只随 LRU 上限增长）；
+- 多 worker 部署下其他进程依赖 TTL 兜底；命中率见 `principal_cache_stats()`（`GET /health/cache`），
+  并每 `_LOG_EVERY` 次查找写一行 `principal cache:stats` 日志。
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.logging import get_request_logger
+from app.core.settings import get_settings
+from app.models.user import User
+
+# 每累计该次数的查找输出一行命中率日志
+_LOG_EVERY = 10000
+
+_cache: "OrderedDict[Tuple[int, str], Tuple[float, dict]]" = OrderedDict()
+_epoch = 0
+_hits = 0
+_misses = 0
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def _detached_user(values: dict) -> User:
+    user = User(**values)
+    # 视为刚从数据库加载的已持久化对象：无待提交变更，`session.add` 后修改会生成 UPDATE
+    make_transient_to_detached(user)
+    return user
+
+
+def get_principal(user_id: int, fingerprint: str) -> Optional[User]:
+    """命中且未过期时返回新的 detached 用户实例，否则返回 None。"""
+    global _hits, _misses
+    key = (user_id, fingerprint)
+    entry = _cache.get(key)
+    hit = entry is not None and entry[0] > time.monotonic()
+    if hit:
+        _cache.move_to_end(key)
+        _hits += 1
+    else:
+        _misses += 1
+    if (_hits + _misses) % _LOG_EVERY == 0:
+        stats = principal_cache_stats()
+        get_request_logger().info(
+            f"principal cache:stats entries={stats['entries']} hits={_hits} misses={_misses} ratio={stats['hitRatio']}"
+        )
+    return _detached_user(entry[1]) if hit else None
+
+
+def put_principal(user: User, fingerprint: str, generation: int) -> None:
+    """缓存用户列值快照；`generation` 为查询前读取的失效计数，期间发生过任何失效则不写入。"""
+    settings = get_settings()
+    if settings.principal_cache_ttl_seconds <= 0 or settings.principal_cache_max_entries <= 0:
+        return
+    if _epoch != generation:
+        return
+    key = (user.id, fingerprint)
+    _cache[key] = (time.monotonic() + settings.principal_cache_ttl_seconds, user.model_dump())
+    _cache.move_to_end(key)
+    while len(_cache) > settings.principal_cache_max_entries:
+        _cache.popitem(last=False)
+
+
+def principal_generation() -> int:
+    """查询用户前读取，传给 `put_principal`。"""
+    return _epoch
+
+
+def invalidate_principal(user_id: int) -> None:
+    """用户资料、密码、登录时间变更或软删除提交后调用。"""
+    global _epoch
+    _epoch += 1
+    # 条目数受 principal_cache_max_entries 限制，线性扫描的代价可以接受
+    for key in [k for k in _cache if k[0] == user_id]:
+        del _cache[key]
+
+
+def principal_cache_stats() -> dict:
+    """当前进程的认证缓存统计（含命中率）。"""
+    total = _hits + _misses
+    return {
+        "entries": len(_cache),
+        "hits": _hits,
+        "misses": _misses,
+        "hitRatio": round(_hits / total, 4) if total else None,
+    }
@@ -0,0 +1,67 @@
+"""
+列表读取的列投影
+
+职责：
+- 为只读列表接口定义紧凑的行对象（`NamedTuple`，字段名与模型列名一致），只查询需要的列，
+  结果行直接转为行对象，不构造 SQLModel 实例：没有 pydantic 校验、不进入会话的 identity map，
+  单行内存约为 ORM 实例的几分之一（对比见 `benchmarks/bench_projection.py`）；
+- `project(q, dto, model)` 把由 `select(Model)` 构造的查询（过滤、计数、分页条件不变）改为只取行对象对应的列，
+  `fetch_rows` 执行并转换；
+- ORM 实例只在写路径使用（更新、删除前的归属校验等）。
+"""
+
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional, Tuple, Type
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.indicator import IndicatorRecord
+from app.models.user_indicator import UserIndicator
+
+
+class RecordRow(NamedTuple):
+    id: int
+    measured_at: date
+    value: str
+    unit: str
+    status: Optional[str]
+    source: Optional[str]
+    note: Optional[str]
+    admission_file_id: Optional[int]
+
+
+class UserIndicatorRow(NamedTuple):
+    id: int
+    indicator_id: int
+    alias: Optional[str]
+    threshold_min: Optional[float]
+    threshold_max: Optional[float]
+    favorite: bool
+    created_at: Optional[datetime]
+
+
+def columns_of(dto: Type[tuple], model) -> Tuple:
+    """行对象各字段对应的模型列（按字段名取同名属性）。"""
+    return tuple(getattr(model, name) for name in dto._fields)
+
+
+_COLUMNS = {
+    RecordRow: columns_of(RecordRow, IndicatorRecord),
+    UserIndicatorRow: columns_of(UserIndicatorRow, UserIndicator),
+}
+
+
+def project(q, dto: Type[tuple], model=None):
+    """把查询的选择列替换为行对象对应的列，其余子句保持不变。"""
+    columns = _COLUMNS.get(dto) if model is None else columns_of(dto, model)
+    return q.with_only_columns(*columns)
+
+
+async def fetch_rows(session: AsyncSession, q, dto: Type[tuple], model=None) -> List:
+    """按行对象投影执行查询，返回行对象列表。
+
+    使用 `session.execute`：`session.exec` 会把由 `select(Model)` 派生的查询按标量处理，只返回首列。
+    """
+    res = await session.execute(project(q, dto, model))
+    make = dto._make
+    return [make(row) for row in res.all()]
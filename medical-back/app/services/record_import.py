@@ -0,0 +1,208 @@
+"""
+指标记录批量导入（CSV / XLSX）
+
+职责：
+- 流式解析上传文件：CSV 按行读取，XLSX 使用 openpyxl 只读模式逐行迭代，不把整个工作簿读入内存；
+- 按批（`_IMPORT_BATCH_SIZE` 行）校验并以 executemany 写入，每批一个事务；提交前在同一事务内刷新
+  该指标的最新读数快照与本批涉及日期的预聚合，任一时刻已提交的记录与快照、预聚合一致；
+- 返回导入/跳过行数与逐行错误（行号从表头所在的第 1 行起算，最多返回 `_MAX_REPORTED_ERRORS` 条）。
+"""
+
+import codecs
+import csv
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.indicator import Indicator, IndicatorRecord
+from app.services.latest_reading import refresh_latest_reading
+from app.services.record_values import parse_value_num, record_status
+from app.services.rollups import refresh_rollups
+from app.utils.lazy_import import lazy_import
+
+openpyxl = lazy_import("openpyxl")
+
+# 每批校验与写入的行数
+_IMPORT_BATCH_SIZE = 1000
+# 响应中最多返回的错误明细条数（跳过行数仍完整统计）
+_MAX_REPORTED_ERRORS = 100
+
+# 表头 → 字段：兼容接口字段名与常见中文列名
+_HEADER_ALIASES = {
+    "date": "date", "measuredat": "date", "measuredate": "date", "日期": "date", "测量日期": "date", "检验日期": "date",
+    "value": "value", "值": "value", "数值": "value", "结果": "value", "检验结果": "value",
+    "unit": "unit", "单位": "unit",
+    "referencemin": "referenceMin", "reflow": "referenceMin", "参考下限": "referenceMin",
+    "referencemax": "referenceMax", "refhigh": "referenceMax", "参考上限": "referenceMax",
+    "source": "source", "来源": "source",
+    "note": "note", "备注": "note",
+}
+_REQUIRED_FIELDS = ("date", "value")
+_DATE_FORMATS = ("%Y/%m/%d", "%Y.%m.%d", "%Y%m%d")
+
+
+class ImportFormatError(ValueError):
+    """文件格式或表头无法识别。"""
+
+
+def _iter_csv(fileobj) -> Iterator[Sequence[Any]]:
+    reader = codecs.getreader("utf-8-sig")(fileobj, errors="replace")
+    yield from csv.reader(reader)
+
+
+def _iter_xlsx(fileobj) -> Iterator[Sequence[Any]]:
+    wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def iter_rows(filename: str, fileobj) -> Iterator[Sequence[Any]]:
+    """按扩展名选择解析器，逐行产出单元格值序列。"""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return _iter_csv(fileobj)
+    if name.endswith(".xlsx"):
+        return _iter_xlsx(fileobj)
+    raise ImportFormatError("仅支持 CSV 或 XLSX 文件")
+
+
+def _header_map(header: Sequence[Any]) -> Dict[str, int]:
+    mapping: Dict[str, int] = {}
+    for idx, cell in enumerate(header):
+        key = str(cell or "").strip().replace("_", "").replace(" ", "").lower()
+        field = _HEADER_ALIASES.get(key)
+        if field and field not in mapping:
+            mapping[field] = idx
+    missing = [f for f in _REQUIRED_FIELDS if f not in mapping]
+    if missing:
+        raise ImportFormatError(f"缺少必需列：{'/'.join(missing)}")
+    return mapping
+
+
+def _cell(row: Sequence[Any], mapping: Dict[str, int], field: str) -> Any:
+    idx = mapping.get(field)
+    if idx is None or idx >= len(row):
+        return None
+    value = row[idx]
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"日期格式无效：{value}")
+
+
+def _parse_float(value: Any, label: str) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label}不是数值：{value}")
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _row_params(
+    row: Sequence[Any], mapping: Dict[str, int], indicator: Indicator, user_id: int,
+    admission_file_id: Optional[int], now: datetime,
+) -> dict:
+    """校验并转换一行，失败时抛出 ValueError（消息即返回给前端的错误说明）。"""
+    raw_date = _cell(row, mapping, "date")
+    raw_value = _cell(row, mapping, "value")
+    if raw_date is None:
+        raise ValueError("缺少日期")
+    if raw_value is None:
+        raise ValueError("缺少数值")
+    ref_low = _parse_float(_cell(row, mapping, "referenceMin"), "参考下限")
+    ref_high = _parse_float(_cell(row, mapping, "referenceMax"), "参考上限")
+    if ref_low is not None and ref_high is not None and ref_low > ref_high:
+        raise ValueError("参考下限大于参考上限")
+    value = _format_value(raw_value)
+    return {
+        "indicator_id": indicator.id,
+        "user_id": user_id,
+        "measured_at": _parse_date(raw_date),
+        "value": value,
+        "value_num": parse_value_num(value),
+        "status": record_status(value, ref_low, ref_high),
+        "unit": _format_value(_cell(row, mapping, "unit") or indicator.unit),
+        "ref_low": ref_low,
+        "ref_high": ref_high,
+        "source": _format_value(_cell(row, mapping, "source") or "import"),
+        "note": _cell(row, mapping, "note"),
+        "admission_file_id": admission_file_id,
+        "created_at": now,
+    }
+
+
+def _next_chunk(rows: Iterator[Sequence[Any]]) -> List[Sequence[Any]]:
+    return list(islice(rows, _IMPORT_BATCH_SIZE))
+
+
+async def import_records(
+    session: AsyncSession,
+    user_id: int,
+    indicator: Indicator,
+    filename: str,
+    fileobj,
+    admission_file_id: Optional[int] = None,
+) -> dict:
+    """流式导入记录，返回 `{imported, skipped, errors}`；表头无法识别时抛出 ImportFormatError。"""
+    rows = iter_rows(filename, fileobj)
+    header = await run_in_threadpool(next, rows, None)
+    if header is None:
+        raise ImportFormatError("文件为空")
+    mapping = _header_map(header)
+    imported = skipped = 0
+    errors: List[Dict[str, Any]] = []
+    line = 1
+    while True:
+        # 解析在线程池中进行，避免大文件阻塞事件循环
+        chunk = await run_in_threadpool(_next_chunk, rows)
+        if not chunk:
+            break
+        now = datetime.utcnow()
+        batch = []
+        for row in chunk:
+            line += 1
+            if not any(c not in (None, "") for c in row):
+                continue
+            try:
+                batch.append(_row_params(row, mapping, indicator, user_id, admission_file_id, now))
+            except ValueError as e:
+                skipped += 1
+                if len(errors) < _MAX_REPORTED_ERRORS:
+                    errors.append({"row": line, "error": str(e)})
+        if batch:
+            await session.execute(insert(IndicatorRecord), batch)
+            await refresh_latest_reading(session, user_id, indicator.id)
+            await refresh_rollups(session, user_id, {indicator.id: {p["measured_at"] for p in batch}})
+            await session.commit()
+            imported += len(batch)
+    return {"imported": imported, "skipped": skipped, "errors": errors}
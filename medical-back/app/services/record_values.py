@@ -0,0 +1,50 @@
+"""
+指标记录数值解析与状态判定
+
+职责：
+- 写入记录时解析数值列 `value_num` 并按参考范围判定 `status`（high|low|normal），
+  持久化到 `IndicatorRecord`，查询端即可在 SQL 中按状态与数值范围过滤、计数；
+- 提供状态过滤条件构造（`abnormal` 表示 high 或 low）。
+"""
+
+import math
+from typing import Optional
+
+from app.models.indicator import IndicatorRecord
+
+# 视为异常的状态（查询参数 status=abnormal）
+ABNORMAL_STATUSES = ("high", "low")
+
+
+def parse_value_num(value: Optional[str]) -> Optional[float]:
+    """将记录值解析为数值；文本值（如“阴性”）与非有限值（nan、inf、溢出的 1e400）返回 None。"""
+    if value is None:
+        return None
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return v if math.isfinite(v) else None
+
+
+def record_status(value: Optional[str], ref_low: Optional[float], ref_high: Optional[float]) -> Optional[str]:
+    """按参考范围判定记录状态：high|low|normal；无法判定时返回 None，非数值按 normal 处理。"""
+    if value is None or ref_low is None or ref_high is None:
+        return None
+    v = parse_value_num(value)
+    if v is None:
+        return "normal"
+    return "high" if v > float(ref_high) else ("low" if v < float(ref_low) else "normal")
+
+
+def apply_record_values(r: IndicatorRecord) -> None:
+    """依据记录的值与参考范围刷新派生列 `value_num` 与 `status`（写入前调用）。"""
+    r.value_num = parse_value_num(r.value)
+    r.status = record_status(r.value, r.ref_low, r.ref_high)
+
+
+def status_condition(column, status: str):
+    """构造状态过滤条件：`abnormal` 匹配 high/low，其余按取值精确匹配。"""
+    if status == "abnormal":
+        return column.in_(ABNORMAL_STATUSES)
+    return column == status
@@ -0,0 +1,244 @@
+"""
+指标记录单条写入的执行与组提交队列
+
+职责：
+- 记录新增/更新/删除接口把写操作封装为 `op(session, touched)`，经 `execute_record_write` 执行；
+  op 写入记录并 `flush`，在 `touched` 中登记受影响的（用户, 指标, 日期），随后统一刷新
+  最新读数快照与预聚合、提交并使首页概览缓存失效；
+- `Settings.record_write_batching` 关闭（默认）时在请求自身会话中立即执行并提交，与逐条提交一致；
+- 开启时写操作进入有界 asyncio 队列，由单个写任务每 `record_write_batch_max_delay_ms` 毫秒或
+  每 `record_write_batch_max_items` 条合并为一个事务提交（一次 fsync、一次快照/预聚合刷新），
+  调用方等待各自的结果；队列满且超过 `record_write_enqueue_timeout_ms` 时抛出 `WriteQueueFullError`；
+- 持久性（`record_write_durability`）：`commit` 在组提交成功后返回；`flush` 在组内写入完成
+  （记录 ID 已分配）后即返回，提交失败时该组写入丢失并记录错误日志，换取更低延迟；
+- op 内的校验失败应在写入前抛出 `HTTPException`，仅该 op 失败；其他异常使整组回滚，
+  之后逐条重试以隔离出错的写入；回滚/关闭会话本身失败时本组未完成的写入以该异常失败，写任务继续运行；
+- 停止写任务时（或写任务被取消）仍在排队的写入以 `WriteQueueClosedError` 失败，调用方不会一直等待。
+"""
+
+import asyncio
+import contextvars
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.logging import get_request_logger
+from app.core.settings import get_settings
+from app.services.dashboard import invalidate_dashboard
+from app.services.latest_reading import refresh_latest_readings
+from app.services.rollups import refresh_rollups
+
+
+class WriteQueueFullError(RuntimeError):
+    """写入队列已满且等待超时。"""
+
+
+class WriteQueueClosedError(WriteQueueFullError):
+    """写任务已停止（应用退出中），排队的写入未执行。"""
+
+
+class Touched:
+    """一个事务内受影响的 `{user_id: {indicator_id: {日期}}}`。"""
+
+    def __init__(self) -> None:
+        self.by_user: Dict[int, Dict[int, Set[date]]] = {}
+
+    def add(self, user_id: int, indicator_id: int, *days: date) -> None:
+        self.by_user.setdefault(user_id, {}).setdefault(indicator_id, set()).update(d for d in days if d)
+
+
+RecordWriteOp = Callable[[AsyncSession, Touched], Awaitable[Any]]
+
+
+async def _refresh(session: AsyncSession, touched: Touched) -> None:
+    await session.flush()
+    for user_id, days in touched.by_user.items():
+        await refresh_latest_readings(session, user_id, days.keys())
+        await refresh_rollups(session, user_id, days)
+
+
+def _invalidate(touched: Touched) -> None:
+    for user_id in touched.by_user:
+        invalidate_dashboard(user_id)
+
+
+async def execute_record_write(session: AsyncSession, op: RecordWriteOp) -> Any:
+    """执行一个记录写操作并返回 op 的结果；按配置直接提交或交给组提交队列。"""
+    if get_settings().record_write_batching:
+        return await _submit(op)
+    touched = Touched()
+    result = await op(session, touched)
+    await _refresh(session, touched)
+    await session.commit()
+    _invalidate(touched)
+    return result
+
+
+class _Pending:
+    __slots__ = ("op", "future")
+
+    def __init__(self, op: RecordWriteOp, future: asyncio.Future) -> None:
+        self.op = op
+        self.future = future
+
+
+_queue: Optional[asyncio.Queue] = None
+_writer: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_groups = 0
+_items = 0
+
+
+def _fail(batch: List[_Pending], exc: BaseException) -> None:
+    for pending in batch:
+        if not pending.future.done():
+            pending.future.set_exception(exc)
+
+
+def _fail_queued(queue: asyncio.Queue, exc: BaseException) -> None:
+    """使队列中尚未处理的写入全部失败，避免调用方一直等待。"""
+    while True:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        if item is not None:
+            _fail([item], exc)
+
+
+def _ensure_writer() -> asyncio.Queue:
+    global _queue, _writer, _loop
+    loop = asyncio.get_running_loop()
+    if _queue is None or _loop is not loop or _writer is None or _writer.done():
+        if _queue is not None and _loop is loop:
+            _fail_queued(_queue, WriteQueueClosedError("写任务已停止"))
+        _queue = asyncio.Queue(maxsize=max(1, get_settings().record_write_queue_max))
+        _loop = loop
+        # 写任务可能由某个请求首次启动：使用空上下文，避免继承该请求的 request_id 与查询统计
+        _writer = loop.create_task(_writer_loop(_queue), context=contextvars.Context())
+    return _queue
+
+
+async def _submit(op: RecordWriteOp) -> Any:
+    queue = _ensure_writer()
+    pending = _Pending(op, asyncio.get_running_loop().create_future())
+    timeout = get_settings().record_write_enqueue_timeout_ms / 1000
+    try:
+        await asyncio.wait_for(queue.put(pending), timeout)
+    except asyncio.TimeoutError:
+        raise WriteQueueFullError("写入队列已满")
+    return await pending.future
+
+
+async def _writer_loop(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        first = await queue.get()
+        if first is None:
+            return
+        settings = get_settings()
+        batch: List[_Pending] = [first]
+        stop = False
+        deadline = loop.time() + settings.record_write_batch_max_delay_ms / 1000
+        while len(batch) < settings.record_write_batch_max_items:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        try:
+            await _run_group(batch)
+        except asyncio.CancelledError:
+            closed = WriteQueueClosedError("写任务已停止")
+            _fail(batch, closed)
+            _fail_queued(queue, closed)
+            raise
+        except Exception as e:
+            # 回滚或关闭会话失败等组外异常：本组未得到结果的写入以该异常失败，写任务继续运行
+            get_request_logger().exception(f"record write queue:group failed size={len(batch)}")
+            _fail(batch, e)
+        if stop:
+            _fail_queued(queue, WriteQueueClosedError("写任务已停止"))
+            return
+
+
+def _resolve(batch: List[_Pending], outcomes: List[tuple]) -> None:
+    for pending, (ok, value) in zip(batch, outcomes):
+        if pending.future.done():
+            continue
+        if ok:
+            pending.future.set_result(value)
+        else:
+            pending.future.set_exception(value)
+
+
+async def _run_group(batch: List[_Pending]) -> None:
+    global _groups, _items
+    from app.db.session import async_session_factory
+
+    durable = get_settings().record_write_durability != "flush"
+    resolved = False
+    async with async_session_factory() as session:
+        try:
+            touched = Touched()
+            outcomes = []
+            for pending in batch:
+                try:
+                    outcomes.append((True, await pending.op(session, touched)))
+                except HTTPException as e:
+                    outcomes.append((False, e))
+            await _refresh(session, touched)
+            if not durable:
+                _resolve(batch, outcomes)
+                resolved = True
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            if resolved:
+                get_request_logger().exception(f"record write queue:commit failed lost={len(batch)}")
+                return
+            if len(batch) == 1:
+                _resolve(batch, [(False, e)])
+                return
+            # 整组失败：逐条重试以隔离出错的写入
+            for pending in batch:
+                await _run_group([pending])
+            return
+    _groups += 1
+    _items += len(batch)
+    _invalidate(touched)
+    _resolve(batch, outcomes)
+
+
+async def stop_record_writer() -> None:
+    """处理完停止前已入队的写入后停止写任务（应用退出时调用），之后仍在排队的写入以 `WriteQueueClosedError` 失败。"""
+    global _queue, _writer
+    if _writer is not None and not _writer.done() and _loop is asyncio.get_running_loop():
+        await _queue.put(None)
+        await _writer
+    if _queue is not None and _loop is asyncio.get_running_loop():
+        _fail_queued(_queue, WriteQueueClosedError("写任务已停止"))
+    _queue = None
+    _writer = None
+
+
+def record_write_stats() -> dict:
+    """当前进程的组提交统计。"""
+    return {
+        "enabled": get_settings().record_write_batching,
+        "queued": _queue.qsize() if _queue is not None else 0,
+        "groups": _groups,
+        "items": _items,
+        "avgGroupSize": round(_items / _groups, 2) if _groups else None,
+    }
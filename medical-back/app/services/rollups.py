@@ -0,0 +1,215 @@
+"""
+指标数值预聚合（`IndicatorRollup`）维护模块
+
+职责：
+- 记录写接口（新增/更新/软删除/批量写入/导入）在 `flush` 之后调用 `refresh_rollups`，
+  按受影响的（指标, 日期）定位 day/week/month 时间桶，从原始记录重新聚合这些桶并覆盖写入；
+  只重算受影响的桶，最值在删除后也保持精确；
+- `load_rollups` 供趋势分析读取完整时间桶；
+- `rebuild_rollups` / `verify_rollups` 依据全部历史记录重建或校验预聚合（维护命令与启动补建使用）。
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.indicator import IndicatorRecord, IndicatorRollup
+from app.services.trend_analysis import (
+    GRANULARITIES, BucketAggregates, aggregate, bucket_of, empty_aggregates, load_series, next_bucket,
+)
+from app.utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# 批量写入/删除时单条语句处理的行数
+_ROLLUP_BATCH_SIZE = 500
+# 校验时浮点比较的容差
+_VERIFY_TOLERANCE = 1e-6
+
+
+def _rollup_rows(user_id: int, granularity: str, agg: BucketAggregates, now: datetime) -> List[dict]:
+    rows = zip(
+        agg.indicator_id.tolist(),
+        agg.bucket_start.tolist(),
+        agg.count.tolist(),
+        agg.sum.tolist(),
+        agg.m2.tolist(),
+        agg.min.tolist(),
+        agg.max.tolist(),
+        agg.abnormal.tolist(),
+        np.where(np.isnan(agg.ref_low), None, agg.ref_low).tolist(),
+        np.where(np.isnan(agg.ref_high), None, agg.ref_high).tolist(),
+    )
+    return [
+        {
+            "user_id": user_id, "indicator_id": ind, "granularity": granularity, "bucket_start": start,
+            "count": count, "sum": total, "m2": m2, "min": lo, "max": hi, "abnormal_count": abnormal,
+            "ref_low": ref_low, "ref_high": ref_high, "updated_at": now,
+        }
+        for ind, start, count, total, m2, lo, hi, abnormal, ref_low, ref_high in rows
+    ]
+
+
+async def _insert_rows(session: AsyncSession, rows: List[dict]) -> None:
+    for i in range(0, len(rows), _ROLLUP_BATCH_SIZE):
+        await session.execute(insert(IndicatorRollup), rows[i:i + _ROLLUP_BATCH_SIZE])
+
+
+async def refresh_rollups(session: AsyncSession, user_id: int, touched: Dict[int, Iterable[date]]) -> None:
+    """重算受影响时间桶的预聚合（不提交，由调用方统一 commit；调用前需 `flush`）。
+
+    `touched` 为 `{indicator_id: [测量日期, ...]}`；更新记录日期时需同时传入新旧日期。
+    """
+    days = {ind: set(ds) for ind, ds in touched.items() if ds}
+    if not days:
+        return
+    all_days = [d for ds in days.values() for d in ds]
+    first, last = min(all_days), max(all_days)
+    window_start = min(bucket_of(first, g) for g in GRANULARITIES)
+    window_end = max(next_bucket(bucket_of(last, g), g) for g in GRANULARITIES) - timedelta(days=1)
+    columns = await load_series(session, user_id, sorted(days), window_start, window_end)
+    now = datetime.utcnow()
+    for g in GRANULARITIES:
+        keys = sorted({(ind, bucket_of(d, g)) for ind, ds in days.items() for d in ds})
+        for i in range(0, len(keys), _ROLLUP_BATCH_SIZE):
+            await session.exec(
+                delete(IndicatorRollup).where(
+                    IndicatorRollup.user_id == user_id,
+                    IndicatorRollup.granularity == g,
+                    tuple_(IndicatorRollup.indicator_id, IndicatorRollup.bucket_start).in_(
+                        keys[i:i + _ROLLUP_BATCH_SIZE]
+                    ),
+                )
+            )
+        wanted = set(keys)
+        rows = [
+            r for r in _rollup_rows(user_id, g, aggregate(columns, g), now)
+            if (r["indicator_id"], r["bucket_start"]) in wanted
+        ]
+        await _insert_rows(session, rows)
+
+
+async def load_rollups(
+    session: AsyncSession,
+    user_id: int,
+    indicator_ids: Sequence[int],
+    granularity: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> BucketAggregates:
+    """读取 `[start, end)` 内的完整时间桶预聚合，按（指标, 桶起点）排序。"""
+    q = select(
+        IndicatorRollup.indicator_id,
+        IndicatorRollup.bucket_start,
+        IndicatorRollup.count,
+        IndicatorRollup.sum,
+        IndicatorRollup.m2,
+        IndicatorRollup.min,
+        IndicatorRollup.max,
+        IndicatorRollup.abnormal_count,
+        IndicatorRollup.ref_low,
+        IndicatorRollup.ref_high,
+    ).where(
+        IndicatorRollup.user_id == user_id,
+        IndicatorRollup.indicator_id.in_(list(indicator_ids)),
+        IndicatorRollup.granularity == granularity,
+    )
+    if start is not None:
+        q = q.where(IndicatorRollup.bucket_start >= start)
+    if end is not None:
+        q = q.where(IndicatorRollup.bucket_start < end)
+    q = q.order_by(IndicatorRollup.indicator_id, IndicatorRollup.bucket_start)
+    rows = (await session.exec(q)).all()
+    if not rows:
+        return empty_aggregates()
+    ind, start_, count, total, m2, lo, hi, abnormal, ref_low, ref_high = zip(*rows)
+    return BucketAggregates(
+        indicator_id=np.array(ind, dtype=np.int64),
+        bucket_start=np.array(start_, dtype="datetime64[D]"),
+        count=np.array(count, dtype=np.int64),
+        sum=np.array(total, dtype=np.float64),
+        m2=np.array(m2, dtype=np.float64),
+        min=np.array(lo, dtype=np.float64),
+        max=np.array(hi, dtype=np.float64),
+        abnormal=np.array(abnormal, dtype=np.int64),
+        ref_low=np.array(ref_low, dtype=np.float64),
+        ref_high=np.array(ref_high, dtype=np.float64),
+    )
+
+
+async def _user_ids(session: AsyncSession) -> List[int]:
+    res = await session.exec(
+        select(IndicatorRecord.user_id)
+        .where(IndicatorRecord.deleted_at.is_(None), IndicatorRecord.value_num.is_not(None))
+        .distinct()
+        .order_by(IndicatorRecord.user_id)
+    )
+    return list(res.all())
+
+
+async def _expected_rows(session: AsyncSession, user_id: int, now: datetime) -> List[dict]:
+    columns = await load_series(session, user_id)
+    return [row for g in GRANULARITIES for row in _rollup_rows(user_id, g, aggregate(columns, g), now)]
+
+
+async def rebuild_rollups(session: AsyncSession) -> int:
+    """清空并按用户逐个重建全部预聚合，返回写入行数（调用方负责 commit）。"""
+    await session.exec(delete(IndicatorRollup))
+    now = datetime.utcnow()
+    total = 0
+    for user_id in await _user_ids(session):
+        rows = await _expected_rows(session, user_id, now)
+        await _insert_rows(session, rows)
+        total += len(rows)
+    return total
+
+
+async def verify_rollups(session: AsyncSession) -> dict:
+    """按用户比对预聚合与原始记录的重新聚合结果，返回缺失/多余/不一致的桶数。"""
+    fields = ("count", "sum", "m2", "min", "max", "abnormal_count")
+    checked = missing = extra = mismatched = 0
+    now = datetime.utcnow()
+    stored_users = set((await session.exec(select(IndicatorRollup.user_id).distinct())).all())
+    users = sorted(stored_users | set(await _user_ids(session)))
+    for user_id in users:
+        expected = {
+            (r["indicator_id"], r["granularity"], r["bucket_start"]): r
+            for r in await _expected_rows(session, user_id, now)
+        }
+        res = await session.exec(select(IndicatorRollup).where(IndicatorRollup.user_id == user_id))
+        stored = {(r.indicator_id, r.granularity, r.bucket_start): r for r in res.all()}
+        checked += len(expected)
+        missing += len(expected.keys() - stored.keys())
+        extra += len(stored.keys() - expected.keys())
+        for key in expected.keys() & stored.keys():
+            exp, got = expected[key], stored[key]
+            if any(
+                abs(float(exp[f]) - float(getattr(got, f))) > _VERIFY_TOLERANCE * max(1.0, abs(exp[f]))
+                for f in fields
+            ):
+                mismatched += 1
+    return {"checked": checked, "missing": missing, "extra": extra, "mismatched": mismatched}
+
+
+async def ensure_rollups(session: AsyncSession) -> bool:
+    """预聚合表为空而数值记录存在时（新建表后的首次启动）执行补建，返回是否发生重建。"""
+    has_rollup = (await session.exec(select(IndicatorRollup.user_id).limit(1))).first()
+    if has_rollup is not None:
+        return False
+    has_record = (
+        await session.exec(
+            select(IndicatorRecord.id)
+            .where(IndicatorRecord.deleted_at.is_(None), IndicatorRecord.value_num.is_not(None))
+            .limit(1)
+        )
+    ).first()
+    if has_record is None:
+        return False
+    await rebuild_rollups(session)
+    await session.commit()
+    return True
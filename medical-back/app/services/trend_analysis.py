@@ -0,0 +1,282 @@
+"""
+指标趋势分析
+
+职责：
+- 一次列式查询取出用户若干指标的数值序列（`value_num` 非空的未删除记录），转换为 NumPy 数组；
+- 按 day|week|month 重采样（周以周一为起点），向量化得到每个时间桶的条数/和/离差平方和/最值/异常条数；
+- 由桶聚合计算整体统计：均值、标准差（总体，按 Chan 公式合并各桶离差平方和，避免 `E[x²]-E[x]²` 的相消误差）、按桶均值线性回归的斜率（每天变化量）、趋势方向与异常条数；
+- 长区间优先读取 `IndicatorRollup` 预聚合（见 `app/services/rollups.py`），
+  只有查询区间首尾不完整的时间桶才回到原始记录聚合。
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import String, type_coerce
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import get_settings
+from app.models.indicator import IndicatorRecord
+from app.services.record_values import ABNORMAL_STATUSES
+from app.utils.lazy_import import lazy_import
+
+# NumPy 在首次趋势计算/预聚合刷新时导入（或由启动预热加载），不计入应用启动耗时
+np = lazy_import("numpy")
+
+GRANULARITIES = ("day", "week", "month")
+# 斜率 × 时间跨度 相对均值的变化幅度低于该比例时视为平稳
+_FLAT_THRESHOLD = 0.05
+
+
+class BucketAggregates(NamedTuple):
+    """按（指标, 桶起点）有序的时间桶聚合（列数组）。"""
+    indicator_id: np.ndarray
+    bucket_start: np.ndarray  # datetime64[D]
+    count: np.ndarray
+    sum: np.ndarray
+    m2: np.ndarray  # 桶内离差平方和 Σ(x - 桶均值)²
+    min: np.ndarray
+    max: np.ndarray
+    abnormal: np.ndarray
+    ref_low: np.ndarray  # 桶内最后一条记录，缺失为 NaN
+    ref_high: np.ndarray
+
+
+def empty_aggregates() -> BucketAggregates:
+    f = np.empty(0, dtype=np.float64)
+    i = np.empty(0, dtype=np.int64)
+    return BucketAggregates(i, np.empty(0, dtype="datetime64[D]"), i, f, f, f, f, i, f, f)
+
+
+async def load_series(
+    session: AsyncSession,
+    user_id: int,
+    indicator_ids: Optional[Sequence[int]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, np.ndarray]:
+    """按（指标, 日期, ID）顺序一次取出数值序列，返回列数组；`indicator_ids=None` 表示该用户全部指标。"""
+    q = select(
+        IndicatorRecord.indicator_id,
+        # 跳过 ORM 的逐行日期解析，由 NumPy 批量转换 ISO 字符串（驱动返回 date 时同样适用）
+        type_coerce(IndicatorRecord.measured_at, String),
+        IndicatorRecord.value_num,
+        IndicatorRecord.ref_low,
+        IndicatorRecord.ref_high,
+        IndicatorRecord.status,
+    ).where(
+        IndicatorRecord.user_id == user_id,
+        IndicatorRecord.deleted_at.is_(None),
+        IndicatorRecord.value_num.is_not(None),
+    )
+    if indicator_ids is not None:
+        q = q.where(IndicatorRecord.indicator_id.in_(list(indicator_ids)))
+    if start_date:
+        q = q.where(IndicatorRecord.measured_at >= start_date)
+    if end_date:
+        q = q.where(IndicatorRecord.measured_at <= end_date)
+    q = q.order_by(IndicatorRecord.indicator_id, IndicatorRecord.measured_at, IndicatorRecord.id)
+    rows = (await session.exec(q)).all()
+    if not rows:
+        return {}
+    ind, measured, value, ref_low, ref_high, status = zip(*rows)
+    return {
+        "indicator_id": np.array(ind, dtype=np.int64),
+        "day": np.array(measured, dtype="datetime64[D]"),
+        "value": np.array(value, dtype=np.float64),
+        # 缺失参考范围以 NaN 表示
+        "ref_low": np.array(ref_low, dtype=np.float64),
+        "ref_high": np.array(ref_high, dtype=np.float64),
+        "abnormal": np.isin(np.array(status, dtype=object), ABNORMAL_STATUSES),
+    }
+
+
+def bucket_start(days: np.ndarray, granularity: str) -> np.ndarray:
+    """日期数组 → 所在时间桶起点。"""
+    if granularity == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    if granularity == "week":
+        n = days.astype(np.int64)
+        # 1970-01-01 为周四，(n + 3) % 7 即距本周一的天数
+        return (n - (n + 3) % 7).astype("datetime64[D]")
+    return days
+
+
+def bucket_end(starts: np.ndarray, granularity: str) -> np.ndarray:
+    """时间桶起点数组 → 下一个时间桶起点（开区间终点）。"""
+    if granularity == "month":
+        return (starts.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    return starts + (7 if granularity == "week" else 1)
+
+
+def bucket_of(d: date, granularity: str) -> date:
+    """单个日期所在时间桶起点。"""
+    return bucket_start(np.array([d], dtype="datetime64[D]"), granularity)[0].item()
+
+
+def next_bucket(d: date, granularity: str) -> date:
+    """单个时间桶起点的下一个时间桶起点。"""
+    return bucket_end(np.array([d], dtype="datetime64[D]"), granularity)[0].item()
+
+
+def aggregate(columns: Dict[str, np.ndarray], granularity: str) -> BucketAggregates:
+    """将列数组按（指标, 时间桶）聚合。"""
+    if not columns:
+        return empty_aggregates()
+    ind = columns["indicator_id"]
+    values = columns["value"]
+    buckets = bucket_start(columns["day"], granularity)
+    # 输入按（指标, 日期）有序，同一（指标, 桶）的行连续，可用 reduceat 分段聚合
+    change = np.empty(ind.size, dtype=bool)
+    change[0] = True
+    change[1:] = (ind[1:] != ind[:-1]) | (buckets[1:] != buckets[:-1])
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], ind.size)
+    last = ends - 1
+    counts = ends - starts
+    sums = np.add.reduceat(values, starts)
+    dev = values - np.repeat(sums / counts, counts)
+    return BucketAggregates(
+        indicator_id=ind[starts],
+        bucket_start=buckets[starts],
+        count=counts.astype(np.int64),
+        sum=sums,
+        m2=np.add.reduceat(dev * dev, starts),
+        min=np.minimum.reduceat(values, starts),
+        max=np.maximum.reduceat(values, starts),
+        abnormal=np.add.reduceat(columns["abnormal"].astype(np.int64), starts),
+        ref_low=columns["ref_low"][last],
+        ref_high=columns["ref_high"][last],
+    )
+
+
+def merge_aggregates(parts: List[BucketAggregates]) -> BucketAggregates:
+    """拼接多段聚合（桶互不重叠）并按（指标, 桶起点）重新排序。"""
+    parts = [p for p in parts if p.count.size]
+    if not parts:
+        return empty_aggregates()
+    if len(parts) == 1:
+        return parts[0]
+    merged = BucketAggregates(*(np.concatenate(cols) for cols in zip(*parts)))
+    order = np.lexsort((merged.bucket_start, merged.indicator_id))
+    return BucketAggregates(*(col[order] for col in merged))
+
+
+def _stats(agg: BucketAggregates, bs: int, be: int, means: np.ndarray, bucket_x: np.ndarray) -> dict:
+    n = int(agg.count[bs:be].sum())
+    mean = float(agg.sum[bs:be].sum()) / n
+    x_b, m_b = bucket_x[bs:be], means[bs:be]
+    # 总离差平方和 = Σ 桶内 M2 + Σ n_b (桶均值 - 总均值)²，各项均为中心化量
+    m2 = float(agg.m2[bs:be].sum()) + float((agg.count[bs:be] * (m_b - mean) ** 2).sum())
+    var = max(m2 / n, 0.0)
+    slope = 0.0
+    if x_b.size >= 2:
+        x = x_b - x_b.mean()
+        slope = float((x * (m_b - m_b.mean())).sum() / (x * x).sum())
+    span = float(x_b[-1] - x_b[0])
+    if abs(slope * span) <= _FLAT_THRESHOLD * max(abs(mean), 1e-9):
+        trend = "flat"
+    else:
+        trend = "up" if slope > 0 else "down"
+    return {
+        "count": n,
+        "mean": round(mean, 4),
+        "std": round(var ** 0.5, 4),
+        "min": float(agg.min[bs:be].min()),
+        "max": float(agg.max[bs:be].max()),
+        "trend": trend,
+        "trendSlope": round(slope, 6),
+        "abnormalCount": int(agg.abnormal[bs:be].sum()),
+    }
+
+
+def build_trends(agg: BucketAggregates) -> Dict[int, dict]:
+    """由桶聚合生成 `{indicator_id: {"series": [...], "stats": {...}}}`。"""
+    if not agg.count.size:
+        return {}
+    means = agg.sum / agg.count
+    bucket_x = agg.bucket_start.astype(np.int64).astype(np.float64)
+    # 一次性转换为 Python 列表再组装，避免逐元素访问 NumPy 标量
+    rows = zip(
+        np.datetime_as_string(agg.bucket_start, unit="D").tolist(),
+        np.round(means, 4).tolist(),
+        agg.min.tolist(),
+        agg.max.tolist(),
+        agg.count.tolist(),
+        np.where(np.isnan(agg.ref_low), None, agg.ref_low).tolist(),
+        np.where(np.isnan(agg.ref_high), None, agg.ref_high).tolist(),
+    )
+    keys = ("date", "value", "min", "max", "count", "refLow", "refHigh")
+    all_series = [dict(zip(keys, row)) for row in rows]
+
+    ind = agg.indicator_id
+    bounds = np.append(np.flatnonzero(np.r_[True, ind[1:] != ind[:-1]]), ind.size)
+    out: Dict[int, dict] = {}
+    for bs, be in zip(bounds[:-1], bounds[1:]):
+        out[int(ind[bs])] = {
+            "series": all_series[bs:be],
+            "stats": _stats(agg, bs, be, means, bucket_x),
+        }
+    return out
+
+
+def resample(columns: Dict[str, np.ndarray], granularity: str) -> Dict[int, dict]:
+    """按指标分组重采样原始序列。"""
+    return build_trends(aggregate(columns, granularity))
+
+
+def empty_stats() -> dict:
+    return {
+        "count": 0, "mean": None, "std": None, "min": None, "max": None,
+        "trend": "flat", "trendSlope": 0.0, "abnormalCount": 0,
+    }
+
+
+async def _load_aggregates(
+    session: AsyncSession,
+    user_id: int,
+    indicator_ids: List[int],
+    granularity: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> BucketAggregates:
+    async def raw(start: Optional[date], end: Optional[date]) -> BucketAggregates:
+        return aggregate(await load_series(session, user_id, indicator_ids, start, end), granularity)
+
+    if not get_settings().trend_use_rollups:
+        return await raw(start_date, end_date)
+    from app.services.rollups import load_rollups
+
+    # 完整时间桶区间 [full_start, full_end) 读预聚合，首尾不完整的桶读原始记录
+    full_start = start_date
+    if start_date is not None and bucket_of(start_date, granularity) != start_date:
+        full_start = next_bucket(bucket_of(start_date, granularity), granularity)
+    full_end = None
+    if end_date is not None:
+        after = end_date + timedelta(days=1)
+        full_end = after if bucket_of(after, granularity) == after else bucket_of(end_date, granularity)
+    if full_start is not None and full_end is not None and full_start >= full_end:
+        return await raw(start_date, end_date)
+    parts = [await load_rollups(session, user_id, indicator_ids, granularity, full_start, full_end)]
+    if start_date is not None and full_start != start_date:
+        parts.append(await raw(start_date, full_start - timedelta(days=1)))
+    if full_end is not None and full_end != end_date + timedelta(days=1):
+        parts.append(await raw(full_end, end_date))
+    return merge_aggregates(parts)
+
+
+async def indicator_trends(
+    session: AsyncSession,
+    user_id: int,
+    indicator_ids: List[int],
+    granularity: str = "day",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[int, dict]:
+    """加载并重采样多个指标的趋势；无数值记录的指标返回空序列。"""
+    agg = await _load_aggregates(session, user_id, indicator_ids, granularity, start_date, end_date)
+    trends = build_trends(agg)
+    return {i: trends.get(i) or {"series": [], "stats": empty_stats()} for i in indicator_ids}
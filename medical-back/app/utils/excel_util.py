@@ -1,8 +1,11 @@
 # Excel 工具
 # 迁移自 py_tools.utils.excel_util.py
-import openpyxl
 from typing import List
 
+from app.utils.lazy_import import lazy_import
+
+openpyxl = lazy_import("openpyxl")
+
 def read_excel(file_path: str) -> List[list]:
     wb = openpyxl.load_workbook(file_path)
     ws = wb.active
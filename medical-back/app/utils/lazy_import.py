@@ -0,0 +1,42 @@
+# 重型依赖的延迟导入（基于 lazy_loader）
+# 模块级写 `np = lazy_import("numpy")`：`lazy_loader.load` 在 sys.modules 中登记 importlib 惰性模块，
+# 首次访问属性时才真正执行导入；未安装的可选依赖返回占位模块，首次使用时抛出 ModuleNotFoundError。
+# 启动时由 `app.core.warmup` 在接受请求前预热，避免首个请求承担导入耗时。
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Dict
+
+import lazy_loader
+
+_names: Dict[str, None] = {}
+_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """返回延迟加载的模块（已导入时直接返回模块本身）。"""
+    with _lock:
+        _names.setdefault(name, None)
+    return lazy_loader.load(name)
+
+
+def load_module(name: str) -> ModuleType:
+    """立即完成导入（预热用）；依赖未安装时抛出 ModuleNotFoundError。"""
+    module = lazy_import(name)
+    if isinstance(module, lazy_loader.DelayedImportErrorModule):
+        raise ModuleNotFoundError(f"No module named '{name}'")
+    module.__dict__  # 任意属性访问都会触发惰性模块执行导入
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    """模块是否已真正导入。"""
+    module = sys.modules.get(name)
+    # 惰性模块导入完成后其类型会被替换为普通模块；用 type() 判断，不触发导入
+    return module is not None and type(module) is not importlib.util._LazyModule
+
+
+def lazy_modules() -> Dict[str, bool]:
+    """已登记的延迟模块及其是否已加载。"""
+    return {name: is_loaded(name) for name in _names}
@@ -1,13 +1,9 @@
 # 日志工具
 # 迁移自 py_tools.logging.base.py
+# 返回标准库 logger；记录由 `app.core.logging.configure_logging` 安装的转发处理器交给 loguru，
+# 与应用日志共用同一套格式、关联字段与输出
 import logging
 
+
 def get_logger(name: str = None) -> logging.Logger:
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('[%(asctime)s] %(levelname)s %(name)s: %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
-    return logger
\ No newline at end of file
+    return logging.getLogger(name)
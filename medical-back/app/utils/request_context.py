@@ -1,5 +1,14 @@
 from contextvars import ContextVar
-from typing import Optional
+from typing import Dict, Optional
 
 request_id_ctx_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
-trace_id_ctx_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
\ No newline at end of file
+trace_id_ctx_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+# 当前请求各阶段耗时（秒），由中间件创建，写入 `Server-Timing` 响应头
+phase_timings_ctx_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("phase_timings", default=None)
+
+
+def add_phase_time(phase: str, seconds: float) -> None:
+    """累加当前请求某阶段的耗时；请求之外调用时忽略。"""
+    timings = phase_timings_ctx_var.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
@@ -0,0 +1 @@
+"""Performance benchmarks (run with `python -m benchmarks.<name>`)."""
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+指标关键词检索基准：LIKE 全表扫描 vs FTS5 trigram 全文索引
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_keyword_search [--rows 100000] [--repeat 20]
+
+说明：
+- 在临时 SQLite 文件中生成指定规模的指标目录（中英文名称 + LOINC），
+  全文表与触发器直接复用 `app.db.fts` 中的 DDL，保证与线上结构一致；
+- 每个关键词分别计时“计数 + 取第一页（20 条）”：LIKE、FTS 过滤（按 ID 排序，对应游标模式）
+  与 FTS 相关度排序（IN 过滤计数 + 相关度分页，对应分页模式），输出中位数耗时与加速比。
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from app.db.fts import INDICATOR_FTS_DDL, INDICATOR_FTS_POPULATE
+
+_PREFIXES = ["血清", "血浆", "全血", "尿液", "糖化", "平均", "总", "游离", "直接", "间接"]
+_STEMS = ["血红蛋白", "白蛋白", "胆红素", "肌酐", "尿酸", "葡萄糖", "胆固醇", "甘油三酯", "铁蛋白", "转氨酶"]
+_SUFFIXES = ["浓度", "含量", "比值", "测定", "活性", "", "定量", "指数"]
+_EN = ["Hemoglobin", "Albumin", "Bilirubin", "Creatinine", "Uric Acid", "Glucose", "Cholesterol", "Ferritin"]
+
+_KEYWORDS = ["血红蛋白", "胆固醇", "Creatinine", "糖化血红", "铁蛋白定量"]
+
+_LIKE_SQL = (
+    "FROM indicator WHERE deleted_at IS NULL AND "
+    "(name_cn LIKE :p OR name_en LIKE :p OR loinc LIKE :p)"
+)
+# 与 app.db.fts 生成的查询一致：IN 过滤用于计数/游标翻页，相关度子查询仅用于分页排序
+_FTS_HITS = (
+    "SELECT CASE WHEN rowid > 0 THEN rowid ELSE indicator_id END AS indicator_id{rank} FROM indicator_fts "
+    "WHERE indicator_fts MATCH :q AND (rowid > 0 OR user_id = 1)"
+)
+_FTS_SQL = "FROM indicator WHERE deleted_at IS NULL AND id IN (" + _FTS_HITS.format(rank="") + ")"
+_FTS_RANKED_SQL = (
+    "FROM indicator JOIN (SELECT indicator_id, min(rank) AS rank FROM ("
+    + _FTS_HITS.format(rank=", rank")
+    + ") GROUP BY indicator_id) kw ON kw.indicator_id = indicator.id WHERE indicator.deleted_at IS NULL"
+)
+
+
+def _build_catalog(path: str, rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE indicator (
+            id INTEGER PRIMARY KEY, owner_user_id INTEGER, name_cn TEXT NOT NULL, name_en TEXT,
+            unit TEXT NOT NULL, loinc TEXT UNIQUE, deleted_at DATETIME
+        );
+        CREATE INDEX ix_indicator_name_cn ON indicator(name_cn);
+        CREATE INDEX ix_indicator_name_en ON indicator(name_en);
+        CREATE TABLE userindicator (
+            id INTEGER PRIMARY KEY, user_id INTEGER, indicator_id INTEGER, alias TEXT
+        );
+        """
+    )
+    rnd = random.Random(42)
+    batch = []
+    for i in range(1, rows + 1):
+        name_cn = f"{rnd.choice(_PREFIXES)}{rnd.choice(_STEMS)}{rnd.choice(_SUFFIXES)}{i}"
+        name_en = f"{rnd.choice(_EN)} {i}"
+        batch.append((i, name_cn, name_en, "u", f"{i}-{i % 10}"))
+    conn.executemany("INSERT INTO indicator(id, name_cn, name_en, unit, loinc) VALUES (?, ?, ?, ?, ?)", batch)
+    for ddl in INDICATOR_FTS_DDL:
+        conn.execute(ddl)
+    for stmt in INDICATOR_FTS_POPULATE:
+        conn.execute(stmt)
+    conn.commit()
+    return conn
+
+
+def _time_query(
+    conn: sqlite3.Connection, count_base: str, page_base: str, params: dict, order_by: str, repeat: int
+) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(f"SELECT count(*) {count_base}", params).fetchone()
+        conn.execute(f"SELECT indicator.id {page_base} ORDER BY {order_by} LIMIT 20", params).fetchall()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="LIKE vs FTS5 trigram 指标检索基准")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        conn = _build_catalog(os.path.join(tmp, "bench.sqlite3"), args.rows)
+        print(f"catalog rows={args.rows} build={time.perf_counter() - t0:.2f}s")
+        print(f"{'keyword':<14}{'like_ms':>10}{'fts_ms':>10}{'ranked_ms':>11}{'speedup':>10}")
+        for kw in _KEYWORDS:
+            like_p, fts_p = {"p": f"%{kw}%"}, {"q": f'"{kw}"'}
+            like_ms = _time_query(conn, _LIKE_SQL, _LIKE_SQL, like_p, "indicator.id", args.repeat)
+            fts_ms = _time_query(conn, _FTS_SQL, _FTS_SQL, fts_p, "indicator.id", args.repeat)
+            ranked_ms = _time_query(conn, _FTS_SQL, _FTS_RANKED_SQL, fts_p, "kw.rank, indicator.id", args.repeat)
+            print(f"{kw:<14}{like_ms:>10.2f}{fts_ms:>10.2f}{ranked_ms:>11.2f}{like_ms / fts_ms:>9.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+日志吞吐基准：5k rps 下每个请求的日志开销
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_logging [--rps 5000] [--seconds 3] [--debug-lines 2]
+
+说明：
+- 在事件循环中按 `--rps` 匀速模拟请求：每个请求设置 `request_id`/`trace_id`，写一行 INFO 访问日志
+  与 `--debug-lines` 行 DEBUG 日志（sink 级别为 DEBUG，以观察积压时的丢弃行为）；
+- 统计调用方（事件循环线程）在日志调用上花费的时间：每请求平均与 P99（微秒），以及按目标速率
+  折算的事件循环占用比例；
+- 对比三种配置，输出均写入临时目录中的文件：
+  1. 旧配置：文本格式、`enqueue=True`、`diagnose=True`；
+  2. 批量文本：`BatchedSink` + 文本格式；
+  3. 批量 JSON：`BatchedSink` + JSON 行 + 轮转文件；
+- 最后一列为背压丢弃的日志条数。
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {extra[request_id]} | {extra[trace_id]} | {message}"
+
+
+def _configure(kind: str, directory: str):
+    from loguru import logger
+
+    from app.core.log_sinks import BatchedSink, RotatingFile, StreamWriter, json_entry, json_line
+
+    logger.remove()
+    path = os.path.join(directory, f"{kind}.log")
+    if kind == "legacy":
+        stream = open(path, "a", encoding="utf-8")
+        logger.add(stream, level="DEBUG", format=_FORMAT, enqueue=True, backtrace=True, diagnose=True)
+        return None
+    if kind == "batched-text":
+        sink = BatchedSink(StreamWriter(open(path, "a", encoding="utf-8")))
+        logger.add(sink, level="DEBUG", format=_FORMAT, diagnose=False)
+        return sink
+    sink = BatchedSink(RotatingFile(path, 50 * 1024 * 1024, 3), extract=json_entry, render=json_line)
+    logger.add(sink, level="DEBUG", format="{message}", diagnose=False)
+    return sink
+
+
+async def _simulate(rps: int, seconds: float, debug_lines: int) -> list:
+    from app.core.logging import get_request_logger
+    from app.utils.request_context import request_id_ctx_var, trace_id_ctx_var
+
+    tick = 0.01
+    per_tick = max(1, int(rps * tick))
+    costs = []
+    deadline = time.perf_counter() + seconds
+    next_tick = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(per_tick):
+            started = time.perf_counter()
+            request_id_ctx_var.set(str(uuid.uuid4()))
+            trace_id_ctx_var.set(str(uuid.uuid4()))
+            log = get_request_logger()
+            for i in range(debug_lines):
+                log.debug(f"indicators:list step={i} keyword=None page=1")
+            log.info("Completed request GET /api/v1/indicators 200 ms=4.8 db_queries=3 db_ms=1.2")
+            costs.append(time.perf_counter() - started)
+        next_tick += tick
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+    return costs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rps", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--debug-lines", type=int, default=2)
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    directory = tempfile.mkdtemp(prefix="bench_logging_")
+    print(f"rps={args.rps} seconds={args.seconds} debug_lines={args.debug_lines} dir={directory}")
+    print(f"{'配置':>14} {'请求数':>8} {'平均 us/请求':>12} {'P99 us':>8} {'事件循环占用':>12} {'丢弃':>8}")
+    for kind in ("legacy", "batched-text", "batched-json"):
+        sink = _configure(kind, directory)
+        costs = asyncio.run(_simulate(args.rps, args.seconds, args.debug_lines))
+        dropped = sink.stats()[1] if sink is not None else 0
+        logger.remove()  # 等待写出完成
+        mean = statistics.fmean(costs) * 1e6
+        p99 = sorted(costs)[int(len(costs) * 0.99)] * 1e6
+        share = mean * args.rps / 1e6 * 100
+        print(f"{kind:>14} {len(costs):>8} {mean:>12.1f} {p99:>8.1f} {share:>11.1f}% {dropped:>8}")
+
+
+if __name__ == "__main__":
+    main()
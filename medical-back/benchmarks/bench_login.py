@@ -0,0 +1,111 @@
+"""
+登录吞吐基准：scrypt 哈希在有界线程池中执行时的并发登录表现
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_login [--logins 400] [--concurrency 32] [--workers 1,2,4]
+
+说明：
+- 在临时 SQLite 文件上初始化完整应用（`create_app` + `init_db`），预置若干 scrypt 哈希用户；
+- 通过 ASGI 传输直接调用 `POST /auth/login`，按给定并发发起登录，同时以固定间隔探测 `GET /health`；
+- 对每个线程池大小输出登录吞吐（次/秒）、登录延迟中位数/P95，以及同期健康检查的 P95 延迟，
+  后者用于确认哈希计算期间事件循环仍在处理其他请求。
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_USERS = 20
+_PROBE_INTERVAL = 0.005
+
+
+def _p95(values):
+    return sorted(values)[max(0, int(len(values) * 0.95) - 1)]
+
+
+async def _run(app, prefix: str, logins: int, concurrency: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies, probes = [], []
+    done = asyncio.Event()
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(i: int) -> None:
+            async with sem:
+                t = time.perf_counter()
+                r = await client.post(f"{prefix}/auth/login", json={"username": f"bench{i % _USERS}", "password": "pw"})
+                latencies.append(time.perf_counter() - t)
+                assert r.status_code == 200, r.text
+
+        async def probe() -> None:
+            while not done.is_set():
+                t = time.perf_counter()
+                await client.get(f"{prefix}/health")
+                probes.append(time.perf_counter() - t)
+                await asyncio.sleep(_PROBE_INTERVAL)
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await prober
+    return {
+        "throughput": logins / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": _p95(latencies) * 1000,
+        "probe_p95": _p95(probes) * 1000 if probes else float("nan"),
+        "probes": len(probes),
+    }
+
+
+async def _main(args) -> None:
+    tmp = tempfile.mkdtemp(prefix="bench_login_")
+    os.environ["SQLITE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.sqlite3')}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app.core.settings import get_settings
+    from app.db.session import async_session_factory, init_db
+    from app.models.user import User
+    from app.services import passwords
+    from main import create_app
+
+    settings = get_settings()
+    app = create_app()
+    await init_db()
+    async with async_session_factory() as session:
+        for i in range(_USERS):
+            session.add(User(username=f"bench{i}", name=f"bench{i}", password_hash=passwords.hash_password_sync("pw")))
+        await session.commit()
+
+    print(
+        f"scrypt n={settings.password_scrypt_n} r={settings.password_scrypt_r} p={settings.password_scrypt_p}, "
+        f"logins={args.logins}, concurrency={args.concurrency}, cpus={os.cpu_count()}"
+    )
+    print(f"{'workers':>8} {'logins/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'health p95 ms':>14} {'probes':>7}")
+    for workers in args.workers:
+        settings.password_hash_workers = workers
+        passwords.shutdown_pool()
+        res = await _run(app, settings.api_prefix, args.logins, args.concurrency)
+        print(
+            f"{workers:>8} {res['throughput']:>10.1f} {res['p50']:>8.1f} {res['p95']:>8.1f} "
+            f"{res['probe_p95']:>14.1f} {res['probes']:>7}"
+        )
+    passwords.shutdown_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 2, 4])
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+中间件开销基准：每个请求在请求上下文中间件中花费的时间
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_middleware [--requests 20000] [--sample-rate 0.01]
+
+说明：
+- 构造只含一个返回小 JSON 的路由的 FastAPI 应用，直接以 ASGI 调用（不经网络与服务器）逐个发送请求，对比：
+  1. 无中间件（基线）；
+  2. `BaseHTTPMiddleware` 实现（旧版写法：两个 UUID、两行 INFO 日志）；
+  3. 当前纯 ASGI `RequestContextMiddleware`（访问日志按 `--sample-rate` 抽样）；
+- 日志写入丢弃型 sink，计入格式化成本但不计终端输出；
+- 输出每请求平均耗时与相对基线的额外开销（微秒）。
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+
+async def _drive(app, n: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # 预热
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def _build(kind: str):
+    from fastapi import FastAPI
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from app.core.logging import get_request_logger
+    from app.core.middleware import RequestContextMiddleware
+    from app.core.responses import TimedJSONResponse
+    from app.utils.request_context import request_id_ctx_var, trace_id_ctx_var
+
+    class LegacyMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            request_id_ctx_var.set(str(uuid.uuid4()))
+            trace_id_ctx_var.set(str(uuid.uuid4()))
+            logger = get_request_logger()
+            logger.info(f"Incoming request {request.method} {request.url}")
+            response = await call_next(request)
+            logger.info(f"Completed request {response.status_code}")
+            return response
+
+    app = FastAPI(default_response_class=TimedJSONResponse)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if kind == "legacy":
+        app.add_middleware(LegacyMiddleware)
+    elif kind == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    args = parser.parse_args()
+    os.environ["ACCESS_LOG_SAMPLE_RATE"] = str(args.sample_rate)
+
+    from loguru import logger
+
+    logger.remove()
+    logger.add(lambda _msg: None, level="INFO")
+
+    results = {kind: asyncio.run(_drive(_build(kind), args.requests)) for kind in ("none", "legacy", "asgi")}
+    base = results["none"]
+    print(f"requests={args.requests} sample_rate={args.sample_rate}")
+    for kind, label in (("none", "无中间件"), ("legacy", "BaseHTTPMiddleware"), ("asgi", "纯 ASGI 中间件")):
+        print(f"{label:>20}: {results[kind]:7.1f} us/req  额外开销 {results[kind] - base:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+列表读取基准：ORM 实例加载 vs 列投影行对象
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_projection [--rows 20000] [--pages 100,1000,10000] [--runs 20]
+
+说明：
+- 在临时 SQLite 文件中预置指定行数的指标记录（引擎经 `app.db.sqlite_profile.create_engines` 创建）；
+- 按 `GET /indicators/{id}/records` 的查询与组装方式取一页记录并转为响应字典，对比：
+  1. ORM：`session.exec(select(IndicatorRecord))` 加载 SQLModel 实例（校验 + identity map）；
+  2. 投影：`app.services.read_models.fetch_rows(..., RecordRow)` 只取需要的列并转为 `NamedTuple`；
+- 每种页大小输出每页耗时中位数，以及 tracemalloc 统计的行对象常驻内存（会话未关闭时，
+  含 identity map）与组装响应字典时的峰值内存。
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import Settings
+from app.db.sqlite_profile import create_engines
+from app.models import admission, user  # noqa: F401  注册外键引用的表
+from app.models.indicator import IndicatorRecord
+from app.services.read_models import RecordRow, fetch_rows
+
+_USER_ID = 1
+_INDICATOR_ID = 1
+
+
+async def _prepare(writer, rows: int) -> None:
+    async with writer.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[IndicatorRecord.__table__])
+        start = date(2000, 1, 1)
+        batch = [
+            {
+                "user_id": _USER_ID, "indicator_id": _INDICATOR_ID, "measured_at": start + timedelta(days=i),
+                "value": str(i % 200), "value_num": float(i % 200), "unit": "mmol/L", "status": "normal",
+                "source": "manual", "note": "复查" if i % 7 == 0 else None,
+            }
+            for i in range(rows)
+        ]
+        for i in range(0, len(batch), 1000):
+            await conn.execute(insert(IndicatorRecord), batch[i:i + 1000])
+
+
+def _query(page_size: int):
+    return (
+        select(IndicatorRecord)
+        .where(
+            IndicatorRecord.indicator_id == _INDICATOR_ID,
+            IndicatorRecord.user_id == _USER_ID,
+            IndicatorRecord.deleted_at.is_(None),
+        )
+        .order_by(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+        .limit(page_size)
+    )
+
+
+async def _load_orm(session: AsyncSession, page_size: int) -> list:
+    res = await session.exec(_query(page_size))
+    return res.all()
+
+
+async def _load_projection(session: AsyncSession, page_size: int) -> list:
+    return await fetch_rows(session, _query(page_size), RecordRow)
+
+
+def _items(rows: list) -> list:
+    return [
+        {
+            "recordId": r.id,
+            "date": r.measured_at,
+            "value": r.value,
+            "unit": r.unit,
+            "status": r.status,
+            "source": r.source,
+            "note": r.note,
+            "admissionFileId": r.admission_file_id,
+        }
+        for r in rows
+    ]
+
+
+async def _measure(engine, load, page_size: int, runs: int):
+    times = []
+    for _ in range(runs + 1):
+        async with AsyncSession(engine) as session:
+            started = time.perf_counter()
+            _items(await load(session, page_size))
+            times.append(time.perf_counter() - started)
+    async with AsyncSession(engine) as session:
+        tracemalloc.start()
+        rows = await load(session, page_size)
+        resident, _ = tracemalloc.get_traced_memory()
+        _items(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return statistics.median(times[1:]) * 1000, resident / 1024, peak / 1024
+
+
+async def _run(args) -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_projection_"), "bench.sqlite3")
+    writer, _ = create_engines(Settings(sqlite_url=f"sqlite+aiosqlite:///{path}", sqlite_split_read_write=False))
+    await _prepare(writer, args.rows)
+    print(f"rows={args.rows} runs={args.runs}")
+    print(f"{'页大小':>8} {'路径':>6} {'耗时 ms':>9} {'常驻 KB':>9} {'峰值 KB':>9}")
+    for page_size in (int(p) for p in args.pages.split(",")):
+        for label, load in (("ORM", _load_orm), ("投影", _load_projection)):
+            ms, resident_kb, peak_kb = await _measure(writer, load, page_size, args.runs)
+            print(f"{page_size:>8} {label:>6} {ms:>9.2f} {resident_kb:>9.0f} {peak_kb:>9.0f}")
+    await writer.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--pages", default="100,1000,10000")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+种子导入基准：冷启动批量导入、数据未变化时跳过、数据变化后的增量 upsert
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_seeds [--indicators 10000] [--categories 200]
+
+说明：
+- 在临时目录生成指定规模的 `indicators.json` / `category.json`（带详情与分类成员，约一半指标带 LOINC），
+  临时 SQLite 文件经 `create_all` 建表后依次计时：
+  1. 冷启动：空库导入全部数据；
+  2. 未变化：再次启动，数据文件哈希与上次种子日志一致，直接跳过；
+  3. 变化后：修改 1% 指标的参考范围，已有库上重新比对并 upsert。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def _write_dataset(data_dir: Path, indicators: int, categories: int, revision: int = 0) -> None:
+    items = []
+    for i in range(indicators):
+        items.append(
+            {
+                "name_cn": f"指标{i}",
+                "name_en": f"Indicator {i}",
+                "unit": "mmol/L" if i % 7 else "qualitative",
+                "reference_min": 1.0 + (revision if i % 100 == 0 else 0),
+                "reference_max": 10.0,
+                "loinc": f"{10000 + i}-{i % 10}" if i % 2 == 0 else None,
+                "detail": {
+                    "measurement_method": "比色法",
+                    "clinical_significance": f"指标{i}的临床意义",
+                    "reference_range": "1.0-10.0",
+                },
+            }
+        )
+    cats = [
+        {
+            "name": f"分类{c}",
+            "description": f"分类{c}说明",
+            "indicators": [{"name_cn": f"指标{i}"} for i in range(c, indicators, categories)],
+        }
+        for c in range(categories)
+    ]
+    (data_dir / "indicators.json").write_text(
+        json.dumps({"dataset_version": f"bench-{revision}", "indicators": items}, ensure_ascii=False), encoding="utf-8"
+    )
+    (data_dir / "category.json").write_text(
+        json.dumps({"dataset_version": f"bench-{revision}", "categories": cats}, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+async def _main(args) -> None:
+    tmp = Path(tempfile.mkdtemp(prefix="bench_seeds_"))
+    os.environ["SQLITE_URL"] = f"sqlite+aiosqlite:///{tmp / 'bench.sqlite3'}"
+
+    from sqlmodel import SQLModel
+    from app.db.seeds import run_seeds
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    _write_dataset(tmp, args.indicators, args.categories)
+
+    print(f"indicators={args.indicators} categories={args.categories}")
+    for label, revision in (("cold", 0), ("unchanged", 0), ("changed", 1)):
+        if revision:
+            _write_dataset(tmp, args.indicators, args.categories, revision)
+        t = time.perf_counter()
+        applied = await run_seeds(tmp)
+        print(f"{label:>10}: {(time.perf_counter() - t) * 1000:8.1f} ms  applied={applied}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indicators", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=200)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
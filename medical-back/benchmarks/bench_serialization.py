@@ -0,0 +1,107 @@
+"""
+响应编码基准：1000 条指标列表页的 JSON 编码耗时与内存分配
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_serialization [--items 1000] [--runs 50]
+
+说明：
+- 构造与 `GET /indicators` 相同结构的一页列表（17 个字段，约一半带最新记录）；
+- 对比三条路径：
+  1. 旧路径：日期预先 `isoformat()`，经 FastAPI `jsonable_encoder` 遍历后由标准库 json 编码（原 `JSONResponse`）；
+  2. 校验路径：同一内容经 `response_model`（pydantic `IndicatorPage`）校验并序列化；
+  3. 新路径：日期保持 `date` 对象，`TimedJSONResponse`（orjson）直接编码；
+- 输出每次编码耗时中位数，以及 tracemalloc 统计的单次编码峰值内存（含中间对象与输出字节串）。
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+
+def _page(items: int, iso_dates: bool) -> dict:
+    rows = []
+    for i in range(items):
+        has_rec = i % 2 == 0
+        measured = date(2024, 1, 1) + timedelta(days=i % 365)
+        rows.append(
+            {
+                "id": i + 1,
+                "indicator": f"指标{i}",
+                "nameCn": f"指标{i}",
+                "nameEn": f"Indicator {i}",
+                "type": "numeric",
+                "value": f"{i % 97}.5" if has_rec else None,
+                "unit": "mmol/L",
+                "referenceRange": "1.0-10.0",
+                "status": "normal" if has_rec else None,
+                "measureDate": (measured.isoformat() if iso_dates else measured) if has_rec else None,
+                "categories": ["血常规", "生化"],
+                "source": "manual" if has_rec else None,
+                "note": None,
+                "isBuiltin": True,
+                "loinc": f"{1000 + i}-{i % 10}",
+                "favorite": i % 5 == 0,
+            }
+        )
+    return {"items": rows, "total": items, "nextCursor": None}
+
+
+def _measure(fn, runs: int):
+    fn()
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times) * 1000, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.api.schemas import IndicatorPage
+    from app.core.responses import TimedJSONResponse
+
+    legacy_page = _page(args.items, iso_dates=True)
+    fast_page = _page(args.items, iso_dates=False)
+    adapter = TypeAdapter(IndicatorPage)
+    response = TimedJSONResponse.__new__(TimedJSONResponse)
+
+    def legacy():
+        return json.dumps(
+            jsonable_encoder(legacy_page), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+
+    def validated():
+        return adapter.dump_json(adapter.validate_python(fast_page))
+
+    def fast():
+        return response.render(fast_page)
+
+    assert json.loads(legacy()) == json.loads(fast()) == json.loads(validated())
+    print(f"items={args.items} runs={args.runs} body={len(fast()) / 1024:.0f} KB")
+    print(f"{'路径':>22} {'耗时 ms':>9} {'峰值 KB':>9}")
+    for label, fn in (
+        ("jsonable_encoder+json", legacy),
+        ("response_model 校验", validated),
+        ("orjson 直接编码", fast),
+    ):
+        ms, peak_kb = _measure(fn, args.runs)
+        print(f"{label:>22} {ms:>9.2f} {peak_kb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
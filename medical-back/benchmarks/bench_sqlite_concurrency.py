@@ -0,0 +1,145 @@
+"""
+SQLite 并发读写基准：默认连接配置 vs WAL + PRAGMA + 读连接池/单写连接
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_sqlite_concurrency [--seconds 5] [--readers 16] [--writers 4] [--rows 20000]
+
+说明：
+- 每个配置使用独立的临时 SQLite 文件，建表后预置指定行数的指标记录；
+- 引擎与会话经 `app.db.sqlite_profile.create_engines` / `routing_session_class` 创建，与线上一致；
+  `default` 配置对应改造前：单引擎、回滚日志、synchronous=FULL、SQLite 默认页缓存；
+- 读任务循环执行“某指标最近 50 条记录”查询，写任务循环单条插入并提交，
+  输出各自吞吐（次/秒）、P95 延迟与失败次数（如 "database is locked"）。
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.settings import Settings
+from app.db.sqlite_profile import create_engines, routing_session_class
+from app.models import admission, user  # noqa: F401  注册外键引用的表
+from app.models.indicator import IndicatorRecord
+
+_USER_ID = 1
+_INDICATORS = 50
+
+_PROFILES = {
+    "default": dict(
+        sqlite_split_read_write=False, sqlite_journal_mode="DELETE", sqlite_synchronous="FULL",
+        sqlite_mmap_size=0, sqlite_cache_size=-2000, sqlite_temp_store="DEFAULT",
+    ),
+    "tuned": {},
+}
+
+
+def _p95(values):
+    return sorted(values)[max(0, int(len(values) * 0.95) - 1)] * 1000 if values else float("nan")
+
+
+async def _prepare(writer, rows: int) -> None:
+    async with writer.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[IndicatorRecord.__table__])
+        start = date(2015, 1, 1)
+        batch = [
+            {
+                "user_id": _USER_ID, "indicator_id": i % _INDICATORS + 1,
+                "measured_at": start + timedelta(days=i // _INDICATORS), "value": str(i % 200),
+                "value_num": float(i % 200), "unit": "u", "status": "normal",
+            }
+            for i in range(rows)
+        ]
+        for i in range(0, len(batch), 1000):
+            await conn.execute(insert(IndicatorRecord), batch[i:i + 1000])
+
+
+async def _run_profile(name: str, args) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_sqlite_"), f"{name}.sqlite3")
+    settings = Settings(sqlite_url=f"sqlite+aiosqlite:///{path}", **_PROFILES[name])
+    writer, reader = create_engines(settings)
+    await _prepare(writer, args.rows)
+    factory = sessionmaker(
+        bind=writer, class_=AsyncSession, sync_session_class=routing_session_class(writer, reader),
+        expire_on_commit=False, autoflush=False,
+    )
+    stats = {"read": [], "write": [], "read_err": 0, "write_err": 0}
+    deadline = time.perf_counter() + args.seconds
+
+    async def read_loop() -> None:
+        rnd = random.Random()
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            try:
+                async with factory() as session:
+                    res = await session.exec(
+                        select(IndicatorRecord)
+                        .where(
+                            IndicatorRecord.user_id == _USER_ID,
+                            IndicatorRecord.indicator_id == rnd.randint(1, _INDICATORS),
+                            IndicatorRecord.deleted_at.is_(None),
+                        )
+                        .order_by(IndicatorRecord.measured_at.desc(), IndicatorRecord.id.desc())
+                        .limit(50)
+                    )
+                    res.all()
+                stats["read"].append(time.perf_counter() - t)
+            except Exception:
+                stats["read_err"] += 1
+
+    async def write_loop() -> None:
+        rnd = random.Random()
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            try:
+                async with factory() as session:
+                    session.add(
+                        IndicatorRecord(
+                            user_id=_USER_ID, indicator_id=rnd.randint(1, _INDICATORS), measured_at=date.today(),
+                            value="1", value_num=1.0, unit="u", status="normal",
+                        )
+                    )
+                    await session.commit()
+                stats["write"].append(time.perf_counter() - t)
+            except Exception:
+                stats["write_err"] += 1
+
+    await asyncio.gather(
+        *(read_loop() for _ in range(args.readers)), *(write_loop() for _ in range(args.writers))
+    )
+    await writer.dispose()
+    if reader is not writer:
+        await reader.dispose()
+    return stats
+
+
+async def _main(args) -> None:
+    print(f"readers={args.readers} writers={args.writers} seconds={args.seconds} rows={args.rows}")
+    print(f"{'profile':>8} {'reads/s':>9} {'read p95 ms':>12} {'writes/s':>9} {'write p95 ms':>13} {'errors':>7}")
+    for name in _PROFILES:
+        s = await _run_profile(name, args)
+        print(
+            f"{name:>8} {len(s['read']) / args.seconds:>9.1f} {_p95(s['read']):>12.1f} "
+            f"{len(s['write']) / args.seconds:>9.1f} {_p95(s['write']):>13.1f} {s['read_err'] + s['write_err']:>7}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20000)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
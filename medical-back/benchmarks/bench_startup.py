@@ -0,0 +1,82 @@
+"""
+启动基准：`create_app()` 的耗时与内存，以及重型依赖是否被提前导入
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_startup [--runs 5] [--max-ms 2000] [--max-rss-mb 200]
+
+说明：
+- 每轮启动一个全新的解释器进程，计时 `from main import create_app; create_app()`（`main` 模块导入时
+  已创建一次应用，计入导入耗时），并读取进程峰值 RSS；
+- 同时检查 `_HEAVY_MODULES` 中的重型依赖是否已真正导入（`lazy_import` 登记的惰性模块会出现在
+  `sys.modules` 中，但在首次使用或后台预热前不执行导入）；
+- 输出各轮中位数；耗时或 RSS 超过阈值、或有重型依赖被提前导入时以退出码 1 结束，可用于 CI 回归检查。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_HEAVY_MODULES = (
+    "numpy", "pandas", "openpyxl", "scipy", "sklearn", "torch", "transformers", "sentence_transformers",
+    "langchain", "langchain_core", "llama_index", "chromadb", "pymilvus", "faiss", "unstructured", "cv2",
+)
+
+_PROBE = """
+import importlib.util, json, resource, sys, time
+t0 = time.perf_counter()
+from main import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules and type(sys.modules[m]) is not importlib.util._LazyModule]
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": heavy,
+}}))
+"""
+
+
+def _probe(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(heavy=_HEAVY_MODULES)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=2000.0, help="导入 + create_app 总耗时中位数上限（毫秒）")
+    parser.add_argument("--max-rss-mb", type=float, default=200.0, help="峰值 RSS 中位数上限（MB）")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["SQLITE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_startup_'), 'b.sqlite3')}"
+    env.setdefault("LOG_LEVEL", "WARNING")
+    runs = [_probe(env) for _ in range(args.runs)]
+
+    total = statistics.median(r["import_ms"] + r["create_app_ms"] for r in runs)
+    rss = statistics.median(r["rss_mb"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+    print(f"runs={args.runs}")
+    print(f"import main (含一次 create_app): {statistics.median(r['import_ms'] for r in runs):8.1f} ms")
+    print(f"create_app（模块已导入）:         {statistics.median(r['create_app_ms'] for r in runs):8.1f} ms")
+    print(f"总耗时:                           {total:8.1f} ms  (阈值 {args.max_ms:.0f})")
+    print(f"峰值 RSS:                         {rss:8.1f} MB  (阈值 {args.max_rss_mb:.0f})")
+    print(f"提前导入的重型依赖: {', '.join(heavy) or '无'}")
+
+    failed = total > args.max_ms or rss > args.max_rss_mb or bool(heavy)
+    if failed:
+        print("FAIL: 启动耗时/内存超过阈值或重型依赖被提前导入")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
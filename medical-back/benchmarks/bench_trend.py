@@ -0,0 +1,90 @@
+"""
+指标趋势重采样基准：NumPy 向量化 vs 逐条 Python 聚合
+
+用法（在 `medical-back/` 目录下执行）：
+    python -m benchmarks.bench_trend [--points 100000] [--indicators 3] [--repeat 10]
+
+说明：
+- 生成若干指标、每天多次测量的合成序列（列数组形式，与 `load_series` 的返回一致）；
+- 分别计时 `app.services.trend_analysis.resample` 与等价的字典分组实现（同样组装逐桶输出），
+  输出各粒度的中位数耗时；day 粒度下桶数接近点数，耗时主要在组装输出。
+"""
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.trend_analysis import GRANULARITIES, resample
+
+
+def _columns(points: int, indicators: int) -> dict:
+    rnd = np.random.default_rng(42)
+    per = points // indicators
+    ind = np.repeat(np.arange(1, indicators + 1, dtype=np.int64), per)
+    offsets = np.sort(rnd.integers(0, max(per // 3, 1), size=(indicators, per)), axis=1).ravel()
+    days = (np.datetime64("2000-01-01") + offsets).astype("datetime64[D]")
+    values = rnd.normal(100, 15, ind.size)
+    return {
+        "indicator_id": ind,
+        "day": days,
+        "value": values,
+        "ref_low": np.full(ind.size, 80.0),
+        "ref_high": np.full(ind.size, 120.0),
+        "abnormal": (values < 80) | (values > 120),
+    }
+
+
+def _python_resample(rows: list, granularity: str) -> dict:
+    groups = defaultdict(list)
+    for ind, d, v in rows:
+        if granularity == "month":
+            key = d.replace(day=1)
+        elif granularity == "week":
+            key = d - timedelta(days=d.weekday())
+        else:
+            key = d
+        groups[(ind, key)].append(v)
+    return [
+        {"date": key.isoformat(), "value": round(sum(v) / len(v), 4), "min": min(v), "max": max(v), "count": len(v)}
+        for (_, key), v in groups.items()
+    ]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="趋势重采样基准")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--indicators", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    cols = _columns(args.points, args.indicators)
+    base = date(2000, 1, 1)
+    rows = [
+        (int(i), base + timedelta(days=int(d)), float(v))
+        for i, d, v in zip(cols["indicator_id"], (cols["day"] - np.datetime64("2000-01-01")).astype(int), cols["value"])
+    ]
+    print(f"points={cols['value'].size} indicators={args.indicators}")
+    print(f"{'granularity':<12}{'numpy_ms':>10}{'python_ms':>11}{'buckets':>9}")
+    for g in GRANULARITIES:
+        out = resample(cols, g)
+        buckets = sum(len(v["series"]) for v in out.values())
+        np_ms = _median_ms(lambda: resample(cols, g), args.repeat)
+        py_ms = _median_ms(lambda: _python_resample(rows, g), args.repeat)
+        print(f"{g:<12}{np_ms:>10.2f}{py_ms:>11.2f}{buckets:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 from app.core.settings import get_settings
 from app.core.logging import configure_logging
+from app.core.metrics import start_metrics_flush, stop_metrics_flush
 from app.core.middleware import setup_middleware
+from app.core.responses import TimedJSONResponse
+from app.core.warmup import run_warmup
 from app.api.routes import api_router
+from app.api.metrics import router as metrics_router
 from app.db.session import init_db
+from app.services.archival import start_archival, stop_archival
+from app.services.passwords import shutdown_pool
+from app.services.record_writes import stop_record_writer
 
 from fastapi import FastAPI
 
@@ -10,13 +17,24 @@ from fastapi import FastAPI
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings)
-    app = FastAPI(title=settings.app_name, version=settings.version)
+    app = FastAPI(title=settings.app_name, version=settings.version, default_response_class=TimedJSONResponse)
     setup_middleware(app)
     app.include_router(api_router, prefix=settings.api_prefix)
+    app.include_router(metrics_router)
 
     @app.on_event("startup")
     async def on_startup() -> None:  # pragma: no cover
         await init_db()
+        run_warmup(settings)
+        start_archival(settings)
+        start_metrics_flush(settings)
+
+    @app.on_event("shutdown")
+    async def on_shutdown() -> None:  # pragma: no cover
+        await stop_archival()
+        await stop_record_writer()
+        shutdown_pool()
+        await stop_metrics_flush(settings)
     return app
 
 